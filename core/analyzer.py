@@ -1,15 +1,38 @@
 import aiohttp
 import asyncio
+import hashlib
 import logging
-from typing import Dict, Optional, Union, Awaitable, Any, List
+import os
+import random
+from collections import OrderedDict, deque
+from typing import (
+    Dict, Optional, Union, Awaitable, Any, List, AsyncIterable, AsyncIterator,
+    Callable, Deque, Iterable, Iterator, Set, TextIO, Tuple, TypeVar
+)
 import requests
 import json
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
-from time import time
+from time import time, monotonic, sleep
 from .config import config
+from .checkpoint import Checkpoint
+from .cache import CacheStats, DiskResponseCache, conditional_headers, get_header
+from .fingerprint import Fingerprint, distance
+from .payloads import PayloadCorpus
+from .results import READ_CHUNK_SIZE, ResultWriter, open_result_writer
+from .retry import RetryPolicy
+from .store import ResultStore
+from .transport import BODY_CHUNK_SIZE, AiohttpTransport, create_transport
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
 class DNAReconError(Exception):
     """Classe de base pour les exceptions DNARecon."""
     pass
@@ -39,10 +62,6 @@ DEFAULT_SECURITY_HEADERS = {
     "Strict-Transport-Security": "max-age=31536000; includeSubDomains"
 }
 
-# Configuration des retries
-RETRY_COUNT = 3
-RETRY_DELAY = 1.0  # secondes
-
 # Liste de User-Agents pour la rotation
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -58,73 +77,215 @@ TIMEOUT_CONFIG = {
     "sock_connect": 5.0  # Timeout pour la connexion socket
 }
 
-MUTATIONS = [
-    ("xss", "<script>alert(1)</script>"),
-    ("sqli", "' OR '1'='1"),
-    ("idor", "user_id=1", "user_id=2"),
-]
+class _TokenBucket:
+    """État du seau à jetons d'un hôte."""
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
 
 class RateLimiter:
-    def __init__(self, max_requests: int, time_window: float):
-        self.semaphore = asyncio.Semaphore(max_requests)
-        self.time_window = time_window
-        self.last_reset = time()
-        self.requests = 0
-        self._lock = asyncio.Lock()
+    """
+    Limiteur de débit à seau à jetons, indépendant pour chaque hôte.
 
-    async def acquire(self):
-        async with self._lock:
-            current_time = time()
-            if current_time - self.last_reset >= self.time_window:
-                self.requests = 0
-                self.last_reset = current_time
-            
-            if self.requests >= self.semaphore._value:
-                wait_time = self.time_window - (current_time - self.last_reset)
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                self.requests = 0
-                self.last_reset = time()
-            
-            await self.semaphore.acquire()
-            self.requests += 1
-
-    def release(self):
-        self.semaphore.release()
+    Chaque hôte dispose de `burst` jetons rechargés en continu au rythme de
+    `max_requests / time_window` jetons par seconde. Une requête réserve un jeton
+    sans verrou et n'attend que le délai propre à son hôte : un hôte limité ne
+    ralentit jamais les requêtes vers les autres hôtes.
+    """
+
+    # Au-delà de ce nombre d'hôtes suivis, les seaux pleins (inactifs) sont purgés
+    MAX_TRACKED_HOSTS = 10000
+
+    def __init__(self, max_requests: int, time_window: float = 1.0, burst: Optional[int] = None):
+        if max_requests <= 0 or time_window <= 0:
+            raise ValueError("max_requests et time_window doivent être strictement positifs")
+        self.rate = max_requests / time_window
+        self.capacity = float(max(1, burst if burst is not None else max_requests))
+        self._buckets: Dict[str, _TokenBucket] = {}
+        # Protège les seaux lorsque le limiteur est partagé entre threads (moteur synchrone)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> "RateLimiter":
+        """Crée un limiteur à partir de la section `rate_limit` de la configuration."""
+        rate_config = config.get("rate_limit", {})
+        return cls(
+            max_requests=rate_config.get("requests_per_second", 2),
+            time_window=1.0,
+            burst=rate_config.get("burst")
+        )
+
+    def reserve(self, host: str = "") -> float:
+        """
+        Réserve un jeton pour l'hôte et retourne le délai (en secondes) à attendre
+        avant d'envoyer la requête.
+        """
+        with self._lock:
+            now = monotonic()
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                if len(self._buckets) >= self.MAX_TRACKED_HOSTS:
+                    self._prune(now)
+                bucket = self._buckets[host] = _TokenBucket(self.capacity, now)
+            else:
+                bucket.tokens = min(self.capacity, bucket.tokens + (now - bucket.updated) * self.rate)
+                bucket.updated = now
+
+            # Un solde négatif correspond aux jetons déjà réservés par les requêtes en attente
+            bucket.tokens -= 1.0
+            if bucket.tokens >= 0:
+                return 0.0
+            return -bucket.tokens / self.rate
+
+    async def acquire(self, host: str = "") -> None:
+        """Attend qu'un jeton soit disponible pour l'hôte."""
+        delay = self.reserve(host)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, host: str = "") -> None:
+        """Version bloquante de `acquire`, utilisable depuis des threads."""
+        delay = self.reserve(host)
+        if delay > 0:
+            sleep(delay)
+
+    def release(self, host: str = "") -> None:
+        """Conservé pour compatibilité : un jeton consommé n'est jamais rendu."""
+
+    def _prune(self, now: float) -> None:
+        """Supprime les seaux redevenus pleins, équivalents à un hôte jamais vu."""
+        idle = [
+            host for host, bucket in self._buckets.items()
+            if bucket.tokens + (now - bucket.updated) * self.rate >= self.capacity
+        ]
+        for host in idle:
+            del self._buckets[host]
 
 class ResponseCache:
-    def __init__(self, max_size: int = 1000, ttl: float = 300.0):
-        self.cache = {}
+    """
+    Cache LRU des réponses en mémoire, borné en nombre d'entrées et en octets.
+
+    Les opérations get/set/éviction sont en O(1) (OrderedDict). Les entrées
+    expirées sont supprimées à la lecture et, si le balayeur est démarré, en
+    tâche de fond.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: float = 300.0, max_bytes: Optional[int] = None):
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self.max_size = max_size
         self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.stats_counters = CacheStats()
         self._lock = asyncio.Lock()
+        self._sweeper: Optional["asyncio.Task[None]"] = None
+        self._sweeper_users = 0
+
+    @staticmethod
+    def _entry_size(data: Dict[str, Any]) -> int:
+        """Taille d'une réponse, estimée à partir de son corps."""
+        body_bytes = data.get("body_bytes")
+        if body_bytes is None:
+            body_bytes = len(data.get("body") or "")
+        return body_bytes
+
+    def _remove(self, key: str) -> None:
+        entry = self.cache.pop(key)
+        self.total_bytes -= entry['size']
+
+    def _evict(self) -> None:
+        """Supprime l'entrée la moins récemment utilisée."""
+        _, entry = self.cache.popitem(last=False)
+        self.total_bytes -= entry['size']
+        self.stats_counters.evictions += 1
 
     async def get(self, key: str) -> Optional[Dict[str, Any]]:
         async with self._lock:
-            if key in self.cache:
-                entry = self.cache[key]
+            entry = self.cache.get(key)
+            if entry is not None:
                 if time() - entry['timestamp'] < self.ttl:
+                    self.cache.move_to_end(key)
+                    self.stats_counters.hits += 1
                     return entry['data']
-                else:
-                    del self.cache[key]
+                self._remove(key)
+                self.stats_counters.expirations += 1
+            self.stats_counters.misses += 1
         return None
 
     async def set(self, key: str, data: Dict[str, Any]) -> None:
+        size = self._entry_size(data)
         async with self._lock:
-            if len(self.cache) >= self.max_size:
-                # Supprime l'entrée la plus ancienne
-                oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k]['timestamp'])
-                del self.cache[oldest_key]
-            
+            if key in self.cache:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                # Une réponse plus grosse que le cache entier n'est pas conservée
+                return
+
             self.cache[key] = {
                 'data': data,
-                'timestamp': time()
+                'timestamp': time(),
+                'size': size
             }
+            self.total_bytes += size
+            self.stats_counters.sets += 1
+
+            while len(self.cache) > self.max_size or (
+                self.max_bytes is not None and self.total_bytes > self.max_bytes
+            ):
+                self._evict()
+
+    async def purge_expired(self) -> int:
+        """Supprime toutes les entrées expirées et retourne leur nombre."""
+        async with self._lock:
+            current_time = time()
+            expired = [
+                key for key, entry in self.cache.items()
+                if current_time - entry['timestamp'] >= self.ttl
+            ]
+            for key in expired:
+                self._remove(key)
+            self.stats_counters.expirations += len(expired)
+        return len(expired)
+
+    def start_sweeper(self, interval: Optional[float] = None) -> None:
+        """
+        Démarre (ou partage) le balayage périodique des entrées expirées.
+
+        Chaque appel doit être suivi d'un appel à `stop_sweeper` ; la tâche est
+        arrêtée lorsque plus aucun utilisateur n'en a besoin.
+        """
+        self._sweeper_users += 1
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.ensure_future(
+                self._sweep_loop(interval if interval is not None else max(1.0, self.ttl / 2))
+            )
+
+    async def stop_sweeper(self) -> None:
+        """Libère le balayeur et l'arrête s'il n'est plus utilisé."""
+        self._sweeper_users = max(0, self._sweeper_users - 1)
+        if self._sweeper_users == 0 and self._sweeper is not None:
+            sweeper, self._sweeper = self._sweeper, None
+            sweeper.cancel()
+            try:
+                await sweeper
+            except asyncio.CancelledError:
+                pass
+
+    async def _sweep_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            purged = await self.purge_expired()
+            if purged:
+                logger.debug(f"{purged} entrées expirées supprimées du cache")
 
     async def clear(self) -> None:
-        """Vide le cache."""
+        """Vide le cache et remet les statistiques à zéro."""
         async with self._lock:
             self.cache.clear()
+            self.total_bytes = 0
+            self.stats_counters.reset()
 
     async def size(self) -> int:
         """Retourne le nombre d'entrées dans le cache."""
@@ -140,8 +301,229 @@ class ResponseCache:
                 if current_time - entry['timestamp'] >= self.ttl
             ]
 
+    async def get_stale(self, key: str) -> Optional[Dict[str, Any]]:
+        """Le cache mémoire supprime les entrées expirées : aucune revalidation possible."""
+        return None
+
+    async def touch(self, key: str) -> None:
+        """Rafraîchit l'horodatage d'une entrée."""
+        async with self._lock:
+            if key in self.cache:
+                self.cache[key]['timestamp'] = time()
+                self.stats_counters.revalidations += 1
+
+    async def stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques du cache depuis le démarrage du processus."""
+        async with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self.cache),
+                "bytes": self.total_bytes,
+                "max_size": self.max_size,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                **self.stats_counters.as_dict()
+            }
+
+class SingleFlight:
+    """
+    Regroupe les appels concurrents portant sur une même clé (« single-flight »).
+
+    Le premier appelant exécute la requête ; ceux qui arrivent pendant qu'elle est
+    en cours attendent son issue et reçoivent le même résultat ou la même exception.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, "asyncio.Future[Any]"] = {}
+
+    def __len__(self) -> int:
+        """Nombre de clés en cours de traitement."""
+        return len(self._calls)
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[R]]) -> R:
+        """Exécute `factory` pour la clé, ou rejoint l'exécution déjà en cours."""
+        while key in self._calls:
+            future = self._calls[key]
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # L'appelant initial a été annulé : la requête est relancée
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Évite l'avertissement « exception never retrieved » sans attente concurrente
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+# Requêtes en cours, partagées entre les appelants concurrents
+in_flight_requests = SingleFlight()
+
+def create_response_cache() -> Union[ResponseCache, DiskResponseCache]:
+    """
+    Crée le cache de réponses décrit par la section `cache` de la configuration :
+    en mémoire (`backend: memory`, par défaut) ou persistant sur disque (`backend: disk`).
+    """
+    cache_config = config.get("cache", {})
+    max_size = cache_config.get("max_size", 1000)
+    ttl = cache_config.get("ttl", 300.0)
+    if cache_config.get("backend", "memory") == "disk":
+        path = cache_config.get("path") or str(Path.home() / ".dnarecon" / "cache.sqlite")
+        return DiskResponseCache(path, max_size=max_size, ttl=ttl)
+    return ResponseCache(max_size=max_size, ttl=ttl, max_bytes=cache_config.get("max_bytes"))
+
 # Instance globale du cache
-response_cache = ResponseCache()
+response_cache = create_response_cache()
+
+class ScanContext:
+    """
+    Contexte de scan possédant une session HTTP et un pool de connexions partagés.
+
+    Toutes les requêtes effectuées avec un même contexte réutilisent les connexions
+    ouvertes (keep-alive) au lieu de refaire une poignée de main TCP/TLS à chaque
+    requête. S'utilise comme gestionnaire de contexte asynchrone :
+
+        async with ScanContext() as context:
+            await run(url, context=context)
+
+    Le transport ("aiohttp" par défaut, ou "http2" pour multiplexer les requêtes
+    vers un même hôte sur une seule connexion) est choisi par `transport` ou par
+    la clé `transport.backend` de la configuration.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[Union[ResponseCache, DiskResponseCache]] = None,
+        transport: Optional[str] = None
+    ):
+        pool_config = config.get("connection_pool", {})
+        self.limit = limit if limit is not None else pool_config.get("limit", 100)
+        self.limit_per_host = (
+            limit_per_host if limit_per_host is not None
+            else pool_config.get("limit_per_host", 10)
+        )
+        self.keepalive_timeout = (
+            keepalive_timeout if keepalive_timeout is not None
+            else pool_config.get("keepalive_timeout", 30.0)
+        )
+        self.dns_cache_ttl = pool_config.get("dns_cache_ttl", 300)
+        self.retry_policy = retry_policy or RetryPolicy.from_config()
+        self.cache = cache if cache is not None else response_cache
+        self.sweep_interval = config.get("cache", {}).get("sweep_interval")
+        transport_config = config.get("transport", {})
+        self.transport = create_transport(
+            transport or transport_config.get("backend", AiohttpTransport.name),
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            dns_cache_ttl=self.dns_cache_ttl,
+            timeout=TIMEOUT_CONFIG,
+            verify_ssl=config.get("security", {}).get("verify_ssl", True),
+            http1=transport_config.get("http1_fallback", True)
+        )
+        self._sweeping = False
+
+    async def __aenter__(self) -> "ScanContext":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """Ouvre le transport s'il ne l'est pas encore."""
+        if self.transport.is_open:
+            return
+        await self.transport.open()
+        if self.sweep_interval and isinstance(self.cache, ResponseCache):
+            self.cache.start_sweeper(self.sweep_interval)
+            self._sweeping = True
+
+    async def close(self) -> None:
+        """Ferme le transport et libère toutes ses connexions."""
+        if self._sweeping and isinstance(self.cache, ResponseCache):
+            self._sweeping = False
+            await self.cache.stop_sweeper()
+        await self.transport.close()
+
+    @property
+    def session(self) -> Any:
+        """Session (ou client) HTTP partagée du transport du contexte."""
+        if not self.transport.is_open:
+            raise DNAReconError("Le contexte de scan n'est pas ouvert")
+        return self.transport.session
+
+class _BodyReader:
+    """
+    Accumule un corps de réponse lu par morceaux.
+
+    La lecture s'arrête au-delà de `max_body_bytes` (le corps est alors marqué
+    comme tronqué) et l'empreinte SHA-256 est calculée au fil du flux.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, headers: Optional[Any] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else config.get("max_body_bytes")
+        self.encoding = _charset_from_headers(headers or {})
+        self.size = 0
+        self.truncated = False
+        self._chunks: List[bytes] = []
+        self._hash = hashlib.sha256()
+
+    def feed(self, chunk: bytes) -> bool:
+        """Ajoute un morceau au corps ; retourne False une fois la limite atteinte."""
+        if self.max_bytes is not None and self.size + len(chunk) > self.max_bytes:
+            chunk = chunk[:max(0, self.max_bytes - self.size)]
+            self.truncated = True
+        if chunk:
+            self._chunks.append(chunk)
+            self._hash.update(chunk)
+            self.size += len(chunk)
+        return not self.truncated
+
+    def text(self) -> str:
+        """Décode le corps lu (les séquences coupées par la troncature sont remplacées)."""
+        data = b"".join(self._chunks)
+        try:
+            return data.decode(self.encoding or "utf-8", errors="replace")
+        except LookupError:
+            return data.decode("utf-8", errors="replace")
+
+    def to_result(self, status_code: int, headers: Dict[str, str]) -> Dict[str, Any]:
+        """Construit le dictionnaire de résultat d'une requête."""
+        return {
+            "status_code": status_code,
+            "headers": headers,
+            "body": self.text(),
+            "body_bytes": self.size,
+            "truncated": self.truncated,
+            "content_hash": self._hash.hexdigest()
+        }
+
+def _charset_from_headers(headers: Any) -> Optional[str]:
+    """Extrait le jeu de caractères déclaré dans l'en-tête Content-Type."""
+    content_type = headers.get("Content-Type") or headers.get("content-type") or ""
+    for param in content_type.split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset" and value:
+            return value.strip().strip('"\'')
+    return None
 
 def validate_url(url: str) -> Optional[str]:
     """Valide et nettoie l'URL."""
@@ -163,59 +545,104 @@ def validate_url(url: str) -> Optional[str]:
 
 def get_random_user_agent() -> str:
     """Retourne un User-Agent aléatoire."""
-    import random
     return random.choice(USER_AGENTS)
 
-async def _async_request(url: str, custom_headers: Optional[Dict] = None, use_cache: bool = True) -> Dict[str, Any]:
-    """Effectue une requête HTTP asynchrone avec support du cache et des retries."""
+async def _async_request(
+    url: str,
+    custom_headers: Optional[Dict] = None,
+    use_cache: bool = True,
+    context: Optional[ScanContext] = None
+) -> Dict[str, Any]:
+    """
+    Effectue une requête HTTP asynchrone avec support du cache et des retries.
+
+    Si aucun contexte n'est fourni, un contexte temporaire est ouvert pour la durée
+    de la requête (retries compris).
+    """
     if not validate_url(url):
         raise ValidationError(f"URL invalide: {url}")
 
-    # Vérifie le cache si activé
+    # Vérifie le cache si activé ; une entrée expirée sert à une requête conditionnelle
+    cache = context.cache if context is not None else response_cache
+    stale_response = None
     if use_cache:
-        cached_response = await response_cache.get(url)
+        cached_response = await cache.get(url)
         if cached_response:
             logger.debug(f"Utilisation de la réponse en cache pour {url}")
             return cached_response
+        stale_response = await cache.get_stale(url)
 
     headers = {
         **DEFAULT_SECURITY_HEADERS,
         "User-Agent": get_random_user_agent(),
-        **(custom_headers or {})
+        **(custom_headers or {}),
+        **conditional_headers(stale_response)
     }
 
-    last_error = None
-    for attempt in range(RETRY_COUNT):
+    async def _send() -> Dict[str, Any]:
+        if context is None:
+            async with ScanContext(cache=cache) as own_context:
+                return await _fetch_with_retries(url, headers, use_cache, own_context, stale_response)
+        return await _fetch_with_retries(url, headers, use_cache, context, stale_response)
+
+    # Les appels concurrents sur une même clé de cache partagent une seule requête
+    if use_cache:
+        return await in_flight_requests.do(url, _send)
+    return await _send()
+
+async def _fetch_with_retries(
+    url: str,
+    headers: Dict[str, str],
+    use_cache: bool,
+    context: ScanContext,
+    stale_response: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Envoie la requête via le transport du contexte en appliquant la politique de retry.
+
+    Les réponses HTTP sont retournées comme résultats, y compris les erreurs 4xx ;
+    seules les réponses transitoires (429, 5xx) et les erreurs réseau sont retentées.
+    Un 304 en réponse à une requête conditionnelle retourne l'entrée revalidée.
+    """
+    policy = context.retry_policy
+    transport = context.transport
+    if not transport.is_open:
+        raise DNAReconError("Le contexte de scan n'est pas ouvert")
+    network_errors = (asyncio.TimeoutError, *transport.network_errors)
+    last_error: Optional[BaseException] = None
+    for attempt in range(policy.max_attempts):
         try:
-            async with aiohttp.ClientSession() as session:
-                response = await session.get(
-                    url,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(**TIMEOUT_CONFIG),
-                    ssl=config.get("security", {}).get("verify_ssl", True)
-                )
-                
-                if response.status >= 400:
-                    text = await response.text()
-                    raise RequestError(f"Erreur HTTP {response.status}: {text}")
+            status, response_headers, reader = await transport.get(
+                url, headers, lambda headers: _BodyReader(headers=headers)
+            )
+
+            if status == 304 and stale_response is not None:
+                logger.debug(f"Réponse en cache revalidée pour {url}")
+                await context.cache.touch(url)
+                return stale_response
+
+            result: Dict[str, Any] = reader.to_result(status, response_headers)
 
-                result = {
-                    "status_code": response.status,
-                    "headers": dict(response.headers),
-                    "body": await response.text()
-                }
+            if policy.should_retry_status(status) and attempt < policy.max_attempts - 1:
+                delay = policy.compute_delay(attempt, get_header(response_headers, "Retry-After"))
+                logger.warning(
+                    f"Tentative {attempt + 1}/{policy.max_attempts} pour {url}: "
+                    f"HTTP {status}, nouvel essai dans {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
 
-                # Met en cache la réponse si le cache est activé
-                if use_cache and response.status == 200:
-                    await response_cache.set(url, result)
+            # Met en cache la réponse si le cache est activé
+            if use_cache and status == 200:
+                await context.cache.set(url, result)
 
-                return result
+            return result
 
-        except (asyncio.TimeoutError, aiohttp.ClientError, RequestError) as e:
+        except network_errors as e:
             last_error = e
-            if attempt < RETRY_COUNT - 1:
-                logger.warning(f"Tentative {attempt + 1}/{RETRY_COUNT} échouée pour {url}: {str(e)}")
-                await asyncio.sleep(RETRY_DELAY)
+            if attempt < policy.max_attempts - 1:
+                logger.warning(f"Tentative {attempt + 1}/{policy.max_attempts} échouée pour {url}: {str(e)}")
+                await asyncio.sleep(policy.compute_delay(attempt))
             continue
         except Exception as e:
             logger.error(f"Erreur inattendue lors de la requête vers {url}: {str(e)}")
@@ -224,17 +651,60 @@ async def _async_request(url: str, custom_headers: Optional[Dict] = None, use_ca
     # Si toutes les tentatives ont échoué
     if last_error is None:
         raise DNAReconError(f"Erreur inconnue lors de la requête vers {url}")
-    elif isinstance(last_error, asyncio.TimeoutError):
+    elif isinstance(last_error, (asyncio.TimeoutError, *transport.timeout_errors)):
         raise TimeoutError(f"Timeout lors de la requête vers {url}")
-    elif isinstance(last_error, aiohttp.ClientError):
+    elif isinstance(last_error, transport.network_errors):
         raise RequestError(f"Erreur client: {str(last_error)}")
-    elif isinstance(last_error, RequestError):
-        raise last_error
     else:
         raise DNAReconError(f"Erreur inattendue: {str(last_error)}")
 
-def _sync_request(url: str, custom_headers: Optional[Dict] = None) -> Dict[str, Any]:
-    """Effectue une requête HTTP synchrone."""
+def create_sync_session(
+    pool_connections: Optional[int] = None,
+    pool_maxsize: Optional[int] = None
+) -> requests.Session:
+    """
+    Crée une session `requests` dont les connexions sont réutilisées (keep-alive).
+
+    Args:
+        pool_connections: Nombre d'hôtes dont le pool est conservé (`connection_pool.limit`)
+        pool_maxsize: Connexions maximales par hôte (`connection_pool.limit_per_host`) ;
+            les threads en excès attendent qu'une connexion se libère
+    """
+    pool_config = config.get("connection_pool", {})
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections or pool_config.get("limit", 100),
+        pool_maxsize=pool_maxsize or pool_config.get("limit_per_host", 10),
+        pool_block=True,
+        max_retries=0  # Les retries sont gérés par RetryPolicy
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+_shared_sync_session: Optional[requests.Session] = None
+_shared_sync_session_lock = threading.Lock()
+
+def get_sync_session() -> requests.Session:
+    """Retourne la session synchrone partagée par les appels `run(..., is_async=False)`."""
+    global _shared_sync_session
+    with _shared_sync_session_lock:
+        if _shared_sync_session is None:
+            _shared_sync_session = create_sync_session()
+        return _shared_sync_session
+
+def _sync_request(
+    url: str,
+    custom_headers: Optional[Dict] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    session: Optional[requests.Session] = None
+) -> Dict[str, Any]:
+    """
+    Effectue une requête HTTP synchrone en appliquant la politique de retry.
+
+    La requête passe par `session` si elle est fournie, afin de réutiliser ses
+    connexions ; sinon par `requests.get`.
+    """
     if not validate_url(url):
         raise ValidationError(f"URL invalide: {url}")
 
@@ -243,31 +713,58 @@ def _sync_request(url: str, custom_headers: Optional[Dict] = None) -> Dict[str,
         "User-Agent": get_random_user_agent(),
         **(custom_headers or {})
     }
-    
-    try:
-        response = requests.get(
-            url,
-            headers=headers,
-            timeout=config.get("timeout", 30),
-            verify=config.get("security", {}).get("verify_ssl", True)
-        )
-        response.raise_for_status()
-        return {
-            "status_code": response.status_code,
-            "headers": dict(response.headers),
-            "body": response.text
-        }
-    except requests.Timeout:
-        logger.error(f"Timeout lors de la requête vers {url}")
-        raise TimeoutError(f"Timeout lors de la requête vers {url}")
-    except requests.RequestException as e:
-        logger.error(f"Erreur lors de la requête vers {url}: {str(e)}")
-        raise RequestError(f"Erreur client: {str(e)}")
-    except Exception as e:
-        logger.error(f"Erreur inattendue lors de la requête vers {url}: {str(e)}")
-        raise DNAReconError(f"Erreur inattendue: {str(e)}")
+    policy = retry_policy or RetryPolicy.from_config()
+    http = session if session is not None else requests
+
+    for attempt in range(policy.max_attempts):
+        is_last = attempt == policy.max_attempts - 1
+        try:
+            response = http.get(
+                url,
+                headers=headers,
+                timeout=config.get("timeout", 30),
+                verify=config.get("security", {}).get("verify_ssl", True),
+                stream=True
+            )
+            with response:
+                reader = _BodyReader(headers=response.headers)
+                for chunk in response.iter_content(chunk_size=BODY_CHUNK_SIZE):
+                    if not reader.feed(chunk):
+                        break
+            if policy.should_retry_status(response.status_code) and not is_last:
+                delay = policy.compute_delay(attempt, response.headers.get("Retry-After"))
+                logger.warning(
+                    f"Tentative {attempt + 1}/{policy.max_attempts} pour {url}: "
+                    f"HTTP {response.status_code}, nouvel essai dans {delay:.2f}s"
+                )
+                sleep(delay)
+                continue
+            return reader.to_result(response.status_code, dict(response.headers))
+        except (requests.Timeout, requests.ConnectionError) as e:
+            if not is_last:
+                logger.warning(f"Tentative {attempt + 1}/{policy.max_attempts} échouée pour {url}: {str(e)}")
+                sleep(policy.compute_delay(attempt))
+                continue
+            if isinstance(e, requests.Timeout):
+                logger.error(f"Timeout lors de la requête vers {url}")
+                raise TimeoutError(f"Timeout lors de la requête vers {url}")
+            logger.error(f"Erreur lors de la requête vers {url}: {str(e)}")
+            raise RequestError(f"Erreur client: {str(e)}")
+        except requests.RequestException as e:
+            logger.error(f"Erreur lors de la requête vers {url}: {str(e)}")
+            raise RequestError(f"Erreur client: {str(e)}")
+        except Exception as e:
+            logger.error(f"Erreur inattendue lors de la requête vers {url}: {str(e)}")
+            raise DNAReconError(f"Erreur inattendue: {str(e)}")
+    raise DNAReconError(f"Erreur inconnue lors de la requête vers {url}")
 
-async def run(url: str, custom_headers: Optional[Dict] = None, is_async: bool = True, use_cache: bool = True) -> Dict[str, Any]:
+async def run(
+    url: str,
+    custom_headers: Optional[Dict] = None,
+    is_async: bool = True,
+    use_cache: bool = True,
+    context: Optional[ScanContext] = None
+) -> Dict[str, Any]:
     """
     Analyse une URL et retourne les résultats.
     
@@ -276,14 +773,17 @@ async def run(url: str, custom_headers: Optional[Dict] = None, is_async: bool =
         custom_headers: Headers HTTP personnalisés
         is_async: Si True, utilise une requête asynchrone
         use_cache: Si True, utilise le cache pour les réponses
+        context: Contexte de scan dont la session est réutilisée (mode asynchrone)
     
     Returns:
         Dict contenant les résultats de l'analyse
     """
     try:
         if is_async:
-            return await _async_request(url, custom_headers, use_cache)
-        return await asyncio.to_thread(_sync_request, url, custom_headers)
+            return await _async_request(url, custom_headers, use_cache, context)
+        return await asyncio.to_thread(
+            _sync_request, url, custom_headers, None, get_sync_session()
+        )
     except Exception as e:
         logger.error(f"Erreur lors de l'analyse de {url}: {str(e)}")
         raise
@@ -295,69 +795,607 @@ def print_results(results: Dict[str, Any]) -> None:
     print("Headers:", {k: v for k, v in results.get("headers", {}).items() if not k.lower().startswith(("cookie", "authorization"))})
     print("Body:", results.get("body", "")[:300])
 
-async def process_attacks_async(target: str, rate_limiter: RateLimiter) -> List[Dict[str, Any]]:
-    """Traite les attaques de manière asynchrone avec rate limiting."""
-    results = []
-    for attack in MUTATIONS:
-        if attack[0] == "idor":
-            payloads = [attack[1], attack[2]]
-        else:
-            payloads = [f"?input={attack[1]}"]
+def _pending_jobs(
+    plan: Iterable[Tuple[str, str]],
+    checkpoint: Optional[Checkpoint] = None
+) -> Iterator[Tuple[int, str, str]]:
+    """Numérote le plan d'attaque et ignore les éléments déjà traités."""
+    for index, (attack, url) in enumerate(plan):
+        if checkpoint is None or not checkpoint.is_done(index):
+            yield index, attack, url
+
+def _indexed(
+    worker: Callable[[Tuple[int, str, str]], Awaitable[R]]
+) -> Callable[[Tuple[int, str, str]], Awaitable[Tuple[int, R]]]:
+    """Associe l'indice de la tâche au résultat d'un worker."""
+    async def _run(job: Tuple[int, str, str]) -> Tuple[int, R]:
+        return job[0], await worker(job)
+    return _run
+
+_payload_corpus: Optional[PayloadCorpus] = None
+
+def get_payload_corpus() -> PayloadCorpus:
+    """Retourne le corpus de payloads de la configuration, chargé à la première utilisation."""
+    global _payload_corpus
+    if _payload_corpus is None:
+        _payload_corpus = PayloadCorpus.from_config(config.config)
+    return _payload_corpus
+
+def _build_attack_plan(target: str, corpus: Optional[PayloadCorpus] = None) -> Iterator[Tuple[str, str]]:
+    """Génère paresseusement, dans un ordre déterministe, les couples (attaque, URL) à envoyer."""
+    return (corpus or get_payload_corpus()).plan(target)
+
+async def _bounded_ordered(
+    jobs: Iterable[T],
+    worker: Callable[[T], Awaitable[R]],
+    concurrency: int
+) -> AsyncIterator[R]:
+    """
+    Exécute `worker` sur chaque tâche avec au plus `concurrency` appels simultanés.
+
+    Les tâches sont consommées paresseusement et les résultats sont produits dans
+    l'ordre des tâches, quel que soit leur ordre de terminaison.
+    """
+    concurrency = max(1, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _bounded(job: T) -> R:
+        async with semaphore:
+            return await worker(job)
+
+    window: Deque["asyncio.Future[R]"] = deque()
+    try:
+        for job in jobs:
+            window.append(asyncio.ensure_future(_bounded(job)))
+            # Fenêtre plus large que la concurrence pour limiter le blocage en tête de file
+            if len(window) >= concurrency * 2:
+                yield await window.popleft()
+        while window:
+            yield await window.popleft()
+    finally:
+        for task in window:
+            task.cancel()
+
+def _attack_result(
+    attack: str,
+    url: str,
+    res: Dict[str, Any],
+    baseline: Optional[Fingerprint] = None
+) -> Dict[str, Any]:
+    """
+    Met en forme la réponse à une mutation.
+
+    Le résultat contient l'empreinte de la réponse et sa distance à la réponse de
+    référence de la cible (None sans référence). Avec `fingerprint.keep_body` à
+    False, les en-têtes et le corps complets ne sont pas conservés.
+    """
+    fingerprint = Fingerprint.from_result(res)
+    result = {
+        "url": url,
+        "status": res["status_code"],
+        "attack": attack,
+        "fingerprint": fingerprint.as_dict(),
+        "distance": distance(baseline, fingerprint)
+    }
+    if config.get("fingerprint", {}).get("keep_body", True):
+        result["headers"] = res["headers"]
+        result["body"] = res["body"]
+    return result
+
+def _attack_error(attack: str, url: str, error: Exception) -> Dict[str, Any]:
+    """Met en forme l'échec d'une mutation."""
+    return {
+        "url": url,
+        "status": "ERROR",
+        "body": str(error),
+        "attack": attack
+    }
+
+# Taille de corps (en caractères) au-delà de laquelle l'empreinte est calculée
+# dans un thread, pour ne pas bloquer la boucle d'événements
+FINGERPRINT_THREAD_CHARS = 64 * 1024
+
+async def _fingerprint_off_loop(body: Optional[str], func: Callable[..., R], *args: Any) -> R:
+    """Appelle `func` (qui calcule une empreinte), dans un thread si le corps est volumineux."""
+    if body and len(body) >= FINGERPRINT_THREAD_CHARS:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+def _baseline_enabled() -> bool:
+    """Indique si une réponse de référence est récupérée pour chaque cible."""
+    return bool(config.get("fingerprint", {}).get("baseline", True))
+
+async def _fetch_baseline(
+    target: str,
+    rate_limiter: RateLimiter,
+    context: ScanContext
+) -> Optional[Fingerprint]:
+    """Récupère la réponse non modifiée d'une cible et retourne son empreinte."""
+    host = urlparse(target).netloc
+    try:
+        await rate_limiter.acquire(host)
+        res = await _async_request(target, context=context)
+        return await _fingerprint_off_loop(res.get("body"), Fingerprint.from_result, res)
+    except Exception as e:
+        logger.warning(f"Réponse de référence indisponible pour {target}: {str(e)}")
+        return None
+    finally:
+        rate_limiter.release(host)
+
+async def _attack_request(
+    attack: str,
+    url: str,
+    rate_limiter: RateLimiter,
+    context: ScanContext,
+    baseline: Optional[Fingerprint] = None
+) -> Dict[str, Any]:
+    """Envoie une mutation et la met en forme sous forme de résultat."""
+    host = urlparse(url).netloc
+    try:
+        await rate_limiter.acquire(host)
+        res = await _async_request(url, context=context)
+        return await _fingerprint_off_loop(res.get("body"), _attack_result, attack, url, res, baseline)
+    except Exception as e:
+        return _attack_error(attack, url, e)
+    finally:
+        rate_limiter.release(host)
+
+async def iter_attacks_async(
+    target: str,
+    rate_limiter: RateLimiter,
+    context: ScanContext,
+    concurrency: Optional[int] = None,
+    corpus: Optional[PayloadCorpus] = None,
+    checkpoint: Optional[Checkpoint] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Envoie les mutations d'une cible en parallèle et produit les résultats dans
+    l'ordre du plan d'attaque. La réponse non modifiée de la cible est récupérée
+    une fois au préalable pour calculer la distance de chaque mutation.
 
-        for p in payloads:
+    Avec un point de reprise, les mutations déjà traitées sont ignorées et chaque
+    mutation est marquée comme traitée une fois son résultat consommé.
+
+    Args:
+        target: URL cible
+        rate_limiter: Limiteur appliqué à chaque requête
+        context: Contexte de scan ouvert
+        concurrency: Nombre maximal de requêtes simultanées (config `scan.concurrency`)
+        corpus: Corpus de payloads (celui de la configuration par défaut)
+        checkpoint: Point de reprise du plan d'attaque
+    """
+    if concurrency is None:
+        concurrency = config.get("scan", {}).get("concurrency", 10)
+
+    baseline = await _fetch_baseline(target, rate_limiter, context) if _baseline_enabled() else None
+
+    async def _worker(job: Tuple[int, str, str]) -> Dict[str, Any]:
+        _, attack, url = job
+        return await _attack_request(attack, url, rate_limiter, context, baseline)
+
+    jobs = _pending_jobs(_build_attack_plan(target, corpus), checkpoint)
+    async for index, result in _bounded_ordered(jobs, _indexed(_worker), concurrency):
+        yield result
+        if checkpoint is not None:
+            checkpoint.mark_done(index)
+
+async def process_attacks_async(
+    target: str,
+    rate_limiter: RateLimiter,
+    context: Optional[ScanContext] = None,
+    concurrency: Optional[int] = None,
+    corpus: Optional[PayloadCorpus] = None
+) -> List[Dict[str, Any]]:
+    """
+    Traite les attaques de manière asynchrone avec rate limiting.
+
+    Les mutations sont envoyées en parallèle (au plus `concurrency` à la fois) et
+    les résultats sont retournés dans l'ordre du plan d'attaque. Toutes les
+    mutations d'une cible partagent la session du contexte fourni, ou celle d'un
+    contexte ouvert pour la durée du traitement.
+    """
+    if context is None:
+        async with ScanContext() as own_context:
+            return await process_attacks_async(target, rate_limiter, own_context, concurrency, corpus)
+
+    return [
+        result async for result in iter_attacks_async(target, rate_limiter, context, concurrency, corpus)
+    ]
+
+class SyncScanEngine:
+    """
+    Moteur de scan synchrone, pour les environnements sans boucle asyncio.
+
+    Les requêtes partagent une session `requests` à connexions persistantes et
+    sont réparties sur un pool de threads, dans la limite du même `RateLimiter`
+    par hôte que le mode asynchrone.
+
+        with SyncScanEngine() as engine:
+            results = engine.process_attacks(target)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        session: Optional[requests.Session] = None,
+        corpus: Optional[PayloadCorpus] = None
+    ):
+        self.max_workers = max(1, max_workers or config.get("scan", {}).get("concurrency", 10))
+        self.rate_limiter = rate_limiter or RateLimiter.from_config()
+        self.retry_policy = retry_policy or RetryPolicy.from_config()
+        self.session = session if session is not None else create_sync_session()
+        self.corpus = corpus
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="dnarecon-sync"
+        )
+
+    def __enter__(self) -> "SyncScanEngine":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Arrête le pool de threads et ferme la session."""
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+    def request(self, url: str, custom_headers: Optional[Dict] = None) -> Dict[str, Any]:
+        """Effectue une requête limitée en débit via la session partagée."""
+        self.rate_limiter.acquire_sync(urlparse(url).netloc)
+        return _sync_request(url, custom_headers, self.retry_policy, self.session)
+
+    def map_ordered(self, jobs: Iterable[T], worker: Callable[[T], R]) -> Iterator[R]:
+        """
+        Applique `worker` aux tâches dans le pool de threads et produit les
+        résultats dans l'ordre des tâches, en ne gardant qu'une fenêtre bornée
+        de tâches en attente.
+        """
+        window: Deque["Future[R]"] = deque()
+        try:
+            for job in jobs:
+                window.append(self._executor.submit(worker, job))
+                if len(window) >= self.max_workers * 2:
+                    yield window.popleft().result()
+            while window:
+                yield window.popleft().result()
+        finally:
+            for future in window:
+                future.cancel()
+
+    def _baseline(self, target: str) -> Optional[Fingerprint]:
+        """Récupère la réponse non modifiée d'une cible et retourne son empreinte."""
+        try:
+            return Fingerprint.from_result(self.request(target))
+        except Exception as e:
+            logger.warning(f"Réponse de référence indisponible pour {target}: {str(e)}")
+            return None
+
+    def iter_attacks(self, target: str, checkpoint: Optional[Checkpoint] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Envoie les mutations d'une cible en parallèle, résultats dans l'ordre du plan
+        (voir `iter_attacks_async` pour le point de reprise).
+        """
+        baseline = self._baseline(target) if _baseline_enabled() else None
+
+        def _attack(job: Tuple[int, str, str]) -> Tuple[int, Dict[str, Any]]:
+            index, attack, url = job
             try:
-                await rate_limiter.acquire()
-                full_url = target + p
-                res = await _async_request(full_url)
-                results.append({
-                    "url": full_url,
-                    "status": res["status_code"],
-                    "headers": res["headers"],
-                    "body": res["body"],
-                    "attack": attack[0]
-                })
+                return index, _attack_result(attack, url, self.request(url), baseline)
             except Exception as e:
-                results.append({
-                    "url": target + p,
-                    "status": "ERROR",
-                    "body": str(e),
-                    "attack": attack[0]
-                })
-            finally:
-                rate_limiter.release()
-    return results
-
-def process_attacks_sync(target: str) -> List[Dict[str, Any]]:
-    """Traite les attaques de manière synchrone."""
-    results = []
-    for attack in MUTATIONS:
-        if attack[0] == "idor":
-            payloads = [attack[1], attack[2]]
+                return index, _attack_error(attack, url, e)
+
+        jobs = _pending_jobs(_build_attack_plan(target, self.corpus), checkpoint)
+        for index, result in self.map_ordered(jobs, _attack):
+            yield result
+            if checkpoint is not None:
+                checkpoint.mark_done(index)
+
+    def process_attacks(self, target: str) -> List[Dict[str, Any]]:
+        """Traite toutes les mutations d'une cible."""
+        return list(self.iter_attacks(target))
+
+def process_attacks_sync(target: str, engine: Optional[SyncScanEngine] = None) -> List[Dict[str, Any]]:
+    """
+    Traite les attaques de manière synchrone, via un moteur à pool de threads
+    (créé pour l'occasion si aucun n'est fourni).
+    """
+    if engine is None:
+        with SyncScanEngine() as own_engine:
+            return own_engine.process_attacks(target)
+    return engine.process_attacks(target)
+
+async def _aiter(items: Union[Iterable[T], AsyncIterable[T]]) -> AsyncIterator[T]:
+    """Parcourt indifféremment un itérable synchrone ou asynchrone."""
+    if hasattr(items, "__aiter__"):
+        async for item in items:  # type: ignore[union-attr]
+            yield item
+    else:
+        for item in items:  # type: ignore[union-attr]
+            yield item
+
+async def _scan_target(
+    url: str,
+    custom_headers: Optional[Dict],
+    use_cache: bool,
+    context: ScanContext,
+    rate_limiter: RateLimiter
+) -> Dict[str, Any]:
+    """Analyse une cible ; les erreurs sont retournées comme résultat."""
+    start_time = monotonic()
+    try:
+        await rate_limiter.acquire(urlparse(url).netloc)
+        result = await _async_request(url, custom_headers, use_cache, context)
+        return {
+            "url": url,
+            **result,
+            "duration_ms": (monotonic() - start_time) * 1000
+        }
+    except Exception as e:
+        return {
+            "url": url,
+            "error": str(e),
+            "duration_ms": (monotonic() - start_time) * 1000
+        }
+
+async def scan_many(
+    targets: Union[Iterable[str], AsyncIterable[str]],
+    concurrency: Optional[int] = None,
+    custom_headers: Optional[Dict] = None,
+    use_cache: bool = True,
+    context: Optional[ScanContext] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    transport: Optional[str] = None,
+    checkpoint: Optional[Checkpoint] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Analyse un flux de cibles et produit les résultats au fil de leur terminaison.
+
+    Les cibles sont consommées paresseusement : une nouvelle cible n'est lue que
+    lorsqu'une place se libère parmi les `concurrency` analyses en cours, ce qui
+    borne la mémoire quelle que soit la taille de la liste.
+
+    Args:
+        targets: Itérable (synchrone ou asynchrone) d'URLs
+        concurrency: Nombre maximal d'analyses simultanées (config `scan.concurrency`)
+        custom_headers: Headers HTTP personnalisés
+        use_cache: Si True, utilise le cache pour les réponses
+        context: Contexte de scan partagé (un contexte est ouvert sinon)
+        rate_limiter: Limiteur par hôte (créé depuis la configuration sinon)
+        transport: Transport du contexte ouvert lorsque `context` n'est pas fourni
+        checkpoint: Point de reprise ; les cibles déjà traitées (par leur rang dans
+            le flux) sont ignorées et chaque cible est marquée comme traitée une
+            fois son résultat consommé
+
+    Yields:
+        Un résultat par cible, contenant `url` et soit la réponse, soit `error`
+    """
+    if concurrency is None:
+        concurrency = config.get("scan", {}).get("concurrency", 10)
+    concurrency = max(1, concurrency)
+    if rate_limiter is None:
+        rate_limiter = RateLimiter.from_config()
+    if context is None:
+        async with ScanContext(transport=transport) as own_context:
+            async for result in scan_many(
+                targets, concurrency, custom_headers, use_cache, own_context, rate_limiter,
+                checkpoint=checkpoint
+            ):
+                yield result
+        return
+
+    pending: Set["asyncio.Future[Dict[str, Any]]"] = set()
+    # Rang de chaque cible en cours dans le flux, pour le point de reprise
+    indexes: Dict["asyncio.Future[Dict[str, Any]]", int] = {}
+
+    def _finish(task: "asyncio.Future[Dict[str, Any]]") -> None:
+        index = indexes.pop(task, None)
+        if index is not None and checkpoint is not None:
+            checkpoint.mark_done(index)
+
+    try:
+        index = -1
+        async for url in _aiter(targets):
+            index += 1
+            if checkpoint is not None and checkpoint.is_done(index):
+                continue
+            # Produit sans attendre les analyses déjà terminées
+            for task in [task for task in pending if task.done()]:
+                pending.discard(task)
+                yield task.result()
+                _finish(task)
+            if len(pending) >= concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+                    _finish(task)
+            task = asyncio.ensure_future(
+                _scan_target(url, custom_headers, use_cache, context, rate_limiter)
+            )
+            pending.add(task)
+            if checkpoint is not None:
+                indexes[task] = index
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+                _finish(task)
+    finally:
+        for task in pending:
+            task.cancel()
+
+def _iter_target_lines(stream: TextIO) -> Iterator[str]:
+    """Lit les cibles d'un fichier texte (une URL par ligne, `#` pour commenter)."""
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+def _open_targets(input_path: str) -> TextIO:
+    """Ouvre un fichier de cibles, ou stdin pour `-`."""
+    return sys.stdin if input_path == "-" else open(input_path, "r", encoding="utf-8")
+
+async def warm_cache(
+    targets: Union[Iterable[str], AsyncIterable[str]],
+    concurrency: Optional[int] = None,
+    context: Optional[ScanContext] = None
+) -> Dict[str, int]:
+    """
+    Précharge le cache de réponses avec une liste de cibles, en concurrence bornée.
+
+    Returns:
+        Le nombre de cibles mises en cache (`warmed`) et d'échecs (`failed`)
+    """
+    counts = {"warmed": 0, "failed": 0}
+    async for result in scan_many(targets, concurrency=concurrency, use_cache=True, context=context):
+        if result.get("status_code") == 200:
+            counts["warmed"] += 1
         else:
-            payloads = [f"?input={attack[1]}"]
+            counts["failed"] += 1
+    return counts
 
-        for p in payloads:
-            try:
-                full_url = target + p
-                res = _sync_request(full_url)
-                results.append({
-                    "url": full_url,
-                    "status": res["status_code"],
-                    "headers": res["headers"],
-                    "body": res["body"],
-                    "attack": attack[0]
-                })
-            except Exception as e:
-                results.append({
-                    "url": target + p,
-                    "status": "ERROR",
-                    "body": str(e),
-                    "attack": attack[0]
-                })
-    return results
-
-def main():
-    """Point d'entrée principal avec gestion des erreurs et logging."""
+async def warm_cache_file(input_path: str = "-", concurrency: Optional[int] = None) -> Dict[str, int]:
+    """Précharge le cache avec les cibles d'un fichier (ou de stdin avec `-`)."""
+    source = _open_targets(input_path)
+    try:
+        return await warm_cache(_iter_target_lines(source), concurrency=concurrency)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+async def scan_file(
+    input_path: str = "-",
+    output_path: Optional[str] = "-",
+    concurrency: Optional[int] = None,
+    custom_headers: Optional[Dict] = None,
+    transport: Optional[str] = None,
+    resume: bool = False
+) -> int:
+    """
+    Analyse les cibles d'un fichier (ou de stdin avec `-`) et écrit un résultat
+    JSON par ligne dans le fichier de sortie (ou stdout).
+
+    Un point de reprise est tenu à jour à côté du fichier de sortie (ou, pour une
+    sortie standard, du fichier de cibles) ; avec `resume` et un point de reprise
+    enregistré, les cibles déjà traitées sont ignorées et les résultats ajoutés au
+    fichier de sortie existant, d'abord ramené à sa taille au dernier point de
+    reprise. Sans point de reprise, la sortie est réécrite.
+
+    Returns:
+        Le nombre de résultats écrits
+    """
+    checkpoint_path = _checkpoint_path(output_path, input_path)
+    if resume and checkpoint_path is None:
+        raise DNAReconError("La reprise nécessite un fichier de cibles ou de sortie")
+
+    checkpoint = None
+    if checkpoint_path is not None:
+        if resume and input_path == "-":
+            logger.warning("Reprise depuis stdin : les cibles doivent être fournies dans le même ordre")
+        checkpoint = open_checkpoint(checkpoint_path, _scan_plan_id(input_path), resume)
+    # Sans point de reprise enregistré, la sortie est réécrite depuis le début
+    resume = resume and checkpoint is not None and checkpoint.resumed
+
+    source = _open_targets(input_path)
+    if output_path in (None, "-"):
+        sink = sys.stdout
+    else:
+        offset = checkpoint.data.get("offset") if checkpoint is not None and resume else None
+        if offset is not None and os.path.exists(output_path) and os.path.getsize(output_path) > offset:
+            # Écarte les résultats écrits après le dernier point de reprise
+            os.truncate(output_path, offset)
+        sink = open(output_path, "a" if resume else "w", encoding="utf-8")
+    if checkpoint is not None:
+        checkpoint.on_save = _sink_saver(sink, checkpoint)
+    count = 0
+    try:
+        async for result in scan_many(
+            _iter_target_lines(source), concurrency=concurrency, custom_headers=custom_headers,
+            transport=transport, checkpoint=checkpoint
+        ):
+            sink.write(json.dumps(result, ensure_ascii=False) + "\n")
+            count += 1
+        if checkpoint is not None:
+            checkpoint.complete()
+        sink.flush()
+        logger.info(f"Statistiques du cache : {await response_cache.stats()}")
+    finally:
+        if checkpoint is not None and not checkpoint.completed:
+            checkpoint.save()
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return count
+
+def _checkpoint_path(output_path: Optional[str], input_path: Optional[str] = None) -> Optional[str]:
+    """Chemin du point de reprise associé à une sortie (ou à défaut à une entrée)."""
+    for path in (output_path, input_path):
+        if path not in (None, "-"):
+            return f"{path}.checkpoint"
+    return None
+
+def open_checkpoint(path: str, plan_id: str, resume: bool = False) -> Checkpoint:
+    """Crée un point de reprise selon la section `checkpoint` de la configuration."""
+    checkpoint_config = config.get("checkpoint", {})
+    return Checkpoint.open(
+        path, plan_id, resume,
+        every=checkpoint_config.get("every", 1000),
+        interval=checkpoint_config.get("interval", 30.0)
+    )
+
+async def _write_attacks_async(
+    target: str,
+    writer: Union[ResultWriter, ResultStore],
+    checkpoint: Optional[Checkpoint] = None
+) -> None:
+    """Envoie les mutations d'une cible et écrit chaque résultat dès sa réception."""
+    rate_limiter = RateLimiter.from_config()
+    async with ScanContext() as context:
+        async for result in iter_attacks_async(target, rate_limiter, context, checkpoint=checkpoint):
+            writer.write(result)
+
+def _sink_saver(sink: TextIO, checkpoint: Checkpoint) -> Callable[[], None]:
+    """Action `on_save` qui vide la sortie et mémorise sa taille (sauf pour stdout)."""
+    def save() -> None:
+        sink.flush()
+        if sink is not sys.stdout:
+            checkpoint.data["offset"] = os.path.getsize(sink.name)
+    return save
+
+def _offsets_saver(writer: ResultWriter, checkpoint: Checkpoint) -> Callable[[], None]:
+    """Action `on_save` qui termine les fichiers de résultats et mémorise leur taille."""
+    def save() -> None:
+        checkpoint.data["offsets"] = writer.sync()
+    return save
+
+def _attack_plan_id(target: str) -> str:
+    """Identifie le plan d'attaque d'une cible (cible et contenu du corpus)."""
+    return f"attacks:{target}:{get_payload_corpus().digest()[:16]}"
+
+def _scan_plan_id(input_path: str) -> str:
+    """
+    Identifie le plan de `scan_file` par le contenu du fichier de cibles ; stdin,
+    qui ne peut être relu, n'est identifié que par son nom.
+    """
+    if input_path == "-":
+        return "scan:-"
+    digest = hashlib.sha256()
+    with open(input_path, "rb") as f:
+        for block in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+            digest.update(block)
+    return f"scan:{input_path}:{digest.hexdigest()[:16]}"
+
+def main(resume: bool = False):
+    """
+    Point d'entrée principal avec gestion des erreurs et logging.
+
+    Un point de reprise est enregistré à côté du fichier de résultats ; avec
+    `resume`, les mutations déjà traitées sont ignorées et les nouveaux résultats
+    sont ajoutés au fichier existant.
+    """
     try:
         target = config['target']
         if not validate_url(target):
@@ -365,22 +1403,45 @@ def main():
 
         print(f"Analyse de comportement vers : {target}")
         
-        if config['async']:
-            rate_limiter = RateLimiter(
-                max_requests=config.get("rate_limit", {}).get("requests_per_second", 2),
-                time_window=1.0
-            )
-            results = asyncio.run(process_attacks_async(target, rate_limiter))
-        else:
-            results = process_attacks_sync(target)
-
-        with open("dna_results.json", "w") as f:
-            json.dump(results, f, indent=2)
-        print("[+] Résultats enregistrés dans dna_results.json")
+        results_config = config.get("results", {})
+        output_path = results_config.get("path", "dna_results.jsonl.gz")
+        checkpoint_path = _checkpoint_path(output_path)
+        if checkpoint_path is None:
+            raise ValueError(f"results.path doit désigner un fichier: {output_path}")
+        checkpoint = open_checkpoint(checkpoint_path, _attack_plan_id(target), resume)
+        resume = resume and checkpoint.resumed
+        # Les résultats sont écrits au fur et à mesure de leur production
+        with open_result_writer(
+            output_path, separate_bodies=results_config.get("separate_bodies", True),
+            append=resume, target=target, scan_id=checkpoint.data.get("scan_id") if resume else None,
+            offsets=checkpoint.data.get("offsets") if resume else None
+        ) as writer:
+            if isinstance(writer, ResultStore):
+                checkpoint.data["scan_id"] = writer.scan_id
+                checkpoint.on_save = writer.flush
+            else:
+                # La taille des fichiers est enregistrée avec le point de reprise :
+                # une reprise les y tronque avant d'ajouter les nouveaux résultats
+                checkpoint.on_save = _offsets_saver(writer, checkpoint)
+            try:
+                if config['async']:
+                    asyncio.run(_write_attacks_async(target, writer, checkpoint))
+                else:
+                    with SyncScanEngine() as engine:
+                        writer.write_many(engine.iter_attacks(target, checkpoint))
+                checkpoint.complete()
+            finally:
+                if not checkpoint.completed:
+                    checkpoint.save()
+        print(f"[+] {writer.count} résultats enregistrés dans {output_path}")
 
     except Exception as e:
         logger.error(f"Erreur lors de l'exécution: {str(e)}")
         raise
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Envoie les mutations vers la cible configurée")
+    parser.add_argument("--resume", action="store_true", help="Reprend un scan interrompu")
+    main(resume=parser.parse_args().resume)
\ No newline at end of file
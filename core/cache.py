@@ -0,0 +1,404 @@
+import asyncio
+import atexit
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from time import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def get_header(headers: Dict[str, str], name: str) -> Optional[str]:
+    """Retourne la valeur d'un en-tête sans tenir compte de la casse."""
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+def conditional_headers(data: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Construit les en-têtes de revalidation (If-None-Match / If-Modified-Since) à
+    partir d'une réponse en cache.
+    """
+    if not data:
+        return {}
+    headers = data.get("headers", {})
+    conditional = {}
+    etag = get_header(headers, "ETag")
+    if etag:
+        conditional["If-None-Match"] = etag
+    last_modified = get_header(headers, "Last-Modified")
+    if last_modified:
+        conditional["If-Modified-Since"] = last_modified
+    return conditional
+
+class CacheStats:
+    """Compteurs d'utilisation d'un cache de réponses."""
+
+    FIELDS = ("hits", "misses", "expirations", "evictions", "revalidations", "sets")
+    __slots__ = FIELDS
+
+    hits: int
+    misses: int
+    expirations: int
+    evictions: int
+    revalidations: int
+    sets: int
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Remet tous les compteurs à zéro."""
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.revalidations = 0
+        self.sets = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Retourne les compteurs et le taux de succès."""
+        counters: Dict[str, Any] = {name: getattr(self, name) for name in self.FIELDS}
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_ratio"] = counters["hits"] / lookups if lookups else 0.0
+        return counters
+
+class DiskResponseCache:
+    """
+    Cache de réponses persistant sur disque (SQLite), partagé entre exécutions.
+
+    Expose la même interface asynchrone que `ResponseCache`. Les entrées expirées
+    sont conservées pour être revalidées : `get_stale` retourne la réponse avec ses
+    validateurs (ETag, Last-Modified) et `touch` la rafraîchit après un 304.
+
+    Les compteurs d'utilisation sont cumulés entre exécutions dans la base ; ils
+    sont écrits tous les `STATS_FLUSH_INTERVAL` événements et à la fermeture,
+    y compris celle faite automatiquement à la sortie du processus.
+    """
+
+    STATS_FLUSH_INTERVAL = 100
+
+    def __init__(self, path: str, max_size: int = 1000, ttl: float = 300.0):
+        self.path = Path(path).expanduser()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._count: Optional[int] = None
+        self._lock = threading.Lock()
+        # Compteurs non encore écrits dans la base
+        self._pending = CacheStats()
+        self._pending_events = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Ouvre la base à la première utilisation."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    size INTEGER NOT NULL,
+                    timestamp REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_timestamp ON responses(timestamp)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            self._conn = conn
+            self._count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            # Les compteurs en attente sont écrits même si `close` n'est pas appelé
+            atexit.register(self.close)
+        return self._conn
+
+    def _count_event(self, name: str, amount: int = 1) -> None:
+        """Incrémente un compteur ; doit être appelé sous le verrou."""
+        setattr(self._pending, name, getattr(self._pending, name) + amount)
+        self._pending_events += 1
+        if self._pending_events >= self.STATS_FLUSH_INTERVAL:
+            self._flush_stats()
+
+    def _flush_stats(self) -> None:
+        """Ajoute les compteurs en attente aux compteurs persistés (sous le verrou)."""
+        if not self._pending_events or self._conn is None:
+            return
+        self._conn.executemany(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            [(name, getattr(self._pending, name)) for name in CacheStats.FIELDS]
+        )
+        self._pending.reset()
+        self._pending_events = 0
+
+    def _get(self, key: str, allow_stale: bool) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT data, timestamp FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            expired = row is not None and time() - row[1] >= self.ttl
+            if not allow_stale:
+                if row is None or expired:
+                    self._count_event("misses")
+                else:
+                    self._count_event("hits")
+                if expired:
+                    self._count_event("expirations")
+        if row is None or (expired and not allow_stale):
+            return None
+        data: Dict[str, Any] = json.loads(row[0])
+        return data
+
+    def _set(self, key: str, data: Dict[str, Any]) -> None:
+        payload = json.dumps(data, ensure_ascii=False)
+        headers = data.get("headers", {})
+        with self._lock:
+            conn = self._connect()
+            exists = conn.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, data, etag, last_modified, size, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, get_header(headers, "ETag"), get_header(headers, "Last-Modified"),
+                 len(payload), time())
+            )
+            self._count_event("sets")
+            if not exists:
+                self._count = (self._count or 0) + 1
+            if self._count is not None and self._count > self.max_size:
+                # Supprime les entrées les plus anciennes
+                excess = self._count - self.max_size
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY timestamp LIMIT ?)",
+                    (excess,)
+                )
+                self._count -= excess
+                self._count_event("evictions", excess)
+
+    def _touch(self, key: str) -> None:
+        with self._lock:
+            self._connect().execute(
+                "UPDATE responses SET timestamp = ? WHERE key = ?", (time(), key)
+            )
+            self._count_event("revalidations")
+
+    def _clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM counters")
+            self._pending.reset()
+            self._pending_events = 0
+            self._count = 0
+
+    def _stats(self) -> Dict[str, Any]:
+        with self._lock:
+            conn = self._connect()
+            self._flush_stats()
+            stats = CacheStats()
+            for name, value in conn.execute("SELECT name, value FROM counters"):
+                if name in CacheStats.FIELDS:
+                    setattr(stats, name, value)
+            total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            entries = self._count or 0
+        return {
+            "backend": "disk",
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            **stats.as_dict()
+        }
+
+    def _expired_keys(self) -> List[str]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT key FROM responses WHERE timestamp <= ?", (time() - self.ttl,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retourne la réponse en cache si elle n'a pas expiré."""
+        return await asyncio.to_thread(self._get, key, False)
+
+    async def get_stale(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retourne la réponse en cache, même expirée, pour une revalidation."""
+        return await asyncio.to_thread(self._get, key, True)
+
+    async def set(self, key: str, data: Dict[str, Any]) -> None:
+        """Enregistre une réponse et ses validateurs."""
+        await asyncio.to_thread(self._set, key, data)
+
+    async def touch(self, key: str) -> None:
+        """Marque une entrée comme fraîche après une revalidation réussie (304)."""
+        await asyncio.to_thread(self._touch, key)
+
+    async def clear(self) -> None:
+        """Vide le cache."""
+        await asyncio.to_thread(self._clear)
+
+    async def size(self) -> int:
+        """Retourne le nombre d'entrées dans le cache."""
+        with self._lock:
+            self._connect()
+            return self._count or 0
+
+    async def get_expired_entries(self) -> List[str]:
+        """Retourne la liste des clés expirées."""
+        return await asyncio.to_thread(self._expired_keys)
+
+    async def stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques cumulées du cache."""
+        return await asyncio.to_thread(self._stats)
+
+    def close(self) -> None:
+        """Écrit les compteurs en attente et ferme la connexion à la base."""
+        with self._lock:
+            if self._conn is not None:
+                self._flush_stats()
+                self._conn.close()
+                self._conn = None
+                atexit.unregister(self.close)
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalise un prompt (espaces de début/fin de ligne, lignes vides) avant hachage."""
+    return "\n".join(line.strip() for line in prompt.strip().splitlines() if line.strip())
+
+class AnnotationCache:
+    """
+    Cache persistant (SQLite) des réponses de l'API LLM, adressé par contenu.
+
+    La clé est l'empreinte SHA-256 du prompt normalisé, du modèle et des
+    paramètres de génération : un même contenu n'est soumis qu'une fois, quel que
+    soit le fichier de résultats. Lorsque la taille totale des réponses dépasse
+    `max_bytes`, les entrées les moins récemment utilisées sont supprimées.
+    Les statistiques (`stats`) portent sur l'exécution en cours.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 67108864):
+        self.path = Path(path).expanduser()
+        self.max_bytes = max_bytes
+        self.stats_counters = CacheStats()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(prompt: str, model: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Clé de cache d'un appel : empreinte du prompt normalisé, du modèle et des paramètres."""
+        material = json.dumps(
+            {"prompt": normalize_prompt(prompt), "model": model, "params": params or {}},
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Ouvre la base à la première utilisation."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS annotations (
+                    key TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_annotations_accessed ON annotations(accessed_at)")
+            self._conn = conn
+            self._bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM annotations").fetchone()[0]
+        return self._conn
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT data FROM annotations WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats_counters.misses += 1
+                return None
+            conn.execute("UPDATE annotations SET accessed_at = ? WHERE key = ?", (time(), key))
+            self.stats_counters.hits += 1
+        data: Dict[str, Any] = json.loads(row[0])
+        return data
+
+    def _set(self, key: str, data: Dict[str, Any]) -> None:
+        payload = json.dumps(data, ensure_ascii=False)
+        with self._lock:
+            conn = self._connect()
+            previous = conn.execute("SELECT size FROM annotations WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO annotations (key, data, size, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload), time())
+            )
+            self._bytes += len(payload) - (previous[0] if previous else 0)
+            self.stats_counters.sets += 1
+            if self._bytes > self.max_bytes:
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Supprime les entrées les moins récemment utilisées jusqu'à respecter `max_bytes` (sous le verrou)."""
+        keys = []
+        for key, size in conn.execute("SELECT key, size FROM annotations ORDER BY accessed_at"):
+            if self._bytes <= self.max_bytes:
+                break
+            keys.append((key,))
+            self._bytes -= size
+        conn.executemany("DELETE FROM annotations WHERE key = ?", keys)
+        self.stats_counters.evictions += len(keys)
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM annotations")
+            self._bytes = 0
+
+    def _stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._connect().execute("SELECT COUNT(*) FROM annotations").fetchone()[0]
+            counters = self.stats_counters.as_dict()
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            **{name: counters[name] for name in ("hits", "misses", "sets", "evictions", "hit_ratio")}
+        }
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retourne la réponse en cache pour une clé."""
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, data: Dict[str, Any]) -> None:
+        """Enregistre une réponse de l'API LLM."""
+        await asyncio.to_thread(self._set, key, data)
+
+    async def clear(self) -> None:
+        """Vide le cache."""
+        await asyncio.to_thread(self._clear)
+
+    async def stats(self) -> Dict[str, Any]:
+        """Retourne la taille du cache et les statistiques de l'exécution en cours."""
+        return await asyncio.to_thread(self._stats)
+
+    def close(self) -> None:
+        """Ferme la connexion à la base."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
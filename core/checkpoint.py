@@ -0,0 +1,140 @@
+import json
+import logging
+import os
+from pathlib import Path
+from time import monotonic
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+class CheckpointError(ValueError):
+    """Point de reprise inutilisable (plan différent, fichier corrompu)."""
+    pass
+
+class Checkpoint:
+    """
+    Point de reprise d'un plan de requêtes numérotées.
+
+    Les éléments terminés sont mémorisés sous la forme d'une position (tous les
+    éléments d'indice inférieur sont terminés) et des indices terminés au-delà,
+    dont le nombre reste borné par la concurrence : la taille du point de reprise
+    ne dépend pas de la taille du plan.
+
+    Le point de reprise est enregistré (de façon atomique) tous les `every`
+    éléments ou toutes les `interval` secondes ; `on_save` est appelé juste avant,
+    pour vider la sortie et ne jamais marquer comme terminé un résultat non écrit.
+
+        checkpoint = Checkpoint.open("scan.checkpoint", plan_id, resume=True)
+        for index, item in enumerate(plan):
+            if checkpoint.is_done(index):
+                continue
+            ...
+            checkpoint.mark_done(index)
+        checkpoint.complete()
+    """
+
+    def __init__(
+        self,
+        path: str,
+        plan_id: str,
+        every: int = 1000,
+        interval: float = 30.0,
+        on_save: Optional[Callable[[], None]] = None
+    ):
+        self.path = Path(path).expanduser()
+        self.plan_id = plan_id
+        self.every = max(1, every)
+        self.interval = interval
+        self.on_save = on_save
+        self.position = 0
+        self.done: Set[int] = set()
+        self.completed = False
+        # Données associées à la reprise (ex. identifiant de scan)
+        self.data: Dict[str, Any] = {}
+        self._unsaved = 0
+        self._last_save = monotonic()
+
+    @classmethod
+    def open(
+        cls,
+        path: str,
+        plan_id: str,
+        resume: bool = False,
+        every: int = 1000,
+        interval: float = 30.0
+    ) -> "Checkpoint":
+        """
+        Crée un point de reprise, en reprenant l'état enregistré si `resume` est vrai.
+
+        Raises:
+            CheckpointError: Si le point de reprise enregistré concerne un autre plan
+        """
+        checkpoint = cls(path, plan_id, every, interval)
+        if resume and checkpoint.path.exists():
+            try:
+                with open(checkpoint.path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CheckpointError(f"Point de reprise illisible {checkpoint.path}: {e}")
+            if state.get("plan_id") != plan_id:
+                raise CheckpointError(
+                    f"Le point de reprise {checkpoint.path} concerne un autre plan "
+                    f"({state.get('plan_id')})"
+                )
+            checkpoint.position = state.get("position", 0)
+            checkpoint.done = set(state.get("done", []))
+            checkpoint.completed = state.get("completed", False)
+            checkpoint.data = state.get("data", {})
+            logger.info(
+                f"Reprise depuis {checkpoint.path} : {checkpoint.position + len(checkpoint.done)} "
+                f"éléments déjà traités"
+            )
+        return checkpoint
+
+    @property
+    def resumed(self) -> bool:
+        """Indique si des éléments avaient déjà été traités."""
+        return self.position > 0 or bool(self.done)
+
+    def is_done(self, index: int) -> bool:
+        """Indique si l'élément `index` du plan a déjà été traité."""
+        return self.completed or index < self.position or index in self.done
+
+    def mark_done(self, index: int) -> None:
+        """Marque un élément comme traité et enregistre le point de reprise si nécessaire."""
+        if index == self.position:
+            self.position += 1
+            while self.position in self.done:
+                self.done.remove(self.position)
+                self.position += 1
+        elif index > self.position:
+            self.done.add(index)
+        self._unsaved += 1
+        if self._unsaved >= self.every or monotonic() - self._last_save >= self.interval:
+            self.save()
+
+    def save(self) -> None:
+        """Enregistre le point de reprise (écriture dans un fichier temporaire puis renommage)."""
+        if self.on_save is not None:
+            self.on_save()
+        state = {
+            "plan_id": self.plan_id,
+            "position": self.position,
+            "done": sorted(self.done),
+            "completed": self.completed,
+            "data": self.data
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self._unsaved = 0
+        self._last_save = monotonic()
+
+    def complete(self) -> None:
+        """Marque le plan comme entièrement traité."""
+        self.completed = True
+        self.save()
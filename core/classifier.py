@@ -1,18 +1,161 @@
-import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
-def run(file):
-    print(f"[*] Classification des réponses depuis {file}")
-    with open(file, "r") as f:
-        data = json.load(f)
-
-    for entry in data:
-        status = entry["status"]
-        body = entry["body"]
-        attack = entry["attack"]
-
-        if "alert(1)" in body or "syntax" in body.lower():
-            print(f"[!] Comportement VULNÉRABLE pour attaque {attack} → {entry['url']}")
-        elif status == 403 or "access denied" in body.lower():
-            print(f"[+] Comportement STRICT pour attaque {attack} → {entry['url']}")
+from .config import config
+from .results import read_results, write_jsonl
+from .rules import STRICT, VERDICT_PRIORITY, VULNERABLE, Rule, RuleSet
+
+# Distance à la réponse de référence au-delà de laquelle une réponse est jugée anormale
+ANOMALY_THRESHOLD = 0.25
+
+ANOMALOUS = "ANOMALOUS"
+FLEXIBLE = "FLEXIBLE"
+
+_rules: Optional[RuleSet] = None
+
+def get_rules() -> RuleSet:
+    """Retourne les règles du fichier `classifier.rules`, ou les règles par défaut."""
+    global _rules
+    if _rules is None:
+        path = config.get("classifier", {}).get("rules")
+        _rules = RuleSet.from_file(path) if path else RuleSet.default()
+    return _rules
+
+def entry_verdict(
+    entry: Dict[str, Any],
+    rules: Optional[RuleSet] = None,
+    anomaly_threshold: float = ANOMALY_THRESHOLD
+) -> Tuple[str, List[Rule]]:
+    """Retourne le verdict d'un résultat et les règles qui lui correspondent."""
+    status = entry.get("status", entry.get("status_code"))
+    distance = entry.get("distance")
+    matched = (rules if rules is not None else get_rules()).match(entry.get("body") or "", status)
+    verdicts = {rule.verdict for rule in matched}
+
+    verdict = next((v for v in VERDICT_PRIORITY if v in verdicts), None)
+    if verdict is None:
+        if distance is not None and distance >= anomaly_threshold:
+            verdict = ANOMALOUS
         else:
-            print(f"[~] Comportement FLEXIBLE pour attaque {attack} → {entry['url']}")
\ No newline at end of file
+            verdict = FLEXIBLE
+    return verdict, matched
+
+def classify_entry(entry: Dict[str, Any], rules: Optional[RuleSet] = None) -> Dict[str, Any]:
+    """
+    Classe un résultat et retourne son verdict structuré.
+
+    Accepte les résultats de mutation (`status`, `attack`) comme ceux de
+    `dnarecon scan` (`status_code`, sans attaque) ; les champs absents valent None.
+    """
+    verdict, matched = entry_verdict(entry, rules)
+    return {
+        "url": entry.get("url"),
+        "attack": entry.get("attack"),
+        "status": entry.get("status", entry.get("status_code")),
+        "distance": entry.get("distance"),
+        "verdict": verdict,
+        "rules": [rule.id for rule in matched]
+    }
+
+def classify(entries: Iterable[Dict[str, Any]], rules: Optional[RuleSet] = None) -> Iterator[Dict[str, Any]]:
+    """Classe un flux de résultats, un verdict par résultat."""
+    rules = rules if rules is not None else get_rules()
+    for entry in entries:
+        yield classify_entry(entry, rules)
+
+# Nombre de résultats envoyés à la fois à un processus de classification
+BATCH_CHUNK_SIZE = 1000
+
+# Règles du processus de classification courant (voir `_init_worker`)
+_worker_rules: Optional[RuleSet] = None
+
+def _init_worker(rules: RuleSet) -> None:
+    """Reçoit les règles compilées une fois par processus."""
+    global _worker_rules
+    _worker_rules = rules
+
+def _classify_chunk(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [classify_entry(entry, _worker_rules) for entry in entries]
+
+def _chunks(entries: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(entries)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def classify_batch(
+    entries: Iterable[Dict[str, Any]],
+    workers: Optional[int] = None,
+    rules: Optional[RuleSet] = None,
+    chunk_size: int = BATCH_CHUNK_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Classe un flux de résultats sur plusieurs processus.
+
+    Les résultats sont découpés en lots de `chunk_size` répartis entre `workers`
+    processus (config `classifier.workers`, 0 pour un processus par cœur) ; les
+    verdicts sont produits dans l'ordre des résultats. Au plus deux lots par
+    processus sont en cours à un instant donné, ce qui borne la mémoire.
+
+    Returns:
+        Un itérateur de verdicts structurés (voir `classify_entry`)
+    """
+    rules = rules if rules is not None else get_rules()
+    if workers is None:
+        workers = config.get("classifier", {}).get("workers", 1)
+    if not workers:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        yield from classify(entries, rules)
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rules,))
+    window: Deque["Future[List[Dict[str, Any]]]"] = deque()
+    try:
+        for chunk in _chunks(entries, chunk_size):
+            window.append(pool.submit(_classify_chunk, chunk))
+            if len(window) >= workers * 2:
+                yield from window.popleft().result()
+        while window:
+            yield from window.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def format_verdict(verdict: Dict[str, Any]) -> str:
+    """Ligne lisible d'un verdict."""
+    attack, url = verdict.get("attack"), verdict.get("url")
+    target = f"attaque {attack} → {url}" if attack is not None else f"{url}"
+    if verdict["verdict"] == VULNERABLE:
+        return f"[!] Comportement VULNÉRABLE pour {target}"
+    if verdict["verdict"] == STRICT:
+        return f"[+] Comportement STRICT pour {target}"
+    if verdict["verdict"] == ANOMALOUS:
+        return f"[?] Comportement ANORMAL pour {target} (distance {verdict['distance']:.2f})"
+    return f"[~] Comportement FLEXIBLE pour {target}"
+
+def run(file: str, output: Optional[str] = None, workers: Optional[int] = None) -> int:
+    """
+    Classe les résultats d'un fichier JSON ou JSONL, lu en flux.
+
+    Sans `output`, affiche un verdict lisible par résultat ; sinon écrit les
+    verdicts au format JSON Lines dans `output` (`-` pour stdout). `workers`
+    répartit la classification sur plusieurs processus (voir `classify_batch`).
+
+    Returns:
+        Le nombre de résultats classés
+    """
+    verdicts = classify_batch(read_results(file), workers=workers)
+    if output is not None:
+        return write_jsonl(verdicts, output)
+
+    print(f"[*] Classification des réponses depuis {file}")
+    count = 0
+    for verdict in verdicts:
+        print(format_verdict(verdict))
+        count += 1
+    return count
@@ -14,6 +14,7 @@ class Config:
             "llm_api_key": "",
             "timeout": 30,
             "max_retries": 3,
+            "max_body_bytes": 1048576,
             "user_agent": "DNARecon/1.0",
             "proxy": None,
             "log_level": "INFO",
@@ -25,11 +26,75 @@ class Config:
                 "requests_per_second": 2,
                 "burst": 5
             },
+            "scan": {
+                "concurrency": 10
+            },
+            "cache": {
+                "backend": "memory",
+                "ttl": 300,
+                "max_size": 1000,
+                "max_bytes": 268435456,
+                "sweep_interval": 60,
+                "path": str(self.config_dir / "cache.sqlite")
+            },
+            "connection_pool": {
+                "limit": 100,
+                "limit_per_host": 10,
+                "keepalive_timeout": 30.0,
+                "dns_cache_ttl": 300
+            },
+            "checkpoint": {
+                "every": 1000,
+                "interval": 30.0
+            },
+            "classifier": {
+                "rules": None,
+                "workers": 1
+            },
+            "fingerprint": {
+                "baseline": True,
+                "keep_body": True
+            },
+            "llm": {
+                "provider": "openai",
+                "base_url": None,
+                "model": None,
+                "temperature": 0.7,
+                "connect_timeout": 10.0,
+                "concurrency": 8,
+                "timeout": 60.0,
+                "max_attempts": 5,
+                "base_delay": 1.0,
+                "max_delay": 60.0,
+                "prompt_max_tokens": 1500,
+                "prompt_context_chars": 200,
+                "cache": True,
+                "cache_path": str(self.config_dir / "llm_cache.sqlite"),
+                "cache_max_bytes": 67108864
+            },
+            "payloads": {
+                "files": []
+            },
+            "transport": {
+                "backend": "aiohttp",
+                "http1_fallback": True
+            },
+            "triage": {
+                "enabled": True,
+                "verdicts": ["VULNERABLE", "ANOMALOUS"],
+                "anomaly_threshold": 0.25,
+                "novelty_threshold": 0.1,
+                "sample_rate": 0.02
+            },
             "security": {
                 "verify_ssl": True,
                 "follow_redirects": True,
                 "max_redirects": 5
             },
+            "results": {
+                "path": "dna_results.jsonl.gz",
+                "separate_bodies": True
+            },
             "target": "",
             "async": False
         }
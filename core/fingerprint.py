@@ -0,0 +1,133 @@
+import hashlib
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, NamedTuple, Optional
+
+SIMHASH_BITS = 64
+_TOKEN_RE = re.compile(r"\w+")
+
+# Poids des composantes de la distance entre empreintes (somme = 1)
+DISTANCE_WEIGHTS = {
+    "status": 0.4,
+    "body": 0.3,
+    "length": 0.2,
+    "headers": 0.1,
+}
+
+# Largeur (en bits) du champ de chaque bit du SimHash dans l'accumulateur : le
+# nombre total de mots d'un texte doit y tenir
+_FIELD_BITS = 32
+_FIELD_MASK = (1 << _FIELD_BITS) - 1
+
+# Octet -> ses 8 bits, chacun placé dans son propre champ
+_SPREAD_BYTE = [
+    sum(((byte >> bit) & 1) << (bit * _FIELD_BITS) for bit in range(8))
+    for byte in range(256)
+]
+
+@lru_cache(maxsize=65536)
+def _token_fields(token: str) -> int:
+    """
+    Hash stable (indépendant de PYTHONHASHSEED) d'un jeton sur 64 bits, dont
+    chaque bit occupe son propre champ de `_FIELD_BITS` bits.
+    """
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    # Le hash est lu en gros-boutiste : le dernier octet porte les bits de poids faible
+    return sum(
+        _SPREAD_BYTE[byte] << (8 * index * _FIELD_BITS)
+        for index, byte in enumerate(reversed(digest))
+    )
+
+def simhash(text: str) -> int:
+    """
+    Calcule le SimHash 64 bits des mots d'un texte.
+
+    Deux textes proches ont des SimHash dont peu de bits diffèrent ; chaque mot
+    distinct est haché une seule fois et pondéré par son nombre d'occurrences.
+    Les 64 compteurs sont tenus dans un seul entier (un champ par bit) : chaque
+    mot distinct coûte une multiplication et une addition, et non 64 itérations.
+    """
+    counts = Counter(_TOKEN_RE.findall(text.lower()))
+    total = sum(counts.values())
+    # Champ de chaque bit : nombre d'occurrences des mots dont le hash a ce bit à 1
+    ones = 0
+    for token, count in counts.items():
+        ones += count * _token_fields(token)
+    value = 0
+    for bit in range(SIMHASH_BITS):
+        # Poids du bit : occurrences à 1 moins occurrences à 0
+        if 2 * ((ones >> (bit * _FIELD_BITS)) & _FIELD_MASK) > total:
+            value |= 1 << bit
+    return value
+
+def hamming_distance(a: int, b: int) -> int:
+    """Nombre de bits différents entre deux SimHash."""
+    return bin(a ^ b).count("1")
+
+class Fingerprint(NamedTuple):
+    """Empreinte compacte d'une réponse HTTP."""
+
+    status: int
+    length: int
+    simhash: int
+    headers: FrozenSet[str]
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> "Fingerprint":
+        """Calcule l'empreinte d'un résultat de requête (`status_code`, `headers`, `body`)."""
+        body = result.get("body") or ""
+        return cls(
+            status=result.get("status_code", result.get("status", 0)),
+            length=result.get("body_bytes", len(body)),
+            simhash=simhash(body),
+            headers=frozenset(name.lower() for name in result.get("headers", {}))
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Représentation sérialisable en JSON (SimHash en hexadécimal)."""
+        return {
+            "status": self.status,
+            "length": self.length,
+            "simhash": f"{self.simhash:016x}",
+            "headers": sorted(self.headers)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Fingerprint":
+        """Reconstruit une empreinte depuis `as_dict`."""
+        return cls(
+            status=data["status"],
+            length=data["length"],
+            simhash=int(data["simhash"], 16),
+            headers=frozenset(data.get("headers", ()))
+        )
+
+def compare(baseline: Fingerprint, other: Fingerprint) -> Dict[str, float]:
+    """
+    Compare deux empreintes.
+
+    Returns:
+        La distance de chaque composante et leur combinaison pondérée `score`,
+        toutes comprises entre 0 (identiques) et 1
+    """
+    longest = max(baseline.length, other.length)
+    header_union = baseline.headers | other.headers
+    components = {
+        "status": 0.0 if baseline.status == other.status else 1.0,
+        "body": hamming_distance(baseline.simhash, other.simhash) / SIMHASH_BITS,
+        "length": abs(baseline.length - other.length) / longest if longest else 0.0,
+        "headers": (
+            len(baseline.headers ^ other.headers) / len(header_union) if header_union else 0.0
+        ),
+    }
+    components["score"] = sum(
+        DISTANCE_WEIGHTS[name] * value for name, value in components.items()
+    )
+    return components
+
+def distance(baseline: Optional[Fingerprint], other: Fingerprint) -> Optional[float]:
+    """Distance pondérée entre deux empreintes, ou None sans référence."""
+    if baseline is None:
+        return None
+    return round(compare(baseline, other)["score"], 4)
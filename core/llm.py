@@ -1,15 +1,53 @@
+import aiohttp
+import asyncio
+import itertools
 import json
 import logging
-from typing import Dict, List, Optional
+import sys
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import requests
 from pathlib import Path
+from .retry import RetryPolicy
+from .cache import AnnotationCache
+from .config import config
+from .prompt import PromptBuilder
+from .providers import OpenAIProvider, create_provider
+from .results import compression_for, open_text, read_results
+from .triage import Triage
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Statuts de l'API LLM qui rendent inutile l'annotation des entrées suivantes
+FATAL_STATUSES = frozenset({401, 403})
+
+class LLMAPIError(Exception):
+    """Réponse en erreur de l'API LLM."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
 class LLMAnnotator:
-    def __init__(self, api_key: Optional[str] = None):
-        self.api_key = api_key or self._load_api_key()
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        prompt_builder: Optional[PromptBuilder] = None,
+        cache: Optional[AnnotationCache] = None,
+        provider: Optional[OpenAIProvider] = None
+    ):
+        self.provider = provider or create_provider()
+        self.api_key = api_key or (self._load_api_key() if self.provider.requires_api_key else None)
+        self.cache = cache
+        self.prompt_builder = prompt_builder or PromptBuilder.from_config()
+        llm_config = config.get("llm", {})
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=llm_config.get("max_attempts", 5),
+            base_delay=llm_config.get("base_delay", 1.0),
+            max_delay=llm_config.get("max_delay", 60.0),
+            retry_statuses={429, 500, 502, 503, 504}
+        )
         
     def _load_api_key(self) -> str:
         """Charge la clé API depuis les variables d'environnement ou un fichier de configuration."""
@@ -47,45 +85,129 @@ class LLMAnnotator:
             raise
 
     def _prepare_analysis_prompt(self, data: Dict) -> str:
-        """Prépare le prompt pour l'analyse LLM."""
-        return f"""
-        Analyze the following web application behavior:
-        URL: {data.get('url', 'N/A')}
-        Response Status: {data.get('status_code', 'N/A')}
-        Response Time: {data.get('response_time', 'N/A')}
-        Headers: {json.dumps(data.get('headers', {}), indent=2)}
-        Body: {data.get('body', 'N/A')}
-        
-        Please provide:
-        1. Security implications
-        2. Potential vulnerabilities
-        3. Recommended actions
-        """
+        """Prépare le prompt pour l'analyse LLM, dans le budget de tokens configuré."""
+        return self.prompt_builder.build(data)
+
+    def _build_request(self, prompt: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Construit l'URL, les en-têtes et le corps de la requête au fournisseur LLM."""
+        return self.provider.build_request(prompt, self.api_key)
+
+    def _cache_key(self, prompt: str) -> str:
+        """Clé du cache d'annotations : prompt, modèle et paramètres de la requête."""
+        _, _, payload = self._build_request(prompt)
+        params = {name: value for name, value in payload.items() if name not in ("model", "messages")}
+        return AnnotationCache.key(prompt, payload["model"], params)
 
     def _call_llm_api(self, prompt: str) -> Dict:
         """Appelle l'API LLM pour l'analyse."""
-        # Implémentation à adapter selon le service LLM utilisé
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        # Exemple avec OpenAI (à adapter selon le service choisi)
-        response = requests.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers=headers,
-            json={
-                "model": "gpt-4",
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.7
-            }
-        )
+        url, headers, payload = self._build_request(prompt)
+        response = requests.post(url, headers=headers, json=payload, timeout=self.provider.timeout)
         
         if response.status_code != 200:
-            raise Exception(f"LLM API error: {response.text}")
+            raise LLMAPIError(f"LLM API error: {response.text}", response.status_code)
             
         return response.json()
 
+    async def _call_llm_api_async(self, prompt: str, session: aiohttp.ClientSession) -> Dict:
+        """
+        Appelle l'API LLM via une session partagée.
+
+        Les réponses 429 et 5xx, les erreurs réseau et les timeouts sont retentés
+        selon `retry_policy`, en respectant l'en-tête Retry-After.
+        """
+        url, headers, payload = self._build_request(prompt)
+        policy = self.retry_policy
+        for attempt in range(policy.max_attempts):
+            last_attempt = attempt == policy.max_attempts - 1
+            try:
+                async with session.post(url, headers=headers, json=payload) as response:
+                    if response.status == 200:
+                        data: Dict[str, Any] = await response.json()
+                        return data
+                    text = await response.text()
+                    if not policy.should_retry_status(response.status) or last_attempt:
+                        raise LLMAPIError(f"LLM API error: {text}", response.status)
+                    delay = policy.compute_delay(attempt, response.headers.get("Retry-After"))
+                    logger.warning(
+                        f"API LLM : HTTP {response.status}, tentative {attempt + 1}/"
+                        f"{policy.max_attempts}, nouvel essai dans {delay:.2f}s"
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    raise LLMAPIError(f"LLM API error: {type(e).__name__}: {e}")
+                delay = policy.compute_delay(attempt)
+                logger.warning(f"API LLM : {type(e).__name__}, nouvel essai dans {delay:.2f}s")
+            await asyncio.sleep(delay)
+        raise LLMAPIError("LLM API error: aucune tentative effectuée")
+
+    async def analyze_behavior_async(self, behavior_data: Dict, session: aiohttp.ClientSession) -> Dict:
+        """Version asynchrone de `analyze_behavior`, via une session partagée."""
+        analysis_prompt = self._prepare_analysis_prompt(behavior_data)
+        response = None
+        if self.cache is not None:
+            cache_key = self._cache_key(analysis_prompt)
+            response = await self.cache.get(cache_key)
+        if response is None:
+            response = await self._call_llm_api_async(analysis_prompt, session)
+            if self.cache is not None:
+                await self.cache.set(cache_key, response)
+        annotations = self._process_llm_response(response)
+        return {
+            "original_data": behavior_data,
+            "annotations": annotations,
+            "confidence_score": self._calculate_confidence(annotations)
+        }
+
+    async def annotate_many(
+        self,
+        records: Iterable[Dict],
+        concurrency: Optional[int] = None,
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Annote un flux de résultats avec au plus `concurrency` appels simultanés
+        (config `llm.concurrency`).
+
+        Les annotations sont produites dans l'ordre où elles se terminent. Une
+        entrée en échec produit `{"original_data": ..., "error": ...}` sans
+        interrompre les autres, sauf si l'API refuse la clé (401, 403).
+        """
+        if concurrency is None:
+            concurrency = config.get("llm", {}).get("concurrency", 8)
+        concurrency = max(1, concurrency)
+        if session is None:
+            async with self.provider.create_session(concurrency) as own_session:
+                async for annotation in self.annotate_many(records, concurrency, own_session):
+                    yield annotation
+            return
+
+        async def _annotate(data: Dict) -> Dict:
+            try:
+                return await self.analyze_behavior_async(data, session)
+            except LLMAPIError as e:
+                if e.status in FATAL_STATUSES:
+                    raise
+                logger.warning(f"Annotation impossible pour {data.get('url', 'N/A')}: {e}")
+                return {"original_data": data, "error": str(e)}
+
+        pending: Set["asyncio.Future[Dict]"] = set()
+        try:
+            for data in records:
+                if len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+                pending.add(asyncio.ensure_future(_annotate(data)))
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
     def _process_llm_response(self, response: Dict) -> Dict:
         """Traite la réponse de l'API LLM."""
         try:
@@ -105,21 +227,99 @@ class LLMAnnotator:
         # Logique de calcul de confiance à implémenter
         return 0.85  # Valeur par défaut
 
-def run(input_file: str) -> None:
-    """Point d'entrée principal pour l'annotation LLM."""
+def annotated_path(input_file: str) -> str:
+    """Chemin du fichier d'annotations : `scan.jsonl.gz` → `scan_annotated.jsonl`."""
+    path = Path(input_file)
+    name = path.name
+    if compression_for(name):
+        name = name[:-len(path.suffix)]
+    for extension in (".jsonl", ".json"):
+        if name.endswith(extension):
+            name = name[:-len(extension)]
+            break
+    return str(path.with_name(name + "_annotated.jsonl"))
+
+def create_annotation_cache() -> Optional[AnnotationCache]:
+    """Crée le cache d'annotations selon la section `llm` de la configuration (None si désactivé)."""
+    llm_config = config.get("llm", {})
+    if not llm_config.get("cache", True):
+        return None
+    return AnnotationCache(
+        llm_config.get("cache_path", str(Path.home() / ".dnarecon" / "llm_cache.sqlite")),
+        max_bytes=llm_config.get("cache_max_bytes", 67108864)
+    )
+
+async def run_async(
+    input_file: str,
+    output: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    use_cache: bool = True,
+    provider: Optional[OpenAIProvider] = None,
+    triage: Optional[bool] = None
+) -> int:
+    """
+    Point d'entrée principal pour l'annotation LLM.
+
+    Accepte un comportement unique (objet JSON) ou un fichier de résultats
+    (tableau JSON, JSONL, compressé ou non, avec corps séparés, base SQLite) ;
+    chaque entrée est annotée en parallèle et les annotations sont écrites en
+    JSON Lines dès qu'elles se terminent, dans `output` (`-` pour stdout) ou
+    `<fichier>_annotated.jsonl` par défaut. Les réponses déjà obtenues pour un
+    prompt identique sont lues dans le cache d'annotations (`use_cache`).
+    `provider` remplace le fournisseur LLM configuré (voir `create_provider`).
+    Avec `triage` (config `triage.enabled` par défaut), seuls les résultats
+    retenus par l'étape de tri sont soumis au LLM (voir `Triage`).
+
+    Returns:
+        Le nombre d'annotations écrites
+    """
     try:
-        with open(input_file, 'r') as f:
-            behavior_data = json.load(f)
-        
-        annotator = LLMAnnotator()
-        results = annotator.analyze_behavior(behavior_data)
-        
-        output_file = input_file.replace('.json', '_annotated.json')
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
-            
-        logger.info(f"Annotations saved to {output_file}")
+        records = read_results(input_file)
+        # Lit le premier enregistrement avant de créer le fichier de sortie
+        first = next(records, None)
+        if first is None:
+            logger.warning(f"Aucun comportement à annoter dans {input_file}")
+            return 0
+
+        cache = create_annotation_cache() if use_cache else None
+        annotator = LLMAnnotator(cache=cache, provider=provider)
+        entries: Iterator[Dict[str, Any]] = itertools.chain([first], records)
+        if triage is None:
+            triage = config.get("triage", {}).get("enabled", True)
+        selector = Triage.from_config() if triage else None
+        if selector is not None:
+            entries = selector.select(entries)
+        output_file = output or annotated_path(input_file)
+        sink = sys.stdout if output_file == "-" else open_text(output_file, "w")
+        count = 0
+        try:
+            async for annotation in annotator.annotate_many(entries, concurrency=concurrency):
+                sink.write(json.dumps(annotation, ensure_ascii=False) + "\n")
+                count += 1
+            sink.flush()
+        finally:
+            if sink is not sys.stdout:
+                sink.close()
+            if selector is not None:
+                logger.info(f"Tri avant annotation : {selector.stats}")
+            if cache is not None:
+                logger.info(f"Statistiques du cache d'annotations : {await cache.stats()}")
+                cache.close()
+        logger.info(f"{count} annotations saved to {output_file}")
+        return count
         
     except Exception as e:
         logger.error(f"Error in LLM annotation process: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+def run(
+    input_file: str,
+    output: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    use_cache: bool = True,
+    triage: Optional[bool] = None
+) -> int:
+    """Version synchrone de `run_async`."""
+    return asyncio.run(run_async(
+        input_file, output=output, concurrency=concurrency, use_cache=use_cache, triage=triage
+    ))
\ No newline at end of file
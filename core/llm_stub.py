@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import logging
+import random
+from time import time
+from typing import Any, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+STUB_MODEL = "dnarecon-stub"
+
+# Compteurs de requêtes du serveur (`app[STATS_KEY]`)
+STATS_KEY = web.AppKey("stats", dict)
+
+def _stub_analysis(prompt: str) -> str:
+    """Analyse factice, déterministe, construite à partir des lignes du prompt."""
+    fields = {}
+    for line in prompt.splitlines():
+        name, _, value = line.partition(": ")
+        if value:
+            fields[name] = value
+    return (
+        "Security implications:\n"
+        f"- Response status {fields.get('Response Status', 'N/A')} for {fields.get('URL', 'N/A')}\n"
+        "Potential vulnerabilities:\n"
+        "- None identified (stub server)\n"
+        "Recommended actions:\n"
+        "- Review the response manually\n"
+    )
+
+def create_app(
+    latency: float = 0.0,
+    rate_limit_ratio: float = 0.0,
+    model: str = STUB_MODEL
+) -> web.Application:
+    """
+    Crée un serveur compatible avec l'API Chat Completions d'OpenAI, pour tester
+    le pipeline d'annotation hors ligne et en charge.
+
+    Chaque réponse est retardée de `latency` secondes ; une proportion
+    `rate_limit_ratio` des requêtes reçoit un 429 avec `Retry-After: 0`. Le
+    nombre de requêtes reçues est disponible dans `app[STATS_KEY]`.
+    """
+    stats = {"requests": 0, "completions": 0, "rate_limited": 0}
+
+    async def chat_completions(request: web.Request) -> web.Response:
+        stats["requests"] += 1
+        try:
+            payload = await request.json()
+            prompt = payload["messages"][-1]["content"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            return web.json_response({"error": {"message": "Requête invalide"}}, status=400)
+        if latency:
+            await asyncio.sleep(latency)
+        if rate_limit_ratio and random.random() < rate_limit_ratio:
+            stats["rate_limited"] += 1
+            return web.json_response(
+                {"error": {"message": "Rate limit reached"}}, status=429, headers={"Retry-After": "0"}
+            )
+        stats["completions"] += 1
+        content = _stub_analysis(prompt)
+        return web.json_response({
+            "id": f"chatcmpl-stub-{stats['completions']}",
+            "object": "chat.completion",
+            "created": int(time()),
+            "model": payload.get("model") or model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (len(prompt) + len(content)) // 4
+            }
+        })
+
+    async def models(request: web.Request) -> web.Response:
+        return web.json_response({"object": "list", "data": [{"id": model, "object": "model"}]})
+
+    app = web.Application()
+    app[STATS_KEY] = stats
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    app.router.add_get("/v1/models", models)
+    return app
+
+async def start(host: str = "127.0.0.1", port: int = 8080, **options: Any) -> web.AppRunner:
+    """Démarre le serveur en arrière-plan ; `runner.addresses` donne l'adresse effective."""
+    runner = web.AppRunner(create_app(**options), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+async def serve(host: str = "127.0.0.1", port: int = 8080, **options: Any) -> None:
+    """Démarre le serveur et le laisse tourner jusqu'à l'interruption."""
+    runner = await start(host, port, **options)
+    address = runner.addresses[0]
+    print(f"[+] Serveur LLM de test sur http://{address[0]}:{address[1]}/v1")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serveur LLM local de test (API OpenAI)")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse d'écoute")
+    parser.add_argument("--port", type=int, default=8080, help="Port d'écoute")
+    parser.add_argument("--latency", type=float, default=0.0, help="Délai de chaque réponse (secondes)")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="Proportion de réponses 429")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, latency=args.latency, rate_limit_ratio=args.rate_limit_ratio))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, quote, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+# Corpus intégré, utilisé lorsqu'aucun fichier n'est configuré (`payloads.files`)
+DEFAULT_PAYLOADS: Dict[str, List[str]] = {
+    "xss": ["<script>alert(1)</script>"],
+    "sqli": ["' OR '1'='1"],
+    "idor": ["1", "2"],
+}
+
+# Paramètre injecté lorsque la cible n'a pas de query string
+DEFAULT_PARAMS: Dict[str, str] = {
+    "idor": "user_id",
+}
+DEFAULT_PARAM = "input"
+
+def encode_component(value: Union[str, bytes]) -> str:
+    """Encode une valeur pour une query string (percent-encoding, aucun caractère réservé)."""
+    return quote(value, safe="")
+
+class PayloadCorpus:
+    """
+    Corpus de payloads regroupés par attaque, dédoublonnés et encodés une seule fois.
+
+    Le plan de requêtes est produit paresseusement : chaque payload est injecté
+    tour à tour dans chaque paramètre de la query string de la cible (ou dans un
+    paramètre par défaut si elle n'en a pas), sans jamais matérialiser le produit
+    cibles × paramètres × payloads.
+
+        corpus = PayloadCorpus.from_files(["xss.txt", "sqli.txt"])
+        for attack, url in corpus.plan("https://example.com/?q=1&page=2"):
+            ...
+    """
+
+    def __init__(self, default_params: Optional[Dict[str, str]] = None):
+        # attaque -> payloads encodés ; le dict sert aussi d'ensemble ordonné pour le dédoublonnage
+        self._payloads: Dict[str, Dict[str, None]] = {}
+        self.default_params = dict(DEFAULT_PARAMS if default_params is None else default_params)
+
+    @classmethod
+    def default(cls) -> "PayloadCorpus":
+        """Crée le corpus intégré."""
+        corpus = cls()
+        for attack, values in DEFAULT_PAYLOADS.items():
+            corpus.add_many(attack, values)
+        return corpus
+
+    @classmethod
+    def from_files(cls, paths: Iterable[Union[str, Path]]) -> "PayloadCorpus":
+        """Crée un corpus à partir de fichiers ou de répertoires de payloads."""
+        corpus = cls()
+        for path in paths:
+            corpus.load(path)
+        return corpus
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "PayloadCorpus":
+        """Crée le corpus des fichiers `payloads.files`, ou le corpus intégré à défaut."""
+        files = config.get("payloads", {}).get("files") or []
+        if not files:
+            return cls.default()
+        return cls.from_files(files)
+
+    def add(self, attack: str, value: Union[str, bytes]) -> bool:
+        """Ajoute un payload ; retourne False s'il était déjà présent."""
+        encoded = encode_component(value)
+        bucket = self._payloads.setdefault(attack, {})
+        if encoded in bucket:
+            return False
+        bucket[encoded] = None
+        return True
+
+    def add_many(self, attack: str, values: Iterable[Union[str, bytes]]) -> int:
+        """Ajoute des payloads et retourne le nombre de nouveaux payloads."""
+        return sum(1 for value in values if self.add(attack, value))
+
+    def load(self, path: Union[str, Path], attack: Optional[str] = None) -> int:
+        """
+        Charge un fichier de payloads (un par ligne, lignes vides ignorées).
+
+        L'attaque prend le nom du fichier sans extension si elle n'est pas précisée.
+        Un répertoire charge chacun de ses fichiers. Les lignes sont lues en octets
+        et encodées telles quelles, sans supposer d'encodage de caractères.
+
+        Returns:
+            Le nombre de nouveaux payloads
+        """
+        path = Path(path).expanduser()
+        if path.is_dir():
+            return sum(self.load(child, attack) for child in sorted(path.iterdir()) if child.is_file())
+        name = attack or path.stem
+        with open(path, "rb") as f:
+            added = self.add_many(
+                name, (line for line in (raw.rstrip(b"\r\n") for raw in f) if line)
+            )
+        logger.info(f"{added} payloads chargés depuis {path} ({name})")
+        return added
+
+    @property
+    def attacks(self) -> List[str]:
+        """Noms des attaques du corpus."""
+        return list(self._payloads)
+
+    def payloads(self, attack: str) -> List[str]:
+        """Payloads encodés d'une attaque."""
+        return list(self._payloads.get(attack, ()))
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._payloads.values())
+
+    def digest(self) -> str:
+        """
+        Empreinte SHA-256 du contenu du corpus : attaques, payloads dans leur ordre
+        et paramètres par défaut, c'est-à-dire tout ce qui détermine `plan`.
+        """
+        digest = hashlib.sha256(json.dumps(self.default_params, sort_keys=True).encode("utf-8"))
+        for attack, bucket in self._payloads.items():
+            digest.update(b"\n" + json.dumps([attack, list(bucket)]).encode("utf-8"))
+        return digest.hexdigest()
+
+    def plan(self, target: str) -> Iterator[Tuple[str, str]]:
+        """
+        Génère les couples (attaque, URL) d'une cible, dans un ordre déterministe :
+        par attaque, puis par payload, puis par paramètre.
+        """
+        parts = urlsplit(target)
+        # Les paramètres existants sont encodés une fois par cible
+        params = [
+            (encode_component(name), encode_component(value))
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        ]
+
+        for attack, bucket in self._payloads.items():
+            slots = params or [(encode_component(self.default_params.get(attack, DEFAULT_PARAM)), "")]
+            # Pour chaque paramètre : la query string avant et après la valeur injectée
+            templates = [
+                (
+                    "".join(f"{name}={value}&" for name, value in slots[:index]) + f"{slots[index][0]}=",
+                    "".join(f"&{name}={value}" for name, value in slots[index + 1:])
+                )
+                for index in range(len(slots))
+            ]
+            for payload in bucket:
+                for prefix, suffix in templates:
+                    yield attack, urlunsplit(
+                        (parts.scheme, parts.netloc, parts.path, prefix + payload + suffix, parts.fragment)
+                    )
+
+    def iter_plan(self, targets: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """Enchaîne paresseusement les plans de plusieurs cibles."""
+        for target in targets:
+            yield from self.plan(target)
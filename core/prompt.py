@@ -0,0 +1,194 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from .config import config
+from .rules import RuleSet
+
+# Estimation du nombre de tokens : environ 4 caractères par token pour du texte
+# anglais ou du HTML, ce qui suffit à borner la taille des prompts
+CHARS_PER_TOKEN = 4
+
+# En-têtes conservés dans le prompt ; les autres (Date, ETag, Content-Length,
+# identifiants de requête, etc.) n'apportent rien à l'analyse de sécurité
+SECURITY_HEADERS = frozenset({
+    "access-control-allow-credentials",
+    "access-control-allow-headers",
+    "access-control-allow-methods",
+    "access-control-allow-origin",
+    "content-security-policy",
+    "content-security-policy-report-only",
+    "content-type",
+    "cross-origin-embedder-policy",
+    "cross-origin-opener-policy",
+    "cross-origin-resource-policy",
+    "location",
+    "permissions-policy",
+    "referrer-policy",
+    "server",
+    "set-cookie",
+    "strict-transport-security",
+    "www-authenticate",
+    "x-aspnet-version",
+    "x-content-type-options",
+    "x-frame-options",
+    "x-powered-by",
+    "x-xss-protection",
+})
+
+# Signatures d'erreurs serveur recherchées dans le corps
+ERROR_SIGNATURES = re.compile(
+    r"traceback \(most recent call last\)|stack ?trace|exception|fatal error|warning:"
+    r"|syntax error|sqlstate|ORA-\d{5}|you have an error in your sql|unterminated"
+    r"|undefined (?:index|variable)|at [\w.$]+\([\w]+\.java:\d+\)",
+    re.IGNORECASE
+)
+
+# Nombre maximal d'occurrences retenues par payload réfléchi
+MAX_REFLECTIONS = 10
+
+# Longueur minimale d'une valeur de paramètre recherchée comme payload réfléchi
+MIN_PAYLOAD_LENGTH = 3
+
+ELLIPSIS = " […] "
+
+PROMPT_TEMPLATE = """Analyze the following web application behavior:
+URL: {url}
+{attack}Response Status: {status}
+Response Time: {response_time}
+Headers: {headers}
+{body_label}: {body}
+
+Please provide:
+1. Security implications
+2. Potential vulnerabilities
+3. Recommended actions
+"""
+
+def estimate_tokens(text: str) -> int:
+    """Estime le nombre de tokens d'un texte."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def reflected_payloads(data: Dict[str, Any]) -> List[str]:
+    """Valeurs injectées d'un résultat (champ `payload` ou paramètres de l'URL)."""
+    candidates = [data["payload"]] if data.get("payload") else []
+    query = urlsplit(data.get("url") or "").query
+    candidates.extend(value for _, value in parse_qsl(query, keep_blank_values=True))
+    payloads: List[str] = []
+    for value in candidates:
+        if len(value) >= MIN_PAYLOAD_LENGTH and value not in payloads:
+            payloads.append(value)
+    return payloads
+
+class PromptBuilder:
+    """
+    Construit le prompt d'analyse d'un résultat dans un budget de tokens.
+
+    Seuls les en-têtes utiles à l'analyse de sécurité sont conservés. Si le corps
+    dépasse le budget restant, seules les zones autour des payloads réfléchis et
+    des signatures d'erreurs (motifs de `ERROR_SIGNATURES` et règles du
+    classifieur) sont incluses, avec `context_chars` caractères de contexte ; à
+    défaut, le début du corps.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 1500,
+        context_chars: int = 200,
+        max_header_chars: int = 256,
+        rules: Optional[RuleSet] = None
+    ):
+        self.max_tokens = max_tokens
+        self.context_chars = context_chars
+        self.max_header_chars = max_header_chars
+        self._rules = rules
+
+    @classmethod
+    def from_config(cls) -> "PromptBuilder":
+        """Crée un constructeur de prompts à partir de la section `llm` de la configuration."""
+        llm_config = config.get("llm", {})
+        return cls(
+            max_tokens=llm_config.get("prompt_max_tokens", 1500),
+            context_chars=llm_config.get("prompt_context_chars", 200)
+        )
+
+    @property
+    def rules(self) -> RuleSet:
+        if self._rules is None:
+            from .classifier import get_rules
+            self._rules = get_rules()
+        return self._rules
+
+    def select_headers(self, headers: Dict[str, Any]) -> Dict[str, str]:
+        """En-têtes utiles à l'analyse de sécurité, aux valeurs tronquées."""
+        selected = {}
+        for name, value in (headers or {}).items():
+            if name.lower() in SECURITY_HEADERS:
+                value = str(value)
+                if len(value) > self.max_header_chars:
+                    value = value[:self.max_header_chars] + "…"
+                selected[name] = value
+        return selected
+
+    def body_regions(self, body: str, data: Dict[str, Any]) -> List[Tuple[int, int]]:
+        """Zones du corps (fusionnées, dans l'ordre) autour des réflexions et des erreurs."""
+        hits: List[Tuple[int, int]] = []
+        lowered = body.lower()
+        for payload in reflected_payloads(data):
+            needle = payload.lower()
+            start = lowered.find(needle)
+            for _ in range(MAX_REFLECTIONS):
+                if start == -1:
+                    break
+                hits.append((start, start + len(needle)))
+                start = lowered.find(needle, start + len(needle))
+        hits.extend(m.span() for m in ERROR_SIGNATURES.finditer(body))
+        hits.extend(self.rules.spans(body))
+
+        regions: List[Tuple[int, int]] = []
+        for start, end in sorted(hits):
+            start, end = max(0, start - self.context_chars), min(len(body), end + self.context_chars)
+            if regions and start <= regions[-1][1]:
+                regions[-1] = (regions[-1][0], max(regions[-1][1], end))
+            else:
+                regions.append((start, end))
+        return regions
+
+    def excerpt(self, body: str, data: Dict[str, Any], max_chars: int) -> str:
+        """Corps complet s'il tient en `max_chars` caractères, sinon ses zones pertinentes."""
+        if len(body) <= max_chars:
+            return body
+        regions = self.body_regions(body, data) or [(0, max_chars)]
+        parts: List[str] = []
+        remaining = max_chars
+        for start, end in regions:
+            if remaining <= 0:
+                break
+            end = min(end, start + remaining)
+            parts.append(body[start:end])
+            remaining -= end - start + len(ELLIPSIS)
+        text = ELLIPSIS.join(parts)
+        if regions[0][0] > 0:
+            text = ELLIPSIS.lstrip() + text
+        return text + ELLIPSIS.rstrip()
+
+    def build(self, data: Dict[str, Any]) -> str:
+        """Construit le prompt d'un résultat."""
+        fields = {
+            "url": data.get("url", "N/A"),
+            "attack": f"Attack: {data['attack']}\n" if data.get("attack") else "",
+            "status": data.get("status_code", data.get("status", "N/A")),
+            "response_time": data.get("response_time", "N/A"),
+            "headers": json.dumps(self.select_headers(data.get("headers", {})), indent=2),
+        }
+        body = data.get("body")
+        if body is None:
+            return PROMPT_TEMPLATE.format(body_label="Body", body="N/A", **fields)
+        body = str(body)
+
+        fixed = PROMPT_TEMPLATE.format(body_label="Body (excerpts, 0000000000 chars)", body="", **fields)
+        max_chars = max(0, self.max_tokens * CHARS_PER_TOKEN - len(fixed))
+        excerpt = self.excerpt(body, data, max_chars)
+        label = "Body" if excerpt == body else f"Body (excerpts, {len(body)} chars)"
+        return PROMPT_TEMPLATE.format(body_label=label, body=excerpt, **fields)
@@ -0,0 +1,110 @@
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+class ProviderError(ValueError):
+    """Fournisseur LLM inconnu ou mal configuré."""
+    pass
+
+class OpenAIProvider:
+    """
+    Fournisseur LLM exposant l'API Chat Completions d'OpenAI.
+
+    Le fournisseur décrit l'URL de base, le modèle, les paramètres de génération
+    et les timeouts ; il crée la session HTTP dont le pool de connexions est
+    réutilisé par tous les appels d'une annotation.
+    """
+
+    name = "openai"
+    default_base_url = "https://api.openai.com/v1"
+    default_model = "gpt-4"
+    requires_api_key = True
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        timeout: float = 60.0,
+        connect_timeout: float = 10.0,
+        keepalive_timeout: float = 30.0
+    ):
+        self.base_url = (base_url or self.default_base_url).rstrip("/")
+        self.model = model or self.default_model
+        self.temperature = temperature
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.keepalive_timeout = keepalive_timeout
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.base_url}/chat/completions"
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        """Paramètres de génération (hors modèle et messages)."""
+        return {"temperature": self.temperature}
+
+    def build_request(self, prompt: str, api_key: Optional[str] = None) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Construit l'URL, les en-têtes et le corps d'une requête."""
+        headers = {"Content-Type": "application/json"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            **self.params
+        }
+        return self.endpoint, headers, payload
+
+    def create_session(self, concurrency: int) -> aiohttp.ClientSession:
+        """Crée une session HTTP dont le pool de connexions est dimensionné sur la concurrence."""
+        connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=self.keepalive_timeout)
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout, connect=self.connect_timeout)
+        )
+
+class LocalProvider(OpenAIProvider):
+    """
+    Serveur d'inférence local compatible avec l'API OpenAI (vLLM, llama.cpp,
+    Ollama, ou le serveur de test `core.llm_stub`) ; la clé API est facultative.
+    """
+
+    name = "local"
+    default_base_url = "http://127.0.0.1:8080/v1"
+    default_model = "local"
+    requires_api_key = False
+
+PROVIDERS = {
+    OpenAIProvider.name: OpenAIProvider,
+    LocalProvider.name: LocalProvider,
+}
+
+def create_provider(
+    name: Optional[str] = None,
+    base_url: Optional[str] = None,
+    model: Optional[str] = None
+) -> OpenAIProvider:
+    """
+    Crée le fournisseur `name` (config `llm.provider`, "openai" par défaut) ;
+    l'URL de base et le modèle fournis remplacent ceux de la configuration.
+    """
+    llm_config = config.get("llm", {})
+    name = name or llm_config.get("provider", OpenAIProvider.name)
+    if name not in PROVIDERS:
+        raise ProviderError(
+            f"Fournisseur LLM inconnu: {name} (disponibles : {', '.join(PROVIDERS)})"
+        )
+    return PROVIDERS[name](
+        base_url=base_url or llm_config.get("base_url"),
+        model=model or llm_config.get("model"),
+        temperature=llm_config.get("temperature", 0.7),
+        timeout=llm_config.get("timeout", 60.0),
+        connect_timeout=llm_config.get("connect_timeout", 10.0)
+    )
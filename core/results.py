@@ -0,0 +1,335 @@
+import gzip
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO, Union, cast
+
+from .store import ResultStore, is_store_path
+
+try:
+    import zstandard  # type: ignore[import]
+except ImportError:  # Dépendance optionnelle (pip install zstandard)
+    zstandard = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Extension de fichier -> compression
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".zst": "zstd",
+}
+
+# Suffixe du fichier des corps, aligné ligne à ligne sur le fichier de métadonnées
+BODIES_SUFFIX = ".bodies"
+
+# Taille des blocs lus dans le fichier de résultats
+READ_CHUNK_SIZE = 1024 * 1024
+
+_WHITESPACE = " \t\r\n"
+# Caractères qui terminent sans ambiguïté un nombre ou un littéral
+_SCALAR_END = _WHITESPACE + ",]}"
+
+# Nombre maximal de caractères d'un jeton JSON coupé en fin de bloc (`fals`, `1.`, `\u12`...)
+_TRUNCATED_TOKEN_CHARS = 6
+
+def _may_be_truncated(error: json.JSONDecodeError, buffer: str) -> bool:
+    """
+    Indique si une erreur de décodage peut venir d'une valeur coupée en fin de
+    bloc (auquel cas la lecture du bloc suivant peut la compléter) plutôt que
+    d'une valeur invalide.
+    """
+    if error.msg.startswith("Unterminated string"):
+        # Une chaîne ne peut contenir de saut de ligne brut
+        return "\n" not in buffer[error.pos:]
+    return len(buffer) - error.pos <= _TRUNCATED_TOKEN_CHARS
+
+def iter_json_values(stream: TextIO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Lit en flux les valeurs JSON d'un fichier texte.
+
+    Sont acceptés : un tableau JSON (dont les éléments sont produits un à un),
+    des valeurs JSON Lines ou des valeurs simplement concaténées. Seule la valeur
+    en cours de lecture est gardée en mémoire, quelle que soit la taille du fichier.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    in_array: Optional[bool] = None
+
+    def _skip(chars: str) -> None:
+        nonlocal pos
+        while pos < len(buffer) and buffer[pos] in chars:
+            pos += 1
+
+    while True:
+        _skip(_WHITESPACE + ("," if in_array else ""))
+        if pos >= len(buffer):
+            if eof:
+                break
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+
+        if in_array is None:
+            # Le premier caractère significatif détermine le format
+            in_array = buffer[pos] == "["
+            if in_array:
+                pos += 1
+            continue
+        if in_array and buffer[pos] == "]":
+            pos += 1
+            in_array = False
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if eof or not _may_be_truncated(e, buffer):
+                raise
+            # Valeur incomplète : lit le bloc suivant
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        if (
+            not eof and not isinstance(value, (dict, list, str))
+            and (end == len(buffer) or buffer[end] not in _SCALAR_END)
+        ):
+            # Un nombre ou un littéral non suivi d'un séparateur peut être tronqué
+            # (`0.` ou `1e` en fin de bloc sont décodés en `0` et `1`)
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        pos = end
+        yield value
+
+def compression_for(path: str) -> Optional[str]:
+    """Déduit la compression ("gzip", "zstd" ou None) de l'extension du fichier."""
+    return COMPRESSION_EXTENSIONS.get(Path(path).suffix.lower())
+
+def open_text(path: str, mode: str = "r", compression: Optional[str] = None) -> TextIO:
+    """
+    Ouvre un fichier texte UTF-8, compressé ou non.
+
+    Args:
+        path: Chemin du fichier
+        mode: "r", "w" ou "a" (un fichier compressé ouvert en ajout reçoit un
+            nouveau bloc compressé, relu à la suite des précédents)
+        compression: "gzip", "zstd" ou None (déduite de l'extension par défaut)
+    """
+    compression = compression if compression is not None else compression_for(path)
+    if compression == "gzip":
+        return cast(TextIO, gzip.open(path, mode + "t", encoding="utf-8"))
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("La compression zstd nécessite le paquet zstandard : pip install zstandard")
+        return cast(TextIO, zstandard.open(path, mode + "t", encoding="utf-8"))
+    if compression:
+        raise ValueError(f"Compression non supportée: {compression}")
+    return cast(TextIO, open(path, mode, encoding="utf-8"))
+
+def bodies_path(path: str) -> str:
+    """
+    Chemin du fichier des corps associé à un fichier de résultats :
+    `scan.jsonl.gz` → `scan.bodies.jsonl.gz`.
+    """
+    path_obj = Path(path)
+    name = path_obj.name
+    suffix = path_obj.suffix if path_obj.suffix.lower() in COMPRESSION_EXTENSIONS else ""
+    stem = name[:len(name) - len(suffix)]
+    for extension in (".jsonl", ".json"):
+        if stem.endswith(extension):
+            stem = stem[:-len(extension)] + BODIES_SUFFIX + extension
+            break
+    else:
+        stem += BODIES_SUFFIX
+    return str(path_obj.with_name(stem + suffix))
+
+class ResultWriter:
+    """
+    Écrit les résultats en flux, au fur et à mesure de leur production.
+
+    Les métadonnées de chaque résultat sont écrites en JSON Lines dans `path`,
+    compressé selon son extension (`.gz`, `.zst`). Si `separate_bodies` est vrai,
+    les corps de réponse sont écrits à part (voir `bodies_path`), une ligne par
+    résultat, pour que les métadonnées se lisent sans décompresser les corps.
+
+    `sync` termine les blocs compressés en cours et retourne la taille des
+    fichiers ; en ajout, `offsets` (tailles retournées par un `sync` précédent)
+    tronque d'abord les fichiers à ces tailles, ce qui écarte un bloc inachevé
+    ou des lignes que l'autre fichier n'a pas reçues après un arrêt brutal.
+
+        with ResultWriter("scan.jsonl.gz") as writer:
+            for result in results:
+                writer.write(result)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compression: Optional[str] = None,
+        separate_bodies: bool = True,
+        append: bool = False,
+        offsets: Optional[Dict[str, int]] = None
+    ):
+        self.path = path
+        self.compression = compression if compression is not None else compression_for(path)
+        self.separate_bodies = separate_bodies
+        self.count = 0
+        if append and offsets:
+            self._truncate(offsets)
+        mode = "a" if append else "w"
+        self._meta = open_text(path, mode, self.compression)
+        self._bodies: Optional[TextIO] = None
+        if separate_bodies:
+            try:
+                self._bodies = open_text(bodies_path(path), mode, self.compression)
+            except Exception:
+                self._meta.close()
+                raise
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Écrit un résultat."""
+        if self._bodies is not None:
+            record = dict(record)
+            body = record.pop("body", None)
+            self._bodies.write(json.dumps(body, ensure_ascii=False) + "\n")
+        self._meta.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Écrit une suite de résultats et retourne leur nombre."""
+        written = 0
+        for record in records:
+            self.write(record)
+            written += 1
+        return written
+
+    def flush(self) -> None:
+        """Écrit sur disque les résultats en mémoire tampon."""
+        self._meta.flush()
+        if self._bodies is not None:
+            self._bodies.flush()
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Écrit sur disque les résultats en mémoire tampon, en terminant les blocs
+        compressés (un nouveau bloc est commencé pour la suite).
+
+        Returns:
+            La taille en octets du fichier de métadonnées (`meta`) et, le cas
+            échéant, du fichier des corps (`bodies`)
+        """
+        self._meta = self._sync_file(self._meta, self.path)
+        offsets = {"meta": os.path.getsize(self.path)}
+        if self._bodies is not None:
+            self._bodies = self._sync_file(self._bodies, bodies_path(self.path))
+            offsets["bodies"] = os.path.getsize(bodies_path(self.path))
+        return offsets
+
+    def _sync_file(self, stream: TextIO, path: str) -> TextIO:
+        if not self.compression:
+            stream.flush()
+            return stream
+        stream.close()
+        return open_text(path, "a", self.compression)
+
+    def _truncate(self, offsets: Dict[str, int]) -> None:
+        """Ramène les fichiers aux tailles enregistrées par `sync`."""
+        paths = {"meta": self.path, "bodies": bodies_path(self.path)}
+        for name, size in offsets.items():
+            path = paths.get(name)
+            if path is not None and os.path.exists(path) and os.path.getsize(path) > size:
+                logger.info(f"Troncature de {path} à {size} octets (point de reprise)")
+                os.truncate(path, size)
+
+    def close(self) -> None:
+        """Termine les fichiers (et leurs blocs compressés)."""
+        self._meta.close()
+        if self._bodies is not None:
+            self._bodies.close()
+
+def open_result_writer(
+    path: str,
+    separate_bodies: bool = True,
+    append: bool = False,
+    target: Optional[str] = None,
+    scan_id: Optional[str] = None,
+    offsets: Optional[Dict[str, int]] = None
+) -> Union[ResultWriter, ResultStore]:
+    """
+    Ouvre la destination de résultats adaptée au chemin : une base SQLite
+    (`.sqlite`, `.db`), où les résultats sont rattachés au scan `scan_id` ou à
+    un nouveau scan de `target`, ou un fichier JSONL éventuellement compressé
+    (tronqué aux `offsets` d'un `ResultWriter.sync` précédent en cas d'ajout).
+    """
+    if is_store_path(path):
+        store = ResultStore(path)
+        store.start_scan(target, scan_id)
+        return store
+    return ResultWriter(path, separate_bodies=separate_bodies, append=append, offsets=offsets)
+
+def read_results(path: str, with_bodies: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Lit en flux les résultats d'un fichier JSON ou JSONL (`-` pour stdin),
+    compressé ou non, ou de tous les scans d'une base SQLite (`.sqlite`, `.db`).
+
+    Si un fichier de corps séparé accompagne le fichier (voir `ResultWriter`) et
+    que `with_bodies` est vrai, chaque résultat retrouve son corps ; sinon seules
+    les métadonnées sont lues.
+    """
+    if is_store_path(path):
+        if not Path(path).expanduser().exists():
+            raise FileNotFoundError(path)
+        with ResultStore(path) as store:
+            yield from store.query(with_bodies=with_bodies)
+        return
+    if path == "-":
+        yield from iter_json_values(sys.stdin)
+        return
+    bodies = bodies_path(path)
+    with open_text(path) as f:
+        if not with_bodies or not Path(bodies).exists():
+            yield from iter_json_values(f)
+            return
+        with open_text(bodies) as body_stream:
+            body_values = iter_json_values(body_stream)
+            for record in iter_json_values(f):
+                body = next(body_values, None)
+                if body is not None:
+                    record["body"] = body
+                yield record
+
+def write_jsonl(records: Iterable[Dict[str, Any]], path: str) -> int:
+    """
+    Écrit des enregistrements au format JSON Lines (`-` pour stdout), compressés
+    selon l'extension du fichier.
+
+    Returns:
+        Le nombre d'enregistrements écrits
+    """
+    sink = sys.stdout if path == "-" else open_text(path, "w")
+    count = 0
+    try:
+        for record in records:
+            sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+        sink.flush()
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    return count
@@ -0,0 +1,83 @@
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+from .config import config
+
+# Configuration des retries
+RETRY_COUNT = 3
+RETRY_DELAY = 1.0  # secondes
+
+class RetryPolicy:
+    """
+    Politique de retry des requêtes HTTP.
+
+    Seules les défaillances transitoires sont retentées : erreurs réseau, timeouts
+    et statuts de `retry_statuses` (429 et 5xx par défaut). Le délai croît de façon
+    exponentielle avec une part aléatoire (`jitter`) et respecte l'en-tête
+    `Retry-After` lorsqu'il est présent.
+    """
+
+    DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: float = 30.0,
+        jitter: float = 0.5,
+        retry_statuses: Optional[Iterable[int]] = None,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 120.0
+    ):
+        self.max_attempts = max(1, max_attempts if max_attempts is not None else RETRY_COUNT)
+        self.base_delay = base_delay if base_delay is not None else RETRY_DELAY
+        self.max_delay = max_delay
+        self.jitter = min(1.0, max(0.0, jitter))
+        self.retry_statuses = frozenset(
+            retry_statuses if retry_statuses is not None else self.DEFAULT_RETRY_STATUSES
+        )
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    @classmethod
+    def from_config(cls) -> "RetryPolicy":
+        """Crée une politique à partir de la section `retry` de la configuration."""
+        retry_config = config.get("retry", {})
+        return cls(
+            max_attempts=retry_config.get("max_attempts"),
+            base_delay=retry_config.get("base_delay"),
+            max_delay=retry_config.get("max_delay", 30.0),
+            jitter=retry_config.get("jitter", 0.5),
+            retry_statuses=retry_config.get("retry_statuses"),
+            respect_retry_after=retry_config.get("respect_retry_after", True)
+        )
+
+    def should_retry_status(self, status: int) -> bool:
+        """Indique si un statut HTTP correspond à une défaillance transitoire."""
+        return status in self.retry_statuses
+
+    def compute_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Calcule le délai avant la tentative suivante (`attempt` commence à 0)."""
+        if self.respect_retry_after and retry_after:
+            requested = self.parse_retry_after(retry_after)
+            if requested is not None:
+                return min(requested, self.max_retry_after)
+        delay = min(self.max_delay, self.base_delay * (2.0 ** attempt))
+        return delay * (1.0 - self.jitter * random.random())
+
+    @staticmethod
+    def parse_retry_after(value: str) -> Optional[float]:
+        """Interprète un en-tête Retry-After (secondes ou date HTTP)."""
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if retry_at is None:
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,231 @@
+import importlib
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Set, Tuple, Union
+
+import yaml
+
+# Analyseur d'expressions de la bibliothèque standard (`sre_parse` est déprécié en 3.11)
+_sre_parse: Any = importlib.import_module("re._parser" if sys.version_info >= (3, 11) else "sre_parse")
+
+VULNERABLE = "VULNERABLE"
+STRICT = "STRICT"
+
+# Ordre de priorité des verdicts produits par les règles
+VERDICT_PRIORITY = (VULNERABLE, STRICT)
+
+# Règles par défaut : reproduisent les contrôles historiques du classifieur
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    {"id": "xss-reflected", "verdict": VULNERABLE, "patterns": ["alert(1)"]},
+    {"id": "sql-syntax-error", "verdict": VULNERABLE, "patterns": ["syntax"]},
+    {"id": "access-denied", "verdict": STRICT, "patterns": ["access denied"], "status": [403]},
+]
+
+class RuleError(ValueError):
+    """Règle de classification invalide."""
+    pass
+
+class Rule:
+    """
+    Signature de classification.
+
+    Une règle correspond à une réponse si l'un de ses motifs apparaît dans le
+    corps (`patterns` : chaînes littérales, `regex` : expressions régulières,
+    sans tenir compte de la casse) ou si son statut figure dans `status`.
+    """
+
+    __slots__ = ("id", "verdict", "patterns", "regex", "status")
+
+    def __init__(
+        self,
+        id: str,
+        verdict: str,
+        patterns: Iterable[str] = (),
+        regex: Iterable[str] = (),
+        status: Iterable[int] = ()
+    ):
+        if verdict not in VERDICT_PRIORITY:
+            raise RuleError(f"Verdict inconnu pour la règle {id}: {verdict}")
+        self.id = id
+        self.verdict = verdict
+        self.patterns = [p for p in patterns if p]
+        self.regex = list(regex)
+        self.status = set(status)
+        if not (self.patterns or self.regex or self.status):
+            raise RuleError(f"La règle {id} ne contient aucun motif")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Rule":
+        try:
+            return cls(
+                data["id"], data["verdict"],
+                data.get("patterns", ()), data.get("regex", ()), data.get("status", ())
+            )
+        except KeyError as e:
+            raise RuleError(f"Champ manquant dans une règle : {e}")
+
+# Longueur minimale du préfixe littéral d'une expression régulière pour qu'elle
+# soit recherchée via l'arbre de préfixes (un préfixe trop court est trop fréquent)
+MIN_REGEX_PREFIX = 3
+
+def _literal_prefix(pattern: str) -> str:
+    """
+    Préfixe littéral par lequel commence toute correspondance de l'expression
+    (en ignorant les ancres comme `\\b`), ou "" si elle n'en a pas.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except re.error:
+        return ""
+    prefix = []
+    for op, value in parsed:
+        if op is _sre_parse.LITERAL:
+            prefix.append(chr(value))
+        elif op is _sre_parse.AT and not prefix:
+            continue
+        else:
+            break
+    return "".join(prefix)
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Construit une expression régulière équivalente à l'alternative des mots,
+    factorisée en arbre de préfixes : le coût de la recherche dépend de la
+    longueur des préfixes communs et non du nombre de mots.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _render(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + _render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Un mot se termine ici : la suite est facultative (la plus longue est préférée)
+            return (pattern if len(branches) > 1 else "(?:" + pattern + ")") + "?"
+        return pattern
+
+    return _render(trie)
+
+class RuleSet:
+    """
+    Ensemble de règles recherché en un seul parcours du corps.
+
+    Les motifs littéraux et les préfixes littéraux des expressions régulières
+    sont fusionnés en un arbre de préfixes placé dans une assertion avant
+    (`(?=...)`), insensible à la casse : le corps est parcouru une seule fois,
+    sans copie, et toutes les clés qui commencent à une position sont trouvées.
+    Une expression régulière n'est essayée qu'aux positions où son préfixe
+    apparaît ; chacune étant compilée séparément, plusieurs règles peuvent
+    correspondre à une même position et leurs groupes restent valides. Seules
+    les expressions sans préfixe d'au moins `MIN_REGEX_PREFIX` caractères sont
+    recherchées dans tout le corps.
+    """
+
+    def __init__(self, rules: Iterable[Union[Rule, Dict[str, Any]]]):
+        self.rules = [rule if isinstance(rule, Rule) else Rule.from_dict(rule) for rule in rules]
+        # Clé de l'arbre (en minuscules) -> règles littérales et expressions préfixées par la clé
+        self._literals: Dict[str, List[Rule]] = {}
+        self._prefixed: Dict[str, List[Tuple[Pattern[str], Rule]]] = {}
+        # Expressions sans préfixe exploitable, recherchées dans tout le corps
+        self._unprefixed: List[Tuple[Pattern[str], Rule]] = []
+        self._status: Dict[int, List[Rule]] = {}
+
+        for rule in self.rules:
+            for literal in rule.patterns:
+                self._literals.setdefault(literal.lower(), []).append(rule)
+            for status in rule.status:
+                self._status.setdefault(status, []).append(rule)
+            for pattern in rule.regex:
+                try:
+                    compiled = re.compile(pattern, re.IGNORECASE | re.DOTALL)
+                except re.error as e:
+                    raise RuleError(f"Expression invalide dans la règle {rule.id}: {e}")
+                prefix = _literal_prefix(pattern).lower()
+                if len(prefix) >= MIN_REGEX_PREFIX:
+                    self._prefixed.setdefault(prefix, []).append((compiled, rule))
+                else:
+                    self._unprefixed.append((compiled, rule))
+        keys = set(self._literals) | set(self._prefixed)
+        self._key_lengths = sorted({len(key) for key in keys})
+        self._matcher = (
+            re.compile(f"(?=({_trie_pattern(keys)}))", re.IGNORECASE | re.DOTALL)
+            if keys else None
+        )
+
+    @classmethod
+    def default(cls) -> "RuleSet":
+        """Crée l'ensemble de règles par défaut."""
+        return cls(DEFAULT_RULES)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "RuleSet":
+        """Charge des règles depuis un fichier YAML ou JSON (liste, ou clé `rules`)."""
+        with open(Path(path).expanduser(), "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        if isinstance(data, dict):
+            data = data.get("rules", [])
+        if not isinstance(data, list):
+            raise RuleError(f"Format de règles invalide dans {path}")
+        return cls(data)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def _scan_prefixed(self, body: str) -> Iterator[Tuple[Rule, int, int]]:
+        """
+        Parcourt le corps avec l'arbre de préfixes et produit (règle, début, fin)
+        pour chaque littéral et chaque expression préfixée trouvés.
+        """
+        if self._matcher is None:
+            return
+        for m in self._matcher.finditer(body):
+            start = m.start()
+            key = m.group(1).lower()
+            # Les clés préfixes de la clé trouvée commencent à la même position
+            for length in self._key_lengths:
+                if length > len(key):
+                    break
+                candidate = key[:length]
+                for rule in self._literals.get(candidate, ()):
+                    yield rule, start, start + length
+                for pattern, rule in self._prefixed.get(candidate, ()):
+                    found = pattern.match(body, start)
+                    if found is not None:
+                        yield rule, start, found.end()
+
+    def match(self, body: str, status: Any = None) -> List[Rule]:
+        """Retourne les règles qui correspondent à une réponse, dans l'ordre de définition."""
+        matched: Set[int] = set()
+        for rule in self._status.get(status, ()):
+            matched.add(id(rule))
+        if body:
+            for rule, _, _ in self._scan_prefixed(body):
+                matched.add(id(rule))
+            for pattern, rule in self._unprefixed:
+                if id(rule) not in matched and pattern.search(body):
+                    matched.add(id(rule))
+        return [rule for rule in self.rules if id(rule) in matched]
+
+    def spans(self, body: str) -> Iterator[Tuple[int, int]]:
+        """Positions (début, fin) des motifs trouvés dans le corps, dans l'ordre du corps."""
+        if not body:
+            return
+        found = {(start, end) for _, start, end in self._scan_prefixed(body)}
+        for pattern, _ in self._unprefixed:
+            found.update(m.span() for m in pattern.finditer(body) if m.end() > m.start())
+        yield from sorted(found)
+
+    def verdict(self, body: str, status: Any = None) -> Optional[str]:
+        """Retourne le verdict le plus prioritaire des règles correspondantes."""
+        verdicts = {rule.verdict for rule in self.match(body, status)}
+        for verdict in VERDICT_PRIORITY:
+            if verdict in verdicts:
+                return verdict
+        return None
@@ -0,0 +1,184 @@
+import json
+import logging
+import sqlite3
+import uuid
+from pathlib import Path
+from time import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Extensions reconnues comme base de résultats SQLite
+STORE_EXTENSIONS = (".sqlite", ".sqlite3", ".db")
+
+def is_store_path(path: str) -> bool:
+    """Indique si un chemin de résultats désigne une base SQLite."""
+    return Path(path).suffix.lower() in STORE_EXTENSIONS
+
+class ResultStore:
+    """
+    Base de résultats SQLite indexée, cumulant l'historique des scans.
+
+    Chaque scan reçoit un identifiant ; les résultats sont insérés par lots et
+    indexés par hôte, URL, attaque, statut et scan, pour des requêtes comme
+    « toutes les 500 de l'hôte X pour l'attaque sqli » sans parcourir tous les
+    résultats. Les corps sont stockés dans une table séparée et ne sont lus que
+    si nécessaire. Expose la même interface d'écriture que `ResultWriter` :
+
+        with ResultStore("scans.sqlite") as store:
+            store.start_scan("https://example.com")
+            store.write_many(results)
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(self, path: str, scan_id: Optional[str] = None):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.scan_id = scan_id
+        self.count = 0
+        self._pending: List[Tuple[Dict[str, Any], Optional[str]]] = []
+        self._closed = False
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS scans (
+                id TEXT PRIMARY KEY,
+                target TEXT,
+                started_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY,
+                scan_id TEXT,
+                host TEXT,
+                url TEXT NOT NULL,
+                attack TEXT,
+                status,
+                distance REAL,
+                created_at REAL NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS bodies (
+                result_id INTEGER PRIMARY KEY,
+                body TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_results_scan ON results(scan_id);
+            CREATE INDEX IF NOT EXISTS idx_results_host ON results(host, attack, status);
+            CREATE INDEX IF NOT EXISTS idx_results_url ON results(url);
+            CREATE INDEX IF NOT EXISTS idx_results_attack ON results(attack, status);
+            CREATE INDEX IF NOT EXISTS idx_results_status ON results(status);
+            """
+        )
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def start_scan(self, target: Optional[str] = None, scan_id: Optional[str] = None) -> str:
+        """Enregistre un nouveau scan et l'associe aux résultats écrits ensuite."""
+        self.flush()
+        self.scan_id = scan_id or uuid.uuid4().hex
+        self._conn.execute(
+            "INSERT OR IGNORE INTO scans (id, target, started_at) VALUES (?, ?, ?)",
+            (self.scan_id, target, time())
+        )
+        return self.scan_id
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Ajoute un résultat ; les insertions sont regroupées par lots de `BATCH_SIZE`."""
+        self._pending.append((record, self.scan_id))
+        self.count += 1
+        if len(self._pending) >= self.BATCH_SIZE:
+            self.flush()
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Ajoute une suite de résultats et retourne leur nombre."""
+        written = 0
+        for record in records:
+            self.write(record)
+            written += 1
+        return written
+
+    def flush(self) -> None:
+        """Insère les résultats en attente dans une seule transaction."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        now = time()
+        with self._conn:
+            self._conn.execute("BEGIN")
+            for record, scan_id in pending:
+                metadata = dict(record)
+                body = metadata.pop("body", None)
+                url = metadata.get("url", "")
+                cursor = self._conn.execute(
+                    "INSERT INTO results (scan_id, host, url, attack, status, distance, created_at, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (scan_id, urlparse(url).netloc, url, metadata.get("attack"),
+                     metadata.get("status"), metadata.get("distance"), now,
+                     json.dumps(metadata, ensure_ascii=False))
+                )
+                if body is not None:
+                    self._conn.execute(
+                        "INSERT INTO bodies (result_id, body) VALUES (?, ?)",
+                        (cursor.lastrowid, body)
+                    )
+
+    def close(self) -> None:
+        """Écrit les résultats en attente et ferme la base."""
+        if self._closed:
+            return
+        self.flush()
+        self._conn.close()
+        self._closed = True
+
+    def query(
+        self,
+        host: Optional[str] = None,
+        url: Optional[str] = None,
+        attack: Optional[str] = None,
+        status: Any = None,
+        scan_id: Optional[str] = None,
+        with_bodies: bool = True,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Recherche des résultats ; les critères fournis sont combinés (ET).
+
+        Yields:
+            Les résultats dans l'ordre d'insertion, avec leur corps si `with_bodies`
+        """
+        self.flush()
+        criteria = {"host": host, "url": url, "attack": attack, "status": status, "scan_id": scan_id}
+        where = [f"r.{name} = ?" for name, value in criteria.items() if value is not None]
+        params: List[Any] = [value for value in criteria.values() if value is not None]
+        sql = "SELECT r.data" + (", b.body" if with_bodies else "") + " FROM results r"
+        if with_bodies:
+            sql += " LEFT JOIN bodies b ON b.result_id = r.id"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY r.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for row in self._conn.execute(sql, params):
+            record = json.loads(row[0])
+            if with_bodies and row[1] is not None:
+                record["body"] = row[1]
+            yield record
+
+    def scans(self) -> List[Dict[str, Any]]:
+        """Liste des scans enregistrés, du plus récent au plus ancien."""
+        rows = self._conn.execute(
+            "SELECT s.id, s.target, s.started_at, COUNT(r.id) FROM scans s "
+            "LEFT JOIN results r ON r.scan_id = s.id GROUP BY s.id ORDER BY s.started_at DESC"
+        ).fetchall()
+        return [
+            {"id": row[0], "target": row[1], "started_at": row[2], "results": row[3]}
+            for row in rows
+        ]
@@ -0,0 +1,231 @@
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+import aiohttp
+
+try:
+    import httpx  # type: ignore[import]
+except ImportError:  # Dépendance optionnelle (pip install "httpx[http2]")
+    httpx = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Taille des morceaux lus lors de la lecture en flux d'un corps de réponse
+BODY_CHUNK_SIZE = 64 * 1024
+
+class TransportError(Exception):
+    """Erreur de configuration ou d'utilisation d'un transport HTTP."""
+    pass
+
+class AiohttpTransport:
+    """
+    Transport HTTP/1.1 basé sur aiohttp : une connexion par requête simultanée,
+    réutilisées via le pool du `TCPConnector`.
+    """
+
+    name = "aiohttp"
+    network_errors: Tuple[Type[BaseException], ...] = (aiohttp.ClientError,)
+    timeout_errors: Tuple[Type[BaseException], ...] = ()
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: Optional[int] = 300,
+        timeout: Optional[Dict[str, float]] = None,
+        verify_ssl: bool = True
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = timeout or {}
+        self.verify_ssl = verify_ssl
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._session is not None
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        return self._session
+
+    async def open(self) -> None:
+        """Crée le connecteur et la session."""
+        if self._session is not None:
+            return
+        self._connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl
+        )
+        self._session = aiohttp.ClientSession(
+            connector=self._connector,
+            timeout=aiohttp.ClientTimeout(**self.timeout)
+        )
+
+    async def close(self) -> None:
+        """Ferme la session et libère toutes les connexions du pool."""
+        session, connector = self._session, self._connector
+        self._session = None
+        self._connector = None
+        if session is not None:
+            await session.close()
+        if connector is not None and not connector.closed:
+            await connector.close()
+
+    async def get(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        reader_factory: Callable[[Any], Any]
+    ) -> Tuple[int, Dict[str, str], Any]:
+        """
+        Envoie une requête GET et lit son corps en flux.
+
+        `reader_factory` reçoit les en-têtes de la réponse et retourne un lecteur
+        dont la méthode `feed(chunk)` retourne False pour interrompre la lecture.
+
+        Returns:
+            Le statut, les en-têtes et le lecteur alimenté
+        """
+        if self._session is None:
+            raise TransportError("Le transport aiohttp n'est pas ouvert")
+        response = await self._session.get(
+            url,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(**self.timeout),
+            ssl=self.verify_ssl
+        )
+        complete = False
+        try:
+            reader = reader_factory(response.headers)
+            async for chunk in response.content.iter_chunked(BODY_CHUNK_SIZE):
+                if not reader.feed(chunk):
+                    break
+            else:
+                complete = True
+        finally:
+            # Une réponse lue partiellement ou interrompue par une erreur ne peut
+            # pas retourner au pool
+            if complete:
+                response.release()
+            else:
+                response.close()
+        return response.status, dict(response.headers), reader
+
+class Http2Transport:
+    """
+    Transport HTTP/2 basé sur httpx : les requêtes simultanées vers un même hôte
+    sont multiplexées sur une seule connexion, dans la limite du nombre de flux
+    annoncé par le serveur.
+
+    Nécessite la dépendance optionnelle `httpx[http2]`. Les serveurs qui ne
+    négocient pas HTTP/2 (ALPN) sont servis en HTTP/1.1 si `http1` est vrai ;
+    avec `http1=False`, les URLs http:// utilisent HTTP/2 en clair (h2c).
+    """
+
+    name = "http2"
+
+    def __init__(
+        self,
+        limit: int = 100,
+        keepalive_timeout: float = 30.0,
+        timeout: Optional[Dict[str, float]] = None,
+        verify_ssl: bool = True,
+        http1: bool = True
+    ):
+        if httpx is None:
+            raise TransportError(
+                "Le transport HTTP/2 nécessite httpx : pip install \"httpx[http2]\""
+            )
+        self.limit = limit
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout or {}
+        self.verify_ssl = verify_ssl
+        self.http1 = http1
+        self.network_errors: Tuple[Type[BaseException], ...] = (httpx.TransportError,)
+        self.timeout_errors: Tuple[Type[BaseException], ...] = (httpx.TimeoutException,)
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None
+
+    @property
+    def session(self) -> Optional["httpx.AsyncClient"]:
+        return self._client
+
+    async def open(self) -> None:
+        """Crée le client HTTP/2."""
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            http1=self.http1,
+            http2=True,
+            verify=self.verify_ssl,
+            limits=httpx.Limits(
+                max_connections=self.limit,
+                keepalive_expiry=self.keepalive_timeout
+            ),
+            timeout=httpx.Timeout(
+                self.timeout.get("total"),
+                connect=self.timeout.get("connect"),
+                read=self.timeout.get("sock_read")
+            )
+        )
+
+    async def close(self) -> None:
+        """Ferme le client et ses connexions."""
+        client = self._client
+        self._client = None
+        if client is not None:
+            await client.aclose()
+
+    async def get(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        reader_factory: Callable[[Any], Any]
+    ) -> Tuple[int, Dict[str, str], Any]:
+        """Envoie une requête GET et lit son corps en flux (voir `AiohttpTransport.get`)."""
+        if self._client is None:
+            raise TransportError("Le transport HTTP/2 n'est pas ouvert")
+        async with self._client.stream("GET", url, headers=headers) as response:
+            reader = reader_factory(response.headers)
+            # Quitter le flux avant la fin réinitialise seulement ce flux HTTP/2 :
+            # la connexion reste disponible pour les autres requêtes
+            async for chunk in response.aiter_bytes(BODY_CHUNK_SIZE):
+                if not reader.feed(chunk):
+                    break
+            return response.status_code, dict(response.headers), reader
+
+TRANSPORTS = {
+    AiohttpTransport.name: AiohttpTransport,
+    Http2Transport.name: Http2Transport,
+}
+
+def create_transport(
+    name: str,
+    limit: int = 100,
+    limit_per_host: int = 10,
+    keepalive_timeout: float = 30.0,
+    dns_cache_ttl: Optional[int] = 300,
+    timeout: Optional[Dict[str, float]] = None,
+    verify_ssl: bool = True,
+    http1: bool = True
+) -> Any:
+    """Crée le transport `name` ("aiohttp" ou "http2")."""
+    if name == AiohttpTransport.name:
+        return AiohttpTransport(
+            limit, limit_per_host, keepalive_timeout, dns_cache_ttl, timeout, verify_ssl
+        )
+    if name == Http2Transport.name:
+        return Http2Transport(limit, keepalive_timeout, timeout, verify_ssl, http1)
+    raise TransportError(
+        f"Transport inconnu: {name} (disponibles : {', '.join(TRANSPORTS)})"
+    )
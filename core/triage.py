@@ -0,0 +1,106 @@
+import hashlib
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+from .classifier import ANOMALOUS, ANOMALY_THRESHOLD, entry_verdict
+from .config import config
+from .fingerprint import Fingerprint, compare
+from .rules import VULNERABLE, RuleSet
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal d'empreintes de référence conservées par hôte pour la nouveauté
+MAX_REPRESENTATIVES = 64
+
+class Triage:
+    """
+    Sélectionne les résultats à soumettre au LLM.
+
+    Un résultat est retenu, dans cet ordre :
+    - si son verdict de classification figure dans `verdicts` (VULNERABLE et
+      ANOMALOUS par défaut, avec `anomaly_threshold` comme seuil de distance) ;
+    - si son empreinte est nouvelle : sa distance à toutes les empreintes déjà
+      retenues pour le même hôte atteint `novelty_threshold` (None pour ignorer
+      ce critère) ;
+    - sinon, pour une proportion `sample_rate` des résultats, choisie par
+      hachage de l'URL et de l'attaque (même échantillon d'une exécution à
+      l'autre, ce qui profite au cache d'annotations).
+
+    Chaque résultat retenu est produit avec un champ `triage` (verdict et motif) ;
+    les compteurs par motif sont disponibles dans `stats`.
+    """
+
+    def __init__(
+        self,
+        verdicts: Iterable[str] = (VULNERABLE, ANOMALOUS),
+        anomaly_threshold: float = ANOMALY_THRESHOLD,
+        novelty_threshold: Optional[float] = 0.1,
+        sample_rate: float = 0.02,
+        rules: Optional[RuleSet] = None
+    ):
+        self.verdicts = frozenset(verdicts)
+        self.anomaly_threshold = anomaly_threshold
+        self.novelty_threshold = novelty_threshold
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+        self.rules = rules
+        self.stats = {"seen": 0, "verdict": 0, "novel": 0, "sample": 0, "skipped": 0}
+        self._representatives: Dict[str, List[Fingerprint]] = {}
+
+    @classmethod
+    def from_config(cls) -> "Triage":
+        """Crée une étape de tri à partir de la section `triage` de la configuration."""
+        triage_config = config.get("triage", {})
+        return cls(
+            verdicts=triage_config.get("verdicts", (VULNERABLE, ANOMALOUS)),
+            anomaly_threshold=triage_config.get("anomaly_threshold", ANOMALY_THRESHOLD),
+            novelty_threshold=triage_config.get("novelty_threshold", 0.1),
+            sample_rate=triage_config.get("sample_rate", 0.02)
+        )
+
+    def _is_novel(self, entry: Dict[str, Any]) -> bool:
+        """Indique si l'empreinte d'un résultat diffère de celles déjà retenues pour son hôte."""
+        threshold = self.novelty_threshold
+        if threshold is None:
+            return False
+        data = entry.get("fingerprint")
+        fingerprint = Fingerprint.from_dict(data) if data else Fingerprint.from_result(entry)
+        representatives = self._representatives.setdefault(urlsplit(entry.get("url") or "").netloc, [])
+        for known in representatives:
+            if compare(known, fingerprint)["score"] < threshold:
+                return False
+        if len(representatives) < MAX_REPRESENTATIVES:
+            representatives.append(fingerprint)
+        return True
+
+    def _sampled(self, entry: Dict[str, Any]) -> bool:
+        """Échantillonnage déterministe d'un résultat."""
+        if not self.sample_rate:
+            return False
+        material = f"{entry.get('url', '')}\0{entry.get('attack', '')}".encode("utf-8")
+        value = int.from_bytes(hashlib.blake2b(material, digest_size=8).digest(), "big")
+        return value / 2 ** 64 < self.sample_rate
+
+    def reason(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Motif de sélection d'un résultat (None s'il est écarté)."""
+        verdict, _ = entry_verdict(entry, self.rules, self.anomaly_threshold)
+        if verdict in self.verdicts:
+            reason = "verdict"
+        elif self.novelty_threshold is not None and self._is_novel(entry):
+            reason = "novel"
+        elif self._sampled(entry):
+            reason = "sample"
+        else:
+            return None
+        return {"verdict": verdict, "reason": reason}
+
+    def select(self, entries: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Produit en flux les résultats retenus, complétés du champ `triage`."""
+        for entry in entries:
+            self.stats["seen"] += 1
+            triage = self.reason(entry)
+            if triage is None:
+                self.stats["skipped"] += 1
+                continue
+            self.stats[triage["reason"]] += 1
+            yield {**entry, "triage": triage}
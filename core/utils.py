@@ -1,5 +1,6 @@
 import yaml
 from core import analyzer, classifier
+from core.config import config
 import asyncio
 
 async def run_script_yaml(path):
@@ -12,6 +13,6 @@ async def run_script_yaml(path):
         if step == "analyze":
             await analyzer.run(url)
         elif step == "classify":
-            classifier.run("dna_results.json")
+            classifier.run(config.get("results", {}).get("path", "dna_results.jsonl.gz"))
         else:
             print(f"[!] Étape inconnue : {step}")
\ No newline at end of file
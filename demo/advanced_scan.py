@@ -7,7 +7,7 @@ Utilise des configurations personnalisées et des en-têtes HTTP.
 import asyncio
 import json
 from pathlib import Path
-from core.analyzer import run, print_results, RateLimiter
+from core.analyzer import run, print_results, RateLimiter, ScanContext
 from core.config import config
 
 async def main():
@@ -47,27 +47,29 @@ async def main():
     
     try:
         results = []
-        for url in urls:
-            print(f"\n[*] Analyse de {url}")
+        async with ScanContext() as context:
+            for url in urls:
+                print(f"\n[*] Analyse de {url}")
             
-            # Acquisition du rate limiter
-            await rate_limiter.acquire()
+                # Acquisition du rate limiter
+                await rate_limiter.acquire()
             
-            try:
-                # Exécution de l'analyse
-                result = await run(
-                    url,
-                    custom_headers=custom_headers,
-                    is_async=True,
-                    use_cache=True
-                )
-                results.append(result)
+                try:
+                    # Exécution de l'analyse
+                    result = await run(
+                        url,
+                        custom_headers=custom_headers,
+                        is_async=True,
+                        use_cache=True,
+                        context=context
+                    )
+                    results.append(result)
                 
-                # Affichage des résultats
-                print_results(result)
+                    # Affichage des résultats
+                    print_results(result)
                 
-            finally:
-                rate_limiter.release()
+                finally:
+                    rate_limiter.release()
         
         # Sauvegarde des résultats
         output_dir = Path("demo/results")
@@ -6,47 +6,20 @@ Exemple d'analyse en lot de plusieurs URLs avec DNARecon.
 import asyncio
 import json
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import List, Dict
 from datetime import datetime
-from core.analyzer import run, print_results
+from core.analyzer import print_results, scan_many, ScanContext
 from core.config import config
 
-async def analyze_url(url: str, custom_headers: Optional[dict] = None) -> dict:
-    """Analyse une URL et retourne les résultats."""
-    print(f"\n[*] Analyse de {url}")
-    start_time = datetime.now()
-    
-    try:
-        results = await run(
-            url,
-            custom_headers=custom_headers,
-            is_async=True,
-            use_cache=True
-        )
-        
-        # Ajout des métadonnées
-        results["metadata"] = {
-            "url": url,
-            "analysis_time": datetime.now().isoformat(),
-            "duration_ms": (datetime.now() - start_time).total_seconds() * 1000,
-            "success": True
-        }
-        
-        print_results(results)
-        return results
-        
-    except Exception as e:
-        error_result = {
-            "url": url,
-            "error": str(e),
-            "metadata": {
-                "analysis_time": datetime.now().isoformat(),
-                "duration_ms": (datetime.now() - start_time).total_seconds() * 1000,
-                "success": False
-            }
-        }
-        print(f"[!] Erreur lors de l'analyse de {url}: {str(e)}")
-        return error_result
+def add_metadata(result: dict) -> dict:
+    """Ajoute les métadonnées d'analyse à un résultat de scan_many."""
+    result["metadata"] = {
+        "url": result["url"],
+        "analysis_time": datetime.now().isoformat(),
+        "duration_ms": result.pop("duration_ms", 0),
+        "success": "error" not in result
+    }
+    return result
 
 def print_summary(results: List[Dict]) -> None:
     """Affiche un résumé des résultats de l'analyse."""
@@ -99,9 +72,24 @@ async def main():
     
     start_time = datetime.now()
     
-    # Analyse concurrente des URLs
-    tasks = [analyze_url(url, custom_headers) for url in urls]
-    results = await asyncio.gather(*tasks)
+    # Analyse concurrente et bornée des URLs, avec une session et un pool de
+    # connexions partagés ; les résultats arrivent au fil de l'eau
+    results = []
+    async with ScanContext() as context:
+        async for result in scan_many(
+            urls,
+            concurrency=3,
+            custom_headers=custom_headers,
+            use_cache=True,
+            context=context
+        ):
+            result = add_metadata(result)
+            if result["metadata"]["success"]:
+                print(f"\n[*] Analyse de {result['url']}")
+                print_results(result)
+            else:
+                print(f"[!] Erreur lors de l'analyse de {result['url']}: {result['error']}")
+            results.append(result)
     
     # Calcul de la durée totale
     total_duration = (datetime.now() - start_time).total_seconds()
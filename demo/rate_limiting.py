@@ -6,7 +6,8 @@ Exemple d'utilisation du rate limiting avec DNARecon.
 import asyncio
 import json
 from pathlib import Path
-from core.analyzer import run, print_results, RateLimiter
+from urllib.parse import urlparse
+from core.analyzer import run, print_results, RateLimiter, ScanContext
 from core.config import config
 
 async def main():
@@ -14,7 +15,8 @@ async def main():
     config.update({
         "timeout": 10,
         "rate_limit": {
-            "requests_per_second": 2
+            "requests_per_second": 2,
+            "burst": 2
         }
     })
     
@@ -32,40 +34,40 @@ async def main():
         "Accept": "text/html"
     }
     
-    # Initialisation du rate limiter
-    rate_limiter = RateLimiter(
-        max_requests=config["rate_limit"]["requests_per_second"],
-        time_window=1.0
-    )
+    # Initialisation du rate limiter (un seau à jetons par hôte)
+    rate_limiter = RateLimiter.from_config()
     
     print("[*] Démarrage de l'analyse avec rate limiting")
-    print(f"[*] Limite : {config['rate_limit']['requests_per_second']} requêtes par seconde")
+    print(f"[*] Limite : {config['rate_limit']['requests_per_second']} requêtes par seconde et par hôte")
     
     try:
         results = []
-        for i, url in enumerate(urls, 1):
-            print(f"\n[*] Requête {i}/{len(urls)} : {url}")
+        async with ScanContext() as context:
+            for i, url in enumerate(urls, 1):
+                print(f"\n[*] Requête {i}/{len(urls)} : {url}")
             
-            # Acquisition du rate limiter
-            await rate_limiter.acquire()
-            print("[+] Rate limiter acquis")
+                # Acquisition du rate limiter
+                host = urlparse(url).netloc
+                await rate_limiter.acquire(host)
+                print("[+] Rate limiter acquis")
             
-            try:
-                # Exécution de l'analyse
-                result = await run(
-                    url,
-                    custom_headers=custom_headers,
-                    is_async=True,
-                    use_cache=True
-                )
-                results.append(result)
+                try:
+                    # Exécution de l'analyse
+                    result = await run(
+                        url,
+                        custom_headers=custom_headers,
+                        is_async=True,
+                        use_cache=True,
+                        context=context
+                    )
+                    results.append(result)
                 
-                # Affichage des résultats
-                print_results(result)
+                    # Affichage des résultats
+                    print_results(result)
                 
-            finally:
-                rate_limiter.release()
-                print("[+] Rate limiter libéré")
+                finally:
+                    rate_limiter.release(host)
+                    print("[+] Rate limiter libéré")
         
         # Sauvegarde des résultats
         output_dir = Path("demo/results")
@@ -2,9 +2,21 @@
 
 import argparse
 import asyncio
-from core import analyzer, classifier, llm
+import json
+import sys
+from typing import Any, Dict, Iterable
+from core import analyzer, classifier, llm, llm_stub
+from core.providers import PROVIDERS, create_provider
+from core.store import ResultStore
 from core.utils import run_script_yaml
 
+def _memory_cache_warning(consequence: str) -> bool:
+    """Signale (sur stderr) un cache en mémoire, propre au processus de la commande."""
+    if not isinstance(analyzer.response_cache, analyzer.ResponseCache):
+        return False
+    print(f"[!] Cache en mémoire : {consequence} (cache.backend: disk pour le conserver)", file=sys.stderr)
+    return True
+
 async def main():
     parser = argparse.ArgumentParser(description="Reconnaissance comportementale (DNARecon)")
     subparsers = parser.add_subparsers(dest="command", help="Commandes disponibles")
@@ -13,13 +25,58 @@ async def main():
     analyze_parser = subparsers.add_parser("analyze", help="Analyse une URL")
     analyze_parser.add_argument("url", help="URL à analyser")
 
+    # Commande scan
+    scan_parser = subparsers.add_parser("scan", help="Analyse une liste d'URLs en flux")
+    scan_parser.add_argument("input", nargs="?", default="-", help="Fichier de cibles, une URL par ligne ('-' pour stdin)")
+    scan_parser.add_argument("-o", "--output", default="-", help="Fichier de sortie JSONL ('-' pour stdout)")
+    scan_parser.add_argument("-c", "--concurrency", type=int, default=None, help="Nombre maximal d'analyses simultanées")
+    scan_parser.add_argument("--resume", action="store_true", help="Reprend un scan interrompu (ajoute à la sortie existante)")
+    scan_parser.add_argument("--transport", choices=["aiohttp", "http2"], default=None, help="Transport HTTP (http2 nécessite httpx[http2])")
+
+    # Commande cache
+    cache_parser = subparsers.add_parser("cache", help="Gestion du cache de réponses")
+    cache_subparsers = cache_parser.add_subparsers(dest="cache_command", help="Actions sur le cache")
+    cache_subparsers.add_parser("stats", help="Affiche les statistiques du cache")
+    warm_parser = cache_subparsers.add_parser("warm", help="Précharge le cache avec une liste de cibles")
+    warm_parser.add_argument("input", nargs="?", default="-", help="Fichier de cibles, une URL par ligne ('-' pour stdin)")
+    warm_parser.add_argument("-c", "--concurrency", type=int, default=None, help="Nombre maximal de requêtes simultanées")
+    cache_subparsers.add_parser("clear", help="Vide le cache")
+
     # Commande classify
     classify_parser = subparsers.add_parser("classify", help="Classe les résultats")
-    classify_parser.add_argument("file", help="Fichier de résultats à classifier")
+    classify_parser.add_argument("file", help="Fichier de résultats à classifier (JSON ou JSONL, '-' pour stdin)")
+    classify_parser.add_argument("-o", "--output", default=None, help="Fichier de verdicts JSONL ('-' pour stdout)")
+    classify_parser.add_argument("-w", "--workers", type=int, default=None, help="Nombre de processus de classification (0 pour un par cœur)")
 
     # Commande llm-tag
     llm_parser = subparsers.add_parser("llm-tag", help="Analyse avec LLM")
     llm_parser.add_argument("file", help="Fichier à analyser")
+    llm_parser.add_argument("-o", "--output", default=None, help="Fichier d'annotations JSONL ('-' pour stdout)")
+    llm_parser.add_argument("-c", "--concurrency", type=int, default=None, help="Nombre maximal d'appels simultanés à l'API LLM")
+    llm_parser.add_argument("--no-cache", action="store_true", help="N'utilise pas le cache d'annotations")
+    llm_parser.add_argument("--provider", choices=sorted(PROVIDERS), default=None, help="Fournisseur LLM (local : serveur compatible OpenAI)")
+    llm_parser.add_argument("--base-url", default=None, help="URL de base de l'API (ex. http://127.0.0.1:8080/v1)")
+    llm_parser.add_argument("--model", default=None, help="Modèle à utiliser")
+    llm_parser.add_argument("--all", action="store_true", help="Annote tous les résultats, sans tri préalable")
+
+    # Commande llm-stub
+    stub_parser = subparsers.add_parser("llm-stub", help="Serveur LLM local de test (API OpenAI)")
+    stub_parser.add_argument("--host", default="127.0.0.1", help="Adresse d'écoute")
+    stub_parser.add_argument("--port", type=int, default=8080, help="Port d'écoute")
+    stub_parser.add_argument("--latency", type=float, default=0.0, help="Délai de chaque réponse (secondes)")
+    stub_parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="Proportion de réponses 429")
+
+    # Commande query
+    query_parser = subparsers.add_parser("query", help="Recherche dans une base de résultats SQLite")
+    query_parser.add_argument("store", help="Base de résultats (.sqlite, .db)")
+    query_parser.add_argument("--host", default=None, help="Hôte (ex. example.com:8443)")
+    query_parser.add_argument("--url", default=None, help="URL exacte")
+    query_parser.add_argument("--attack", default=None, help="Nom de l'attaque")
+    query_parser.add_argument("--status", default=None, help="Statut HTTP (ou ERROR)")
+    query_parser.add_argument("--scan", default=None, help="Identifiant de scan")
+    query_parser.add_argument("--limit", type=int, default=None, help="Nombre maximal de résultats")
+    query_parser.add_argument("--no-bodies", action="store_true", help="N'affiche pas les corps de réponse")
+    query_parser.add_argument("--scans", action="store_true", help="Liste les scans enregistrés")
 
     # Commande run
     run_parser = subparsers.add_parser("run", help="Exécute un scénario YAML")
@@ -29,10 +86,52 @@ async def main():
 
     if args.command == "analyze":
         await analyzer.run(args.url, is_async=True)
+    elif args.command == "scan":
+        await analyzer.scan_file(
+            args.input, args.output, concurrency=args.concurrency, transport=args.transport,
+            resume=args.resume
+        )
+    elif args.command == "cache":
+        if args.cache_command == "stats":
+            _memory_cache_warning("les statistiques ne portent que sur ce processus")
+            print(json.dumps(await analyzer.response_cache.stats(), indent=2))
+        elif args.cache_command == "warm":
+            _memory_cache_warning("il sera perdu à la fin du processus")
+            counts = await analyzer.warm_cache_file(args.input, concurrency=args.concurrency)
+            print(f"[+] {counts['warmed']} réponses mises en cache, {counts['failed']} échecs")
+        elif args.cache_command == "clear":
+            if not _memory_cache_warning("aucun cache persistant à vider"):
+                await analyzer.response_cache.clear()
+                print("[+] Cache vidé")
+        else:
+            cache_parser.print_help()
     elif args.command == "classify":
-        classifier.run(args.file)
+        classifier.run(args.file, output=args.output, workers=args.workers)
     elif args.command == "llm-tag":
-        llm.run(args.file)
+        provider = None
+        if args.provider or args.base_url or args.model:
+            provider = create_provider(args.provider, base_url=args.base_url, model=args.model)
+        await llm.run_async(
+            args.file, output=args.output, concurrency=args.concurrency, use_cache=not args.no_cache,
+            provider=provider, triage=False if args.all else None
+        )
+    elif args.command == "llm-stub":
+        await llm_stub.serve(
+            args.host, args.port, latency=args.latency, rate_limit_ratio=args.rate_limit_ratio
+        )
+    elif args.command == "query":
+        with ResultStore(args.store) as store:
+            records: Iterable[Dict[str, Any]]
+            if args.scans:
+                records = store.scans()
+            else:
+                status = int(args.status) if args.status and args.status.isdigit() else args.status
+                records = store.query(
+                    host=args.host, url=args.url, attack=args.attack, status=status,
+                    scan_id=args.scan, with_bodies=not args.no_bodies, limit=args.limit
+                )
+            for record in records:
+                print(json.dumps(record, ensure_ascii=False))
     elif args.command == "run":
         await run_script_yaml(args.file)
     else:
@@ -35,6 +35,12 @@ setup(
         "aiohttp>=3.9.1",
     ],
     extras_require={
+        "http2": [
+            "httpx[http2]>=0.24.0",
+        ],
+        "zstd": [
+            "zstandard>=0.21.0",
+        ],
         "dev": [
             "pytest>=7.4.3",
             "pytest-cov>=4.1.0",
@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import patch, MagicMock, AsyncMock, call
 from typing import Dict, Any, Awaitable, cast, TypeVar, Union
 from core.analyzer import (
-    run, validate_url, RateLimiter, ResponseCache,
+    run, validate_url, RateLimiter, ResponseCache, ScanContext, RetryPolicy,
     DEFAULT_SECURITY_HEADERS, TIMEOUT_CONFIG,
     DNAReconError, ValidationError, RequestError, TimeoutError
 )
@@ -17,12 +17,25 @@ import core.analyzer
 T = TypeVar('T')
 AsyncResult = Awaitable[Dict[str, Any]]
 
+class MockStream:
+    def __init__(self, content: bytes):
+        self._content = content
+        self.chunks_read = 0
+
+    async def iter_chunked(self, size: int):
+        for i in range(0, len(self._content), size):
+            self.chunks_read += 1
+            yield self._content[i:i + size]
+
 class MockResponse:
     def __init__(self, status: int, headers: Dict[str, str], text: str):
         self.status = status
         self.headers = headers
         self._text = text
         self._content = text.encode('utf-8')
+        self.content = MockStream(self._content)
+        self.released = False
+        self.closed = False
 
     async def text(self):
         return self._text
@@ -30,6 +43,12 @@ class MockResponse:
     async def read(self):
         return self._content
 
+    def release(self):
+        self.released = True
+
+    def close(self):
+        self.closed = True
+
     def __ge__(self, other):
         return self.status >= other
 
@@ -52,12 +71,13 @@ def mock_response() -> MagicMock:
     return mock
 
 @pytest.fixture
-def mock_async_response() -> AsyncMock:
+def mock_async_response() -> MockResponse:
     """Fixture pour simuler une réponse HTTP asynchrone."""
-    mock = AsyncMock()
-    mock.status = 200
-    mock.headers = {"Content-Type": "text/html"}
-    mock.text = AsyncMock(return_value="<html><body>Test</body></html>")
+    mock = MockResponse(
+        status=200,
+        headers={"Content-Type": "text/html"},
+        text="<html><body>Test</body></html>"
+    )
     return mock
 
 @pytest.fixture
@@ -87,10 +107,11 @@ def test_url_validation() -> None:
 @pytest.mark.asyncio
 async def test_analyzer_basic_functionality() -> None:
     """Test de la fonctionnalité de base de l'analyseur."""
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.headers = {"Content-Type": "text/html"}
-    mock_response.text = AsyncMock(return_value="<html><body>Test</body></html>")
+    mock_response = MockResponse(
+        status=200,
+        headers={"Content-Type": "text/html"},
+        text="<html><body>Test</body></html>"
+    )
 
     mock_session = AsyncMock()
     mock_session.get = AsyncMock(return_value=mock_response)
@@ -114,10 +135,11 @@ async def test_analyzer_error_handling() -> None:
 async def test_analyzer_with_config() -> None:
     """Test avec une configuration personnalisée."""
     config.set("timeout", 10)
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.headers = {"Content-Type": "text/html"}
-    mock_response.text = AsyncMock(return_value="<html><body>Test</body></html>")
+    mock_response = MockResponse(
+        status=200,
+        headers={"Content-Type": "text/html"},
+        text="<html><body>Test</body></html>"
+    )
 
     mock_session = AsyncMock()
     mock_session.get = AsyncMock(return_value=mock_response)
@@ -133,10 +155,11 @@ async def test_analyzer_with_config() -> None:
 async def test_analyzer_with_custom_headers() -> None:
     """Test avec des headers personnalisés."""
     custom_headers = {"X-Custom": "test"}
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.headers = {"Content-Type": "text/html"}
-    mock_response.text = AsyncMock(return_value="<html><body>Test</body></html>")
+    mock_response = MockResponse(
+        status=200,
+        headers={"Content-Type": "text/html"},
+        text="<html><body>Test</body></html>"
+    )
 
     mock_session = AsyncMock()
     mock_session.get = AsyncMock(return_value=mock_response)
@@ -151,10 +174,11 @@ async def test_analyzer_with_custom_headers() -> None:
 @pytest.mark.asyncio
 async def test_analyzer_async():
     """Test de l'analyseur en mode asynchrone."""
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.headers = {"Content-Type": "text/html"}
-    mock_response.text = AsyncMock(return_value="<html><body>Test</body></html>")
+    mock_response = MockResponse(
+        status=200,
+        headers={"Content-Type": "text/html"},
+        text="<html><body>Test</body></html>"
+    )
 
     mock_session = AsyncMock()
     mock_session.get = AsyncMock(return_value=mock_response)
@@ -256,10 +280,11 @@ async def test_url_validation_enhanced():
 @pytest.mark.asyncio
 async def test_async_request_with_cache():
     """Test des requêtes asynchrones avec cache."""
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.headers = {"Content-Type": "text/html"}
-    mock_response.text = AsyncMock(return_value="<html><body>Test</body></html>")
+    mock_response = MockResponse(
+        status=200,
+        headers={"Content-Type": "text/html"},
+        text="<html><body>Test</body></html>"
+    )
 
     mock_session = AsyncMock()
     mock_session.get = AsyncMock(return_value=mock_response)
@@ -290,17 +315,20 @@ async def test_async_request_error_handling():
     mock_session.__aexit__.return_value = None
 
     with patch('core.analyzer.aiohttp.ClientSession', return_value=mock_session):
-        with pytest.raises(RequestError) as exc_info:
-            await run("https://example.com/not-found", use_cache=False)
-        assert "Erreur HTTP 404" in str(exc_info.value)
+        # Une erreur 4xx est déterministe : retournée comme résultat, sans retry
+        result = await run("https://example.com/not-found", use_cache=False)
+        assert result["status_code"] == 404
+        assert result["body"] == "Not Found"
+        mock_session.get.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_security_headers() -> None:
     """Test des headers de sécurité."""
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.headers = {"Content-Type": "text/html"}
-    mock_response.text = AsyncMock(return_value="<html><body>Test</body></html>")
+    mock_response = MockResponse(
+        status=200,
+        headers={"Content-Type": "text/html"},
+        text="<html><body>Test</body></html>"
+    )
 
     mock_session = AsyncMock()
     mock_session.get = AsyncMock(return_value=mock_response)
@@ -315,10 +343,11 @@ async def test_security_headers() -> None:
 @pytest.mark.asyncio
 async def test_timeout_config():
     """Test de la configuration des timeouts en mode asynchrone."""
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.headers = {"Content-Type": "text/html"}
-    mock_response.text = AsyncMock(return_value="<html><body>Test</body></html>")
+    mock_response = MockResponse(
+        status=200,
+        headers={"Content-Type": "text/html"},
+        text="<html><body>Test</body></html>"
+    )
 
     mock_session = AsyncMock()
     mock_session.get = AsyncMock(return_value=mock_response)
@@ -380,8 +409,8 @@ async def test_analyzer_retry_mechanism():
     mock_session.__aexit__.return_value = None
 
     with patch('core.analyzer.aiohttp.ClientSession', return_value=mock_session):
-        with patch('core.analyzer.RETRY_COUNT', 2):
-            with patch('core.analyzer.RETRY_DELAY', 0):
+        with patch('core.retry.RETRY_COUNT', 2):
+            with patch('core.retry.RETRY_DELAY', 0):
                 result = await run("https://example.com", use_cache=False)
                 assert result["status_code"] == 200
                 assert result["body"] == "<html>Success</html>"
@@ -403,4 +432,835 @@ async def test_response_cache_utilities(response_cache: ResponseCache) -> None:
     
     # Test de nettoyage du cache
     await response_cache.clear()
-    assert await response_cache.size() == 0 
\ No newline at end of file
+    assert await response_cache.size() == 0
+
+
+@pytest.mark.asyncio
+async def test_scan_context_reuses_session():
+    """Test de la réutilisation d'une session unique par le contexte de scan."""
+    mock_response = MockResponse(
+        status=200,
+        headers={"Content-Type": "text/html"},
+        text="<html>Pool</html>"
+    )
+
+    mock_session = AsyncMock()
+    mock_session.get.return_value = mock_response
+
+    with patch('core.analyzer.aiohttp.ClientSession', return_value=mock_session) as session_cls:
+        async with ScanContext(limit=20, limit_per_host=4) as context:
+            for path in ("a", "b", "c"):
+                result = await run(f"https://example.com/{path}", use_cache=False, context=context)
+                assert result["status_code"] == 200
+            mock_session.close.assert_not_called()
+
+        session_cls.assert_called_once()
+        connector = session_cls.call_args.kwargs["connector"]
+        assert connector.limit == 20
+        assert connector.limit_per_host == 4
+        assert mock_session.get.call_count == 3
+        mock_session.close.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_scan_context_not_opened():
+    """Test de l'accès à la session d'un contexte fermé."""
+    context = ScanContext()
+    with pytest.raises(DNAReconError):
+        context.session
+
+@pytest.mark.asyncio
+async def test_process_attacks_concurrent_order():
+    """Test de l'envoi concurrent des mutations avec un ordre de résultats stable."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_request(url, custom_headers=None, use_cache=True, context=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Les premières mutations terminent en dernier
+        await asyncio.sleep(0.05 if "input" in url else 0.01)
+        in_flight -= 1
+        return {"status_code": 200, "headers": {}, "body": url}
+
+    limiter = RateLimiter(max_requests=100, time_window=1.0)
+    expected = [url for _, url in core.analyzer._build_attack_plan("https://example.com/")]
+
+    with patch('core.analyzer._async_request', side_effect=fake_request):
+        context = ScanContext()
+        results = await core.analyzer.process_attacks_async(
+            "https://example.com/", limiter, context=context, concurrency=4
+        )
+
+    assert [r["url"] for r in results] == expected
+    assert [r["body"] for r in results] == expected
+    assert max_in_flight > 1
+
+@pytest.mark.asyncio
+async def test_process_attacks_concurrency_bound():
+    """Test du respect de la limite de concurrence."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_request(url, custom_headers=None, use_cache=True, context=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"status_code": 200, "headers": {}, "body": ""}
+
+    limiter = RateLimiter(max_requests=100, time_window=1.0)
+    with patch('core.analyzer._async_request', side_effect=fake_request):
+        results = await core.analyzer.process_attacks_async(
+            "https://example.com/", limiter, context=ScanContext(), concurrency=1
+        )
+
+    assert len(results) == 4
+    assert max_in_flight == 1
+
+@pytest.mark.asyncio
+async def test_rate_limiter_burst() -> None:
+    """Test de la capacité de rafale du seau à jetons."""
+    limiter = RateLimiter(max_requests=2, time_window=1.0, burst=5)
+
+    start_time = time()
+    for _ in range(5):
+        await limiter.acquire("a.example")
+    assert time() - start_time < 0.1
+
+    # Le jeton suivant n'est disponible qu'après 1 / 2 s
+    assert limiter.reserve("a.example") == pytest.approx(0.5, abs=0.05)
+
+@pytest.mark.asyncio
+async def test_rate_limiter_per_host_isolation() -> None:
+    """Test qu'un hôte limité ne bloque pas les autres hôtes."""
+    limiter = RateLimiter(max_requests=1, time_window=1.0, burst=1)
+    await limiter.acquire("slow.example")
+
+    throttled = asyncio.ensure_future(limiter.acquire("slow.example"))
+    start_time = time()
+    await limiter.acquire("other.example")
+    assert time() - start_time < 0.1
+    assert not throttled.done()
+    throttled.cancel()
+
+def test_rate_limiter_refill_and_prune() -> None:
+    """Test du rechargement continu et de la purge des seaux inactifs."""
+    limiter = RateLimiter(max_requests=10, time_window=1.0, burst=1)
+    with patch('core.analyzer.monotonic', return_value=100.0):
+        assert limiter.reserve("h1") == 0.0
+        assert limiter.reserve("h1") == pytest.approx(0.1)
+    with patch('core.analyzer.monotonic', return_value=100.5):
+        # 0,5 s de recharge rembourse la dette et remplit le seau
+        assert limiter.reserve("h1") == 0.0
+        limiter._prune(200.0)
+    assert "h1" not in limiter._buckets
+
+def test_rate_limiter_from_config() -> None:
+    """Test de la prise en compte de rate_limit.burst."""
+    with patch.dict(config.config, {"rate_limit": {"requests_per_second": 3, "burst": 7}}):
+        limiter = RateLimiter.from_config()
+    assert limiter.rate == 3
+    assert limiter.capacity == 7
+
+@pytest.mark.asyncio
+async def test_streaming_body_truncated():
+    """Test de l'arrêt de la lecture au-delà de max_body_bytes."""
+    import hashlib
+    body = "A" * 200_000
+    mock_response = MockResponse(
+        status=200,
+        headers={"Content-Type": "text/html; charset=utf-8"},
+        text=body
+    )
+
+    mock_session = AsyncMock()
+    mock_session.get.return_value = mock_response
+
+    with patch.dict(config.config, {"max_body_bytes": 1000}):
+        with patch('core.analyzer.aiohttp.ClientSession', return_value=mock_session):
+            result = await run("https://example.com/big", use_cache=False)
+
+    assert result["truncated"] is True
+    assert result["body_bytes"] == 1000
+    assert result["body"] == "A" * 1000
+    assert result["content_hash"] == hashlib.sha256(b"A" * 1000).hexdigest()
+    # La lecture s'arrête au premier morceau et la connexion n'est pas réutilisée
+    assert mock_response.content.chunks_read == 1
+    assert mock_response.closed and not mock_response.released
+
+@pytest.mark.asyncio
+async def test_streaming_body_complete():
+    """Test d'une réponse lue entièrement sous la limite."""
+    import hashlib
+    mock_response = MockResponse(
+        status=200,
+        headers={"Content-Type": "text/plain; charset=latin-1"},
+        text="café"
+    )
+    mock_response.content = MockStream("café".encode("latin-1"))
+
+    mock_session = AsyncMock()
+    mock_session.get.return_value = mock_response
+
+    with patch('core.analyzer.aiohttp.ClientSession', return_value=mock_session):
+        result = await run("https://example.com/small", use_cache=False)
+
+    assert result["truncated"] is False
+    assert result["body"] == "café"
+    assert result["body_bytes"] == 4
+    assert result["content_hash"] == hashlib.sha256("café".encode("latin-1")).hexdigest()
+    assert mock_response.released and not mock_response.closed
+
+@pytest.mark.asyncio
+async def test_streaming_body_error_closes_response():
+    """Test de la libération d'une réponse dont la lecture échoue en cours de flux."""
+    class FailingStream(MockStream):
+        async def iter_chunked(self, size: int):
+            yield self._content[:size]
+            raise aiohttp.ClientPayloadError("connexion interrompue")
+
+    mock_response = MockResponse(status=200, headers={"Content-Type": "text/html"}, text="A" * 100)
+    mock_response.content = FailingStream(b"A" * 100)
+
+    mock_session = AsyncMock()
+    mock_session.get.return_value = mock_response
+
+    with patch('core.analyzer.aiohttp.ClientSession', return_value=mock_session):
+        with pytest.raises(RequestError):
+            await run("https://example.com/broken", use_cache=False)
+
+    assert mock_response.closed and not mock_response.released
+
+def test_sync_request_streaming_cap():
+    """Test de la lecture en flux plafonnée en mode synchrone."""
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {"Content-Type": "text/html"}
+    response.iter_content.return_value = iter([b"x" * 600, b"y" * 600, b"z" * 600])
+    response.__enter__.return_value = response
+
+    with patch.dict(config.config, {"max_body_bytes": 1000}):
+        with patch('core.analyzer.requests.get', return_value=response) as mock_get:
+            result = core.analyzer._sync_request("https://example.com/big")
+
+    assert mock_get.call_args.kwargs["stream"] is True
+    assert result["truncated"] is True
+    assert result["body"] == "x" * 600 + "y" * 400
+    response.__exit__.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_scan_many_bounded_streaming():
+    """Test de scan_many : concurrence bornée, lecture paresseuse et erreurs en résultat."""
+    in_flight = 0
+    max_in_flight = 0
+    consumed = []
+
+    async def fake_request(url, custom_headers=None, use_cache=True, context=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if url.endswith("/3"):
+            raise RequestError("boom")
+        return {"status_code": 200, "headers": {}, "body": url}
+
+    async def targets():
+        for i in range(10):
+            consumed.append(i)
+            yield f"https://host{i}.example/{i}"
+
+    limiter = RateLimiter(max_requests=100, time_window=1.0)
+    with patch('core.analyzer._async_request', side_effect=fake_request):
+        stream = core.analyzer.scan_many(
+            targets(), concurrency=3, context=ScanContext(), rate_limiter=limiter
+        )
+        first = await stream.__anext__()
+        # Seules les cibles nécessaires pour remplir les places libres ont été lues
+        assert len(consumed) <= 4
+        results = [first] + [result async for result in stream]
+
+    assert max_in_flight <= 3
+    assert sorted(r["url"] for r in results) == sorted(f"https://host{i}.example/{i}" for i in range(10))
+    errors = [r for r in results if "error" in r]
+    assert [r["url"] for r in errors] == ["https://host3.example/3"]
+
+@pytest.mark.asyncio
+async def test_scan_file_writes_jsonl(tmp_path):
+    """Test de scan_file : une ligne JSON par cible, commentaires ignorés."""
+    import json
+    input_file = tmp_path / "targets.txt"
+    input_file.write_text("# cibles\nhttps://a.example\n\nhttps://b.example\n")
+    output_file = tmp_path / "out.jsonl"
+
+    async def fake_request(url, custom_headers=None, use_cache=True, context=None):
+        return {"status_code": 200, "headers": {}, "body": "ok"}
+
+    with patch('core.analyzer._async_request', side_effect=fake_request):
+        with patch('core.analyzer.aiohttp.ClientSession', return_value=AsyncMock()):
+            count = await core.analyzer.scan_file(str(input_file), str(output_file), concurrency=2)
+
+    lines = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert count == 2
+    assert sorted(line["url"] for line in lines) == ["https://a.example", "https://b.example"]
+
+@pytest.mark.asyncio
+async def test_scan_file_resume(tmp_path):
+    """Test de la reprise de scan_file : seules les cibles non traitées sont analysées."""
+    import json
+    from core.checkpoint import Checkpoint
+    input_file = tmp_path / "targets.txt"
+    input_file.write_text("".join(f"https://host{i}.example\n" for i in range(5)))
+    output_file = tmp_path / "out.jsonl"
+    output_file.write_text(json.dumps({"url": "https://host0.example"}) + "\n")
+    checkpoint = Checkpoint(f"{output_file}.checkpoint", core.analyzer._scan_plan_id(str(input_file)))
+    checkpoint.mark_done(0)
+    checkpoint.mark_done(2)
+    checkpoint.save()
+    requested = []
+
+    async def fake_request(url, custom_headers=None, use_cache=True, context=None):
+        requested.append(url)
+        return {"status_code": 200, "headers": {}, "body": "ok"}
+
+    with patch('core.analyzer._async_request', side_effect=fake_request):
+        with patch('core.analyzer.aiohttp.ClientSession', return_value=AsyncMock()):
+            count = await core.analyzer.scan_file(
+                str(input_file), str(output_file), concurrency=2, resume=True
+            )
+
+    assert count == 3
+    assert sorted(requested) == ["https://host1.example", "https://host3.example", "https://host4.example"]
+    assert len(output_file.read_text().splitlines()) == 4
+    plan_id = core.analyzer._scan_plan_id(str(input_file))
+    assert Checkpoint.open(f"{output_file}.checkpoint", plan_id, resume=True).completed
+
+    with pytest.raises(core.analyzer.DNAReconError):
+        await core.analyzer.scan_file("-", "-", resume=True)
+
+@pytest.mark.asyncio
+async def test_scan_file_resume_without_checkpoint(tmp_path):
+    """Test de --resume sans point de reprise : la sortie est réécrite, sans doublons."""
+    import json
+    input_file = tmp_path / "targets.txt"
+    input_file.write_text("https://a.example\nhttps://b.example\n")
+    output_file = tmp_path / "out.jsonl"
+    output_file.write_text(json.dumps({"url": "https://old.example"}) + "\n")
+
+    async def fake_request(url, custom_headers=None, use_cache=True, context=None):
+        return {"status_code": 200, "headers": {}, "body": "ok"}
+
+    with patch('core.analyzer._async_request', side_effect=fake_request):
+        with patch('core.analyzer.aiohttp.ClientSession', return_value=AsyncMock()):
+            count = await core.analyzer.scan_file(
+                str(input_file), str(output_file), concurrency=2, resume=True
+            )
+
+    lines = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert count == 2
+    assert sorted(line["url"] for line in lines) == ["https://a.example", "https://b.example"]
+
+@pytest.mark.asyncio
+async def test_scan_file_resume_truncates_to_checkpoint(tmp_path):
+    """Test de la reprise : les lignes écrites après le point de reprise sont écartées."""
+    import json
+    from core.checkpoint import Checkpoint
+    input_file = tmp_path / "targets.txt"
+    input_file.write_text("".join(f"https://host{i}.example\n" for i in range(3)))
+    output_file = tmp_path / "out.jsonl"
+    saved = json.dumps({"url": "https://host0.example"}) + "\n"
+    output_file.write_text(saved + '{"url": "https://host1.exa')
+    checkpoint = Checkpoint(f"{output_file}.checkpoint", core.analyzer._scan_plan_id(str(input_file)))
+    checkpoint.mark_done(0)
+    checkpoint.data["offset"] = len(saved)
+    checkpoint.save()
+
+    async def fake_request(url, custom_headers=None, use_cache=True, context=None):
+        return {"status_code": 200, "headers": {}, "body": "ok"}
+
+    with patch('core.analyzer._async_request', side_effect=fake_request):
+        with patch('core.analyzer.aiohttp.ClientSession', return_value=AsyncMock()):
+            await core.analyzer.scan_file(str(input_file), str(output_file), resume=True)
+
+    lines = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert sorted(line["url"] for line in lines) == [f"https://host{i}.example" for i in range(3)]
+
+def test_plan_ids_cover_content(tmp_path):
+    """Test des identifiants de plan : un contenu modifié à taille égale change le plan."""
+    from core.payloads import PayloadCorpus
+    input_file = tmp_path / "targets.txt"
+    input_file.write_text("https://a.example\nhttps://b.example\n")
+    scan_id = core.analyzer._scan_plan_id(str(input_file))
+    input_file.write_text("https://b.example\nhttps://a.example\n")
+    assert core.analyzer._scan_plan_id(str(input_file)) != scan_id
+
+    corpus = PayloadCorpus()
+    corpus.add_many("xss", ["<b>", "<i>"])
+    reordered = PayloadCorpus()
+    reordered.add_many("xss", ["<i>", "<b>"])
+    with patch('core.analyzer.get_payload_corpus', return_value=corpus):
+        attack_id = core.analyzer._attack_plan_id("https://example.com")
+    with patch('core.analyzer.get_payload_corpus', return_value=reordered):
+        assert core.analyzer._attack_plan_id("https://example.com") != attack_id
+
+@pytest.mark.asyncio
+async def test_retry_on_transient_status():
+    """Test du retry sur 503 avec respect de Retry-After."""
+    responses = [
+        MockResponse(status=503, headers={"Retry-After": "2"}, text="busy"),
+        MockResponse(status=429, headers={}, text="slow down"),
+        MockResponse(status=200, headers={}, text="ok"),
+    ]
+    mock_session = AsyncMock()
+    mock_session.get.side_effect = responses
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0.5, jitter=0.0)
+    with patch('core.analyzer.aiohttp.ClientSession', return_value=mock_session):
+        async with ScanContext(retry_policy=policy) as context:
+            with patch('core.analyzer.asyncio.sleep', side_effect=fake_sleep):
+                result = await run("https://example.com", use_cache=False, context=context)
+
+    assert result["status_code"] == 200
+    assert mock_session.get.call_count == 3
+    # Retry-After pour la première tentative, backoff exponentiel ensuite
+    assert delays == [2.0, 1.0]
+
+@pytest.mark.asyncio
+async def test_retry_exhausted_returns_last_response():
+    """Test du retour de la dernière réponse 5xx une fois les tentatives épuisées."""
+    mock_session = AsyncMock()
+    mock_session.get.side_effect = [
+        MockResponse(status=500, headers={}, text="error") for _ in range(2)
+    ]
+
+    policy = RetryPolicy(max_attempts=2, base_delay=0.0)
+    with patch('core.analyzer.aiohttp.ClientSession', return_value=mock_session):
+        async with ScanContext(retry_policy=policy) as context:
+            result = await run("https://example.com", use_cache=False, context=context)
+
+    assert result["status_code"] == 500
+    assert mock_session.get.call_count == 2
+
+@pytest.mark.asyncio
+async def test_disk_cache_revalidation(tmp_path):
+    """Test de la revalidation d'une entrée expirée par une requête conditionnelle."""
+    from core.cache import DiskResponseCache
+
+    cache = DiskResponseCache(str(tmp_path / "cache.sqlite"), ttl=0.05)
+    first = MockResponse(status=200, headers={"ETag": '"v1"'}, text="original")
+    not_modified = MockResponse(status=304, headers={}, text="")
+
+    mock_session = AsyncMock()
+    mock_session.get.side_effect = [first, not_modified]
+
+    with patch('core.analyzer.aiohttp.ClientSession', return_value=mock_session):
+        async with ScanContext(cache=cache) as context:
+            result1 = await run("https://example.com/page", context=context)
+            await asyncio.sleep(0.06)
+            result2 = await run("https://example.com/page", context=context)
+
+    assert result1["body"] == result2["body"] == "original"
+    assert "If-None-Match" not in mock_session.get.call_args_list[0].kwargs["headers"]
+    assert mock_session.get.call_args_list[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+    # L'entrée revalidée est de nouveau fraîche
+    assert await cache.get("https://example.com/page") is not None
+    cache.close()
+
+@pytest.mark.asyncio
+async def test_response_cache_lru_order() -> None:
+    """Test de l'éviction LRU : une lecture protège l'entrée de l'éviction."""
+    cache = ResponseCache(max_size=2, ttl=60.0)
+    await cache.set("a", {"body": "a"})
+    await cache.set("b", {"body": "b"})
+    assert await cache.get("a") == {"body": "a"}
+
+    await cache.set("c", {"body": "c"})
+    assert list(cache.cache) == ["a", "c"]
+    assert await cache.get("b") is None
+
+@pytest.mark.asyncio
+async def test_response_cache_byte_bound() -> None:
+    """Test de la limite en octets du cache."""
+    cache = ResponseCache(max_size=100, ttl=60.0, max_bytes=10)
+    await cache.set("a", {"body": "x" * 4, "body_bytes": 4})
+    await cache.set("b", {"body": "y" * 4, "body_bytes": 4})
+    await cache.set("c", {"body": "z" * 4, "body_bytes": 4})
+    assert list(cache.cache) == ["b", "c"]
+    assert cache.total_bytes == 8
+
+    # Une entrée plus grosse que le cache n'est pas conservée
+    await cache.set("huge", {"body": "h" * 50})
+    assert "huge" not in cache.cache
+
+    # Le remplacement d'une clé met à jour la taille totale
+    await cache.set("b", {"body": "y", "body_bytes": 1})
+    assert cache.total_bytes == 5
+
+    await cache.clear()
+    assert cache.total_bytes == 0
+
+@pytest.mark.asyncio
+async def test_response_cache_sweeper() -> None:
+    """Test du balayage périodique des entrées expirées."""
+    cache = ResponseCache(max_size=10, ttl=0.05)
+    await cache.set("a", {"body": "a"})
+    await cache.set("b", {"body": "b"})
+
+    cache.start_sweeper(interval=0.02)
+    cache.start_sweeper(interval=0.02)
+    await asyncio.sleep(0.12)
+    assert len(cache.cache) == 0
+    assert cache.total_bytes == 0
+
+    await cache.stop_sweeper()
+    assert cache._sweeper is not None
+    await cache.stop_sweeper()
+    assert cache._sweeper is None
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_requests():
+    """Test du regroupement des requêtes concurrentes identiques."""
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        return MockResponse(status=200, headers={}, text="shared")
+
+    mock_session = AsyncMock()
+    mock_session.get.side_effect = slow_get
+
+    with patch('core.analyzer.aiohttp.ClientSession', return_value=mock_session):
+        async with ScanContext() as context:
+            results = await asyncio.gather(*[
+                run("https://example.com/same", context=context) for _ in range(5)
+            ])
+
+    assert mock_session.get.call_count == 1
+    assert all(r["body"] == "shared" for r in results)
+    assert len(core.analyzer.in_flight_requests) == 0
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_exceptions():
+    """Test de la propagation d'une même exception à tous les appelants."""
+    async def failing_get(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        raise aiohttp.ClientError("down")
+
+    mock_session = AsyncMock()
+    mock_session.get.side_effect = failing_get
+
+    with patch('core.analyzer.aiohttp.ClientSession', return_value=mock_session):
+        async with ScanContext(retry_policy=RetryPolicy(max_attempts=1)) as context:
+            results = await asyncio.gather(*[
+                run("https://example.com/down", context=context) for _ in range(3)
+            ], return_exceptions=True)
+
+    assert mock_session.get.call_count == 1
+    assert all(isinstance(r, RequestError) for r in results)
+
+@pytest.mark.asyncio
+async def test_single_flight_leader_cancelled():
+    """Test de la relance par un appelant en attente lorsque l'initiateur est annulé."""
+    flight = core.analyzer.SingleFlight()
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    leader = asyncio.ensure_future(flight.do("k", factory))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("k", factory))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == 2
+    assert leader.cancelled()
+
+@pytest.mark.asyncio
+async def test_no_coalescing_without_cache():
+    """Test de l'absence de regroupement lorsque le cache est désactivé."""
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return MockResponse(status=200, headers={}, text="fresh")
+
+    mock_session = AsyncMock()
+    mock_session.get.side_effect = slow_get
+
+    with patch('core.analyzer.aiohttp.ClientSession', return_value=mock_session):
+        async with ScanContext() as context:
+            await asyncio.gather(*[
+                run("https://example.com/fresh", use_cache=False, context=context) for _ in range(3)
+            ])
+
+    assert mock_session.get.call_count == 3
+
+@pytest.mark.asyncio
+async def test_response_cache_stats() -> None:
+    """Test des compteurs du cache mémoire."""
+    cache = ResponseCache(max_size=1, ttl=60.0)
+    await cache.get("a")
+    await cache.set("a", {"body": "aaaa"})
+    await cache.get("a")
+    await cache.set("b", {"body": "bb"})
+    await cache.touch("b")
+
+    stats = await cache.stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] == 2
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["revalidations"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+@pytest.mark.asyncio
+async def test_warm_cache():
+    """Test du préchargement du cache."""
+    async def fake_request(url, custom_headers=None, use_cache=True, context=None):
+        assert use_cache
+        return {"status_code": 404 if "missing" in url else 200, "headers": {}, "body": ""}
+
+    with patch('core.analyzer._async_request', side_effect=fake_request):
+        counts = await core.analyzer.warm_cache(
+            ["https://a.example", "https://b.example", "https://a.example/missing"],
+            concurrency=2,
+            context=ScanContext()
+        )
+    assert counts == {"warmed": 2, "failed": 1}
+
+def test_sync_engine_parallel_ordered():
+    """Test du moteur synchrone : session partagée, requêtes parallèles, ordre du plan."""
+    import threading
+
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    release = threading.Barrier(4, timeout=5)
+
+    def fake_get(url, **kwargs):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        try:
+            release.wait()
+        except threading.BrokenBarrierError:
+            pass
+        with lock:
+            in_flight -= 1
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {}
+        response.iter_content.return_value = iter([url.encode()])
+        response.__enter__.return_value = response
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = fake_get
+    limiter = RateLimiter(max_requests=1000)
+    plan = [(f"a{i}", f"https://example.com/?p={i}") for i in range(8)]
+
+    with patch('core.analyzer._build_attack_plan', return_value=iter(plan)), \
+            patch.dict(config.config, {"fingerprint": {"baseline": False}}):
+        with core.analyzer.SyncScanEngine(max_workers=4, rate_limiter=limiter, session=session) as engine:
+            results = engine.process_attacks("https://example.com")
+
+    assert [r["attack"] for r in results] == [a for a, _ in plan]
+    assert [r["body"] for r in results] == [u for _, u in plan]
+    assert max_in_flight == 4
+    assert session.get.call_count == 8
+    session.close.assert_called_once()
+
+def test_sync_session_pool_sizes():
+    """Test du dimensionnement des pools de connexions de la session synchrone."""
+    with patch.dict(config.config, {"connection_pool": {"limit": 20, "limit_per_host": 5}}):
+        session = core.analyzer.create_sync_session()
+    adapter = session.get_adapter("https://example.com")
+    assert adapter._pool_connections == 20
+    assert adapter._pool_maxsize == 5
+    assert adapter._pool_block is True
+    session.close()
+
+def test_rate_limiter_acquire_sync():
+    """Test de la version bloquante du limiteur."""
+    limiter = RateLimiter(max_requests=10, time_window=1.0, burst=1)
+    with patch('core.analyzer.sleep') as mock_sleep:
+        limiter.acquire_sync("h")
+        limiter.acquire_sync("h")
+    mock_sleep.assert_called_once()
+    assert mock_sleep.call_args.args[0] == pytest.approx(0.1, abs=0.01)
+
+@pytest.mark.asyncio
+async def test_process_attacks_baseline_distance():
+    """Test de la réponse de référence : récupérée une fois, distance par mutation."""
+    calls = []
+
+    async def fake_request(url, custom_headers=None, use_cache=True, context=None):
+        calls.append(url)
+        if url == "https://example.com/":
+            return {"status_code": 200, "headers": {}, "body": "Welcome home"}
+        if "sqli" in url or "%27" in url:
+            return {"status_code": 500, "headers": {}, "body": "SQL syntax error"}
+        return {"status_code": 200, "headers": {}, "body": "Welcome home"}
+
+    limiter = RateLimiter(max_requests=100, time_window=1.0)
+    with patch('core.analyzer._async_request', side_effect=fake_request), \
+            patch.dict(config.config, {"fingerprint": {"baseline": True, "keep_body": False}}):
+        results = await core.analyzer.process_attacks_async(
+            "https://example.com/", limiter, context=ScanContext()
+        )
+
+    assert calls.count("https://example.com/") == 1
+    by_attack = {r["attack"]: r for r in results}
+    assert by_attack["xss"]["distance"] == 0.0
+    assert by_attack["sqli"]["distance"] > 0.5
+    assert by_attack["sqli"]["fingerprint"]["status"] == 500
+    assert "body" not in by_attack["sqli"]
+
+@pytest.mark.asyncio
+async def test_large_body_fingerprint_off_loop():
+    """Test du calcul de l'empreinte d'un corps volumineux hors de la boucle d'événements."""
+    import threading
+    threads = []
+    original = core.analyzer._attack_result
+
+    def recording_result(*args):
+        threads.append(threading.current_thread())
+        return original(*args)
+
+    async def fake_request(url, custom_headers=None, use_cache=True, context=None):
+        size = core.analyzer.FINGERPRINT_THREAD_CHARS if "big" in url else 10
+        return {"status_code": 200, "headers": {}, "body": "x" * size}
+
+    limiter = RateLimiter(max_requests=100, time_window=1.0)
+    with patch('core.analyzer._async_request', side_effect=fake_request), \
+            patch('core.analyzer._attack_result', side_effect=recording_result):
+        small = await core.analyzer._attack_request("xss", "https://example.com/small", limiter, ScanContext())
+        big = await core.analyzer._attack_request("xss", "https://example.com/big", limiter, ScanContext())
+
+    assert small["status"] == big["status"] == 200
+    assert threads[0] is threading.main_thread()
+    assert threads[1] is not threading.main_thread()
+
+def test_main_streams_results(tmp_path):
+    """Test de l'écriture en flux des résultats par main()."""
+    from core.results import read_results
+
+    async def fake_iter(target, rate_limiter, context, concurrency=None, corpus=None, checkpoint=None):
+        for i in range(3):
+            yield {"url": f"{target}?input={i}", "status": 200, "attack": "xss", "body": f"b{i}"}
+
+    output = str(tmp_path / "out.jsonl.gz")
+    with patch.dict(config.config, {
+        "target": "https://example.com/",
+        "async": True,
+        "results": {"path": output, "separate_bodies": True}
+    }), patch('core.analyzer.iter_attacks_async', side_effect=fake_iter):
+        core.analyzer.main()
+
+    results = list(read_results(output))
+    assert [r["body"] for r in results] == ["b0", "b1", "b2"]
+    assert all("body" not in r for r in read_results(output, with_bodies=False))
+
+def test_main_rejects_stdout_results_path():
+    """Test du refus d'une sortie standard comme fichier de résultats de main()."""
+    with patch.dict(config.config, {
+        "target": "https://example.com/",
+        "async": True,
+        "results": {"path": "-"}
+    }):
+        with pytest.raises(ValueError):
+            core.analyzer.main()
+
+KILL_AND_RESUME_SCRIPT = """
+import os, signal, sys
+from unittest.mock import patch
+import core.analyzer
+import core.results
+from core.config import config
+
+output, kill_at = sys.argv[1], int(sys.argv[2])
+write = core.results.ResultWriter.write
+
+def write_and_flush_meta(self, record):
+    # Seules les métadonnées atteignent le disque : les deux fichiers divergent
+    write(self, record)
+    self._meta.flush()
+
+async def fake_iter(target, rate_limiter, context, concurrency=None, corpus=None, checkpoint=None):
+    for i in range(10):
+        if checkpoint.is_done(i):
+            continue
+        yield {"url": f"{target}?input={i}", "status": 200, "attack": "xss", "body": f"b{i}"}
+        checkpoint.mark_done(i)
+        if i == kill_at:
+            os.kill(os.getpid(), signal.SIGKILL)
+
+with patch.dict(config.config, {
+    "target": "https://example.com/",
+    "async": True,
+    "results": {"path": output, "separate_bodies": True},
+    "checkpoint": {"every": 3, "interval": 3600}
+}), patch("core.analyzer.iter_attacks_async", side_effect=fake_iter), \\
+        patch("core.results.ResultWriter.write", write_and_flush_meta):
+    core.analyzer.main(resume=len(sys.argv) > 3)
+"""
+
+def test_main_resume_after_kill(tmp_path):
+    """Test de la reprise après un arrêt brutal en sortie .jsonl.gz par défaut."""
+    import subprocess
+    import sys
+    from pathlib import Path
+    from core.results import read_results
+
+    output = str(tmp_path / "out.jsonl.gz")
+    root = Path(__file__).resolve().parent.parent
+    killed = subprocess.run(
+        [sys.executable, "-c", KILL_AND_RESUME_SCRIPT, output, "7"], cwd=root, capture_output=True
+    )
+    assert killed.returncode != 0
+    with pytest.raises(Exception):
+        list(read_results(output))
+
+    subprocess.run(
+        [sys.executable, "-c", KILL_AND_RESUME_SCRIPT, output, "-1", "--resume"], cwd=root, check=True
+    )
+    results = list(read_results(output))
+    assert [r["url"] for r in results] == [f"https://example.com/?input={i}" for i in range(10)]
+    assert [r["body"] for r in results] == [f"b{i}" for i in range(10)]
+
+def test_sync_engine_resumes_from_checkpoint(tmp_path):
+    """Test de la reprise du moteur synchrone : les mutations déjà traitées sont ignorées."""
+    from core.checkpoint import Checkpoint
+
+    def fake_get(url, **kwargs):
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {}
+        response.iter_content.return_value = iter([url.encode()])
+        response.__enter__.return_value = response
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = fake_get
+    plan = [(f"a{i}", f"https://example.com/?p={i}") for i in range(6)]
+    checkpoint = Checkpoint(str(tmp_path / "scan.checkpoint"), "plan")
+    for index in (0, 1, 4):
+        checkpoint.mark_done(index)
+
+    with patch('core.analyzer._build_attack_plan', side_effect=lambda *a, **k: iter(plan)), \
+            patch.dict(config.config, {"fingerprint": {"baseline": False}}):
+        with core.analyzer.SyncScanEngine(
+            max_workers=2, rate_limiter=RateLimiter(max_requests=1000), session=session
+        ) as engine:
+            results = list(engine.iter_attacks("https://example.com", checkpoint))
+
+    assert [r["attack"] for r in results] == ["a2", "a3", "a5"]
+    assert checkpoint.position == 6 and not checkpoint.done
@@ -0,0 +1,112 @@
+import pytest
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+from core.cache import DiskResponseCache, conditional_headers, get_header
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache.sqlite")
+
+@pytest.mark.asyncio
+async def test_disk_cache_persistence(cache_path):
+    """Teste le partage du cache disque entre deux instances."""
+    data = {"status_code": 200, "headers": {"ETag": '"v1"'}, "body": "hello"}
+    cache = DiskResponseCache(cache_path, max_size=10, ttl=60)
+    await cache.set("https://example.com", data)
+    cache.close()
+
+    other = DiskResponseCache(cache_path, max_size=10, ttl=60)
+    assert await other.get("https://example.com") == data
+    assert await other.size() == 1
+    other.close()
+
+@pytest.mark.asyncio
+async def test_disk_cache_stale_entries(cache_path):
+    """Teste la conservation des entrées expirées pour la revalidation."""
+    data = {"status_code": 200, "headers": {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, "body": "x"}
+    cache = DiskResponseCache(cache_path, max_size=10, ttl=0.1)
+    await cache.set("key", data)
+    await asyncio.sleep(0.15)
+
+    assert await cache.get("key") is None
+    assert await cache.get_stale("key") == data
+    assert await cache.get_expired_entries() == ["key"]
+
+    await cache.touch("key")
+    assert await cache.get("key") == data
+    cache.close()
+
+@pytest.mark.asyncio
+async def test_disk_cache_eviction(cache_path):
+    """Teste l'éviction des entrées les plus anciennes au-delà de max_size."""
+    cache = DiskResponseCache(cache_path, max_size=2, ttl=60)
+    with patch('core.cache.time', side_effect=[1.0, 2.0, 3.0]):
+        for key in ("a", "b", "c"):
+            await cache.set(key, {"body": key, "headers": {}})
+
+    assert await cache.size() == 2
+    assert await cache.get_stale("a") is None
+    assert (await cache.get_stale("c"))["body"] == "c"
+
+    await cache.clear()
+    assert await cache.size() == 0
+    cache.close()
+
+def test_conditional_headers():
+    """Teste la construction des en-têtes de revalidation."""
+    assert conditional_headers(None) == {}
+    assert conditional_headers({"headers": {"etag": '"abc"', "last-modified": "yesterday"}}) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "yesterday"
+    }
+    assert get_header({"Content-Type": "text/html"}, "content-type") == "text/html"
+
+@pytest.mark.asyncio
+async def test_disk_cache_stats_persist(cache_path):
+    """Teste le cumul des statistiques du cache disque entre exécutions."""
+    cache = DiskResponseCache(cache_path, max_size=1, ttl=60)
+    await cache.get("a")
+    await cache.set("a", {"body": "a", "headers": {}})
+    await cache.get("a")
+    await cache.set("b", {"body": "b", "headers": {}})
+    cache.close()
+
+    other = DiskResponseCache(cache_path, max_size=1, ttl=60)
+    await other.get("b")
+    stats = await other.stats()
+    assert stats["backend"] == "disk"
+    assert stats["entries"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["sets"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+
+    await other.clear()
+    assert (await other.stats())["hits"] == 0
+    other.close()
+
+def test_disk_cache_stats_flushed_at_exit(cache_path):
+    """Teste l'écriture des compteurs à la sortie d'un processus qui ne ferme pas le cache."""
+    script = (
+        "import asyncio, sys\n"
+        "from core.cache import DiskResponseCache\n"
+        "async def main():\n"
+        "    cache = DiskResponseCache(sys.argv[1], max_size=10, ttl=60)\n"
+        "    for i in range(5):\n"
+        "        await cache.set(str(i), {'body': str(i), 'headers': {}})\n"
+        "        await cache.get(str(i))\n"
+        "asyncio.run(main())\n"
+    )
+    root = Path(__file__).resolve().parent.parent
+    subprocess.run([sys.executable, "-c", script, cache_path], cwd=root, check=True)
+
+    other = DiskResponseCache(cache_path, max_size=10, ttl=60)
+    stats = asyncio.run(other.stats())
+    assert stats["entries"] == 5
+    assert stats["hits"] == 5
+    assert stats["sets"] == 5
+    other.close()
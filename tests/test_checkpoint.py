@@ -0,0 +1,50 @@
+import json
+import pytest
+from core.checkpoint import Checkpoint, CheckpointError
+
+def test_checkpoint_sparse_progress(tmp_path):
+    """Test de la position et des indices terminés hors ordre."""
+    checkpoint = Checkpoint(str(tmp_path / "scan.checkpoint"), "plan", every=100)
+    for index in (0, 1, 3, 4, 7):
+        checkpoint.mark_done(index)
+    assert checkpoint.position == 2
+    assert checkpoint.done == {3, 4, 7}
+
+    checkpoint.mark_done(2)
+    assert checkpoint.position == 5
+    assert checkpoint.done == {7}
+    assert checkpoint.is_done(4) and checkpoint.is_done(7)
+    assert not checkpoint.is_done(5)
+
+def test_checkpoint_saves_and_resumes(tmp_path):
+    """Test de l'enregistrement périodique et de la reprise."""
+    path = tmp_path / "scan.checkpoint"
+    saved = []
+    checkpoint = Checkpoint(str(path), "plan", every=2, on_save=lambda: saved.append(True))
+    checkpoint.data["scan_id"] = "abc"
+    checkpoint.mark_done(0)
+    assert not path.exists()
+    checkpoint.mark_done(2)
+    assert saved == [True]
+    assert json.loads(path.read_text())["position"] == 1
+
+    resumed = Checkpoint.open(str(path), "plan", resume=True)
+    assert resumed.resumed
+    assert resumed.is_done(0) and resumed.is_done(2) and not resumed.is_done(1)
+    assert resumed.data == {"scan_id": "abc"}
+
+    fresh = Checkpoint.open(str(path), "plan", resume=False)
+    assert not fresh.resumed
+
+    resumed.complete()
+    assert Checkpoint.open(str(path), "plan", resume=True).is_done(10 ** 6)
+
+def test_checkpoint_rejects_other_plan(tmp_path):
+    """Test du refus d'un point de reprise d'un autre plan."""
+    path = tmp_path / "scan.checkpoint"
+    Checkpoint(str(path), "plan-a").save()
+    with pytest.raises(CheckpointError):
+        Checkpoint.open(str(path), "plan-b", resume=True)
+    path.write_text("{tronqué")
+    with pytest.raises(CheckpointError):
+        Checkpoint.open(str(path), "plan-a", resume=True)
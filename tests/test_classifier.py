@@ -115,4 +115,76 @@ def test_classifier_syntax_error(tmp_path):
     
     with patch('builtins.print') as mock_print:
         run(str(results_file))
-        mock_print.assert_any_call("[!] Comportement VULNÉRABLE pour attaque syntax → http://test.com/syntax") 
\ No newline at end of file
+        mock_print.assert_any_call("[!] Comportement VULNÉRABLE pour attaque syntax → http://test.com/syntax")
+
+
+def test_classifier_anomalous(tmp_path):
+    """Teste la classification d'une réponse éloignée de la réponse de référence."""
+    results_file = tmp_path / "results.json"
+    with open(results_file, 'w') as f:
+        json.dump([
+            {"url": "http://test.com/?q=1", "status": 500, "attack": "sqli", "distance": 0.62},
+            {"url": "http://test.com/?q=2", "status": 200, "body": "Welcome", "attack": "sqli", "distance": 0.01}
+        ], f)
+
+    with patch('builtins.print') as mock_print:
+        run(str(results_file))
+        mock_print.assert_any_call("[?] Comportement ANORMAL pour attaque sqli → http://test.com/?q=1 (distance 0.62)")
+        mock_print.assert_any_call("[~] Comportement FLEXIBLE pour attaque sqli → http://test.com/?q=2")
+
+def test_classifier_jsonl_output(sample_results, tmp_path):
+    """Teste la lecture JSONL et l'écriture de verdicts structurés."""
+    results_file = tmp_path / "results.jsonl"
+    with open(results_file, 'w') as f:
+        for entry in sample_results:
+            f.write(json.dumps(entry) + "\n")
+    output_file = tmp_path / "verdicts.jsonl"
+
+    assert run(str(results_file), output=str(output_file)) == 3
+
+    verdicts = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert [v["verdict"] for v in verdicts] == ["VULNERABLE", "STRICT", "FLEXIBLE"]
+    assert verdicts[0] == {
+        "url": "http://test.com/xss", "attack": "xss", "status": 200,
+        "distance": None, "verdict": "VULNERABLE", "rules": ["xss-reflected"]
+    }
+
+def test_classify_batch_multiprocess_order(sample_results):
+    """Teste la classification multi-processus : verdicts dans l'ordre des résultats."""
+    from core.classifier import classify_batch
+
+    entries = [
+        {**sample_results[i % 3], "url": f"http://test.com/{i}"}
+        for i in range(250)
+    ]
+    single = list(classify_batch(iter(entries), workers=1))
+    multi = list(classify_batch(iter(entries), workers=3, chunk_size=17))
+
+    assert multi == single
+    assert [v["url"] for v in multi] == [e["url"] for e in entries]
+    assert [v["verdict"] for v in multi[:3]] == ["VULNERABLE", "STRICT", "FLEXIBLE"]
+
+
+def test_classifier_scan_results(tmp_path):
+    """Teste la classification des résultats produits par `dnarecon scan`."""
+    results_file = tmp_path / "results.jsonl"
+    with open(results_file, 'w') as f:
+        for entry in [
+            {"url": "http://test.com/a", "status_code": 403, "headers": {}, "body": "Access denied"},
+            {"url": "http://test.com/b", "status_code": 200, "headers": {}, "body": "Welcome"},
+            {"url": "http://test.com/c", "error": "timeout"},
+        ]:
+            f.write(json.dumps(entry) + "\n")
+    output_file = tmp_path / "verdicts.jsonl"
+
+    assert run(str(results_file), output=str(output_file)) == 3
+
+    verdicts = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert [(v["status"], v["verdict"]) for v in verdicts] == [
+        (403, "STRICT"), (200, "FLEXIBLE"), (None, "FLEXIBLE")
+    ]
+    assert verdicts[0]["attack"] is None
+
+    with patch('builtins.print') as mock_print:
+        run(str(results_file))
+        mock_print.assert_any_call("[+] Comportement STRICT pour http://test.com/a")
@@ -26,7 +26,7 @@ def mock_classifier():
 
 @pytest.fixture
 def mock_llm():
-    with patch('core.llm.run') as mock:
+    with patch('core.llm.run_async', new_callable=AsyncMock) as mock:
         mock.return_value = None
         yield mock
 
@@ -49,14 +49,28 @@ def test_classify_command():
     with patch('core.classifier.run') as mock:
         with patch('sys.argv', ['dnarecon', 'classify', 'results.json']):
             asyncio.run(main())
-            mock.assert_called_once_with('results.json')
+            mock.assert_called_once_with('results.json', output=None, workers=None)
+
+def test_classify_command_workers():
+    """Test de la commande classify multi-processus."""
+    with patch('core.classifier.run') as mock:
+        with patch('sys.argv', ['dnarecon', 'classify', 'results.jsonl', '-o', 'out.jsonl', '-w', '8']):
+            asyncio.run(main())
+            mock.assert_called_once_with('results.jsonl', output='out.jsonl', workers=8)
 
 def test_llm_tag_command():
     """Test de la commande llm-tag."""
-    with patch('core.llm.run') as mock:
+    with patch('core.llm.run_async', new_callable=AsyncMock) as mock:
         with patch('sys.argv', ['dnarecon', 'llm-tag', 'results.json']):
             asyncio.run(main())
-            mock.assert_called_once_with('results.json')
+            mock.assert_called_once_with('results.json', output=None, concurrency=None, use_cache=True, provider=None, triage=None)
+
+def test_llm_tag_command_concurrency():
+    """Test de la commande llm-tag avec sortie et concurrence."""
+    with patch('core.llm.run_async', new_callable=AsyncMock) as mock:
+        with patch('sys.argv', ['dnarecon', 'llm-tag', 'scan.jsonl.gz', '-o', '-', '-c', '32', '--no-cache']):
+            asyncio.run(main())
+            mock.assert_called_once_with('scan.jsonl.gz', output='-', concurrency=32, use_cache=False, provider=None, triage=None)
 
 @pytest.mark.asyncio
 async def test_run_command():
@@ -87,4 +101,105 @@ def test_missing_argument():
     """Test avec un argument manquant."""
     with patch('sys.argv', ['dnarecon', 'analyze']):
         with pytest.raises(SystemExit):
-            asyncio.run(main()) 
\ No newline at end of file
+            asyncio.run(main())
+
+
+@pytest.mark.asyncio
+async def test_scan_command():
+    """Test de la commande scan."""
+    with patch('core.analyzer.scan_file', new_callable=AsyncMock) as mock:
+        with patch('sys.argv', ['dnarecon', 'scan', 'targets.txt', '-o', 'out.jsonl', '-c', '50', '--transport', 'http2']):
+            await main()
+            mock.assert_called_once_with('targets.txt', 'out.jsonl', concurrency=50, transport='http2', resume=False)
+
+@pytest.mark.asyncio
+async def test_scan_command_defaults_to_stdio():
+    """Test de la commande scan sans arguments (stdin vers stdout)."""
+    with patch('core.analyzer.scan_file', new_callable=AsyncMock) as mock:
+        with patch('sys.argv', ['dnarecon', 'scan']):
+            await main()
+            mock.assert_called_once_with('-', '-', concurrency=None, transport=None, resume=False)
+
+@pytest.mark.asyncio
+async def test_cache_stats_command(capsys):
+    """Test de la commande cache stats."""
+    stats = {"backend": "memory", "entries": 3, "hits": 5, "misses": 1}
+    with patch('core.analyzer.response_cache') as mock_cache:
+        mock_cache.stats = AsyncMock(return_value=stats)
+        with patch('sys.argv', ['dnarecon', 'cache', 'stats']):
+            await main()
+    assert json.loads(capsys.readouterr().out) == stats
+
+@pytest.mark.asyncio
+async def test_cache_warm_command():
+    """Test de la commande cache warm."""
+    with patch('core.analyzer.warm_cache_file', new_callable=AsyncMock) as mock:
+        mock.return_value = {"warmed": 2, "failed": 0}
+        with patch('sys.argv', ['dnarecon', 'cache', 'warm', 'targets.txt', '-c', '8']):
+            await main()
+        mock.assert_called_once_with('targets.txt', concurrency=8)
+
+@pytest.mark.asyncio
+async def test_cache_clear_command():
+    """Test de la commande cache clear."""
+    with patch('core.analyzer.response_cache') as mock_cache:
+        mock_cache.clear = AsyncMock()
+        with patch('sys.argv', ['dnarecon', 'cache', 'clear']):
+            await main()
+        mock_cache.clear.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_cache_commands_warn_on_memory_backend(capsys):
+    """Test de l'avertissement des commandes cache avec le backend mémoire."""
+    from core.analyzer import ResponseCache
+
+    cache = ResponseCache()
+    cache.clear = AsyncMock()
+    with patch('core.analyzer.response_cache', cache):
+        with patch('sys.argv', ['dnarecon', 'cache', 'stats']):
+            await main()
+        captured = capsys.readouterr()
+        assert json.loads(captured.out)["backend"] == "memory"
+        assert "Cache en mémoire" in captured.err
+
+        with patch('sys.argv', ['dnarecon', 'cache', 'clear']):
+            await main()
+        captured = capsys.readouterr()
+        assert "Cache en mémoire" in captured.err
+        assert "Cache vidé" not in captured.out
+        cache.clear.assert_not_awaited()
+
+def test_query_command(tmp_path, capsys):
+    """Test de la commande query sur une base de résultats."""
+    from core.store import ResultStore
+
+    path = str(tmp_path / "results.sqlite")
+    with ResultStore(path) as store:
+        store.start_scan("http://a.test/")
+        store.write({"url": "http://a.test/?q=1", "status": 500, "attack": "sqli", "body": "err"})
+        store.write({"url": "http://a.test/?q=2", "status": 200, "attack": "sqli", "body": "ok"})
+
+    with patch('sys.argv', ['dnarecon', 'query', path, '--host', 'a.test', '--status', '500', '--no-bodies']):
+        asyncio.run(main())
+
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"url": "http://a.test/?q=1", "status": 500, "attack": "sqli"}
+    ]
+
+def test_llm_tag_command_local_provider():
+    """Test de la commande llm-tag avec un fournisseur local."""
+    with patch('core.llm.run_async', new_callable=AsyncMock) as mock:
+        with patch('sys.argv', ['dnarecon', 'llm-tag', 'scan.jsonl', '--provider', 'local',
+                                '--base-url', 'http://127.0.0.1:9000/v1']):
+            asyncio.run(main())
+            provider = mock.call_args.kwargs["provider"]
+            assert provider.name == "local"
+            assert provider.endpoint == "http://127.0.0.1:9000/v1/chat/completions"
+
+def test_llm_tag_command_without_triage():
+    """Test de la commande llm-tag sans tri préalable."""
+    with patch('core.llm.run_async', new_callable=AsyncMock) as mock:
+        with patch('sys.argv', ['dnarecon', 'llm-tag', 'scan.jsonl', '--all']):
+            asyncio.run(main())
+            assert mock.call_args.kwargs["triage"] is False
@@ -0,0 +1,56 @@
+import hashlib
+import re
+from collections import Counter
+from core.fingerprint import Fingerprint, compare, distance, hamming_distance, simhash
+
+PAGE = "Welcome to the shop. Browse our catalogue of products and offers. " * 20
+
+def test_simhash_similarity():
+    """Test du SimHash : textes proches → peu de bits différents."""
+    assert simhash(PAGE) == simhash(PAGE)
+    close = hamming_distance(simhash(PAGE), simhash(PAGE + " search results for shoes"))
+    far = hamming_distance(simhash(PAGE), simhash("SQL syntax error near unexpected token at line 1"))
+    assert close < far
+
+def test_fingerprint_roundtrip():
+    """Test de la sérialisation d'une empreinte."""
+    fp = Fingerprint.from_result({
+        "status_code": 200,
+        "headers": {"Content-Type": "text/html", "X-Frame-Options": "DENY"},
+        "body": PAGE,
+        "body_bytes": len(PAGE)
+    })
+    data = fp.as_dict()
+    assert data["headers"] == ["content-type", "x-frame-options"]
+    assert len(data["simhash"]) == 16
+    assert Fingerprint.from_dict(data) == fp
+
+def test_compare_components():
+    """Test des composantes de la distance entre empreintes."""
+    baseline = Fingerprint.from_result({"status_code": 200, "headers": {"A": "1"}, "body": PAGE})
+    same = Fingerprint.from_result({"status_code": 200, "headers": {"a": "2"}, "body": PAGE})
+    error = Fingerprint.from_result({
+        "status_code": 500, "headers": {"B": "1"}, "body": "Internal Server Error"
+    })
+
+    assert compare(baseline, same)["score"] == 0.0
+    components = compare(baseline, error)
+    assert components["status"] == 1.0
+    assert components["headers"] == 1.0
+    assert components["length"] > 0.9
+    assert 0.7 < components["score"] <= 1.0
+    assert distance(None, error) is None
+
+def _reference_simhash(text):
+    """SimHash calculé bit à bit, pour comparaison."""
+    weights = [0] * 64
+    for token, count in Counter(re.findall(r"\w+", text.lower())).items():
+        h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += count if h >> bit & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+def test_simhash_matches_bitwise_reference():
+    """Test du SimHash accumulé en un seul entier : identique au calcul bit à bit."""
+    for text in (PAGE, "", "a", "SQL syntax error " * 1000 + PAGE, "é ü 日本 mot " * 50):
+        assert simhash(text) == _reference_simhash(text)
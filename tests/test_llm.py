@@ -1,8 +1,9 @@
 import pytest
 import json
 from pathlib import Path
-from core.llm import LLMAnnotator, run
-from unittest.mock import patch, mock_open
+import asyncio
+from core.llm import LLMAnnotator, LLMAPIError, run
+from unittest.mock import AsyncMock, patch, mock_open
 
 @pytest.fixture
 def sample_behavior_data():
@@ -84,13 +85,12 @@ def test_run_function(sample_behavior_data, mock_llm_response, tmp_path):
     with open(input_file, 'w') as f:
         json.dump(sample_behavior_data, f)
 
-    with patch('requests.post') as mock_post:
-        mock_post.return_value.json.return_value = mock_llm_response
-        mock_post.return_value.status_code = 200
+    with patch('core.llm.LLMAnnotator._call_llm_api_async', new_callable=AsyncMock) as mock_call:
+        mock_call.return_value = mock_llm_response
 
         with patch.dict('os.environ', {'LLM_API_KEY': 'test_key'}):
-            run(str(input_file))
-            mock_post.assert_called_once()
+            run(str(input_file), use_cache=False)
+            mock_call.assert_called_once()
 
 def test_run_function_file_not_found():
     """Teste la fonction run avec un fichier inexistant."""
@@ -138,4 +138,184 @@ def test_calculate_confidence():
     })
     
     assert isinstance(confidence, float)
-    assert 0 <= confidence <= 1 
\ No newline at end of file
+    assert 0 <= confidence <= 1
+
+
+def test_run_reads_results_file(mock_llm_response, tmp_path):
+    """Teste l'annotation d'un fichier de résultats compressé à corps séparés."""
+    from core.results import ResultWriter
+
+    input_file = tmp_path / "scan.jsonl.gz"
+    with ResultWriter(str(input_file)) as writer:
+        writer.write({"url": "http://test.com/a", "status": 200, "body": "A"})
+        writer.write({"url": "http://test.com/b", "status": 403, "body": "B"})
+
+    with patch('core.llm.LLMAnnotator._call_llm_api_async', new_callable=AsyncMock) as mock_call:
+        mock_call.return_value = mock_llm_response
+
+        with patch.dict('os.environ', {'LLM_API_KEY': 'test_key'}):
+            run(str(input_file), use_cache=False)
+        assert mock_call.call_count == 2
+
+    output_file = tmp_path / "scan_annotated.jsonl"
+    annotations = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert sorted(a["original_data"]["body"] for a in annotations) == ["A", "B"]
+
+class FakeLLMResponse:
+    """Réponse aiohttp simulée de l'API LLM."""
+
+    def __init__(self, status, payload=None, headers=None):
+        self.status = status
+        self.payload = payload
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def json(self):
+        return self.payload
+
+    async def text(self):
+        return json.dumps(self.payload)
+
+class FakeLLMSession:
+    """Session simulée : suit les appels simultanés et rejoue des statuts."""
+
+    def __init__(self, response, statuses=None, delay=0.01):
+        self.response = response
+        self.statuses = list(statuses or [])
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def post(self, url, headers=None, json=None):
+        session = self
+
+        class _Context:
+            async def __aenter__(self):
+                session.calls += 1
+                session.in_flight += 1
+                session.max_in_flight = max(session.max_in_flight, session.in_flight)
+                await asyncio.sleep(session.delay)
+                session.in_flight -= 1
+                status = session.statuses.pop(0) if session.statuses else 200
+                if status != 200:
+                    return FakeLLMResponse(status, {"error": "rate limited"}, {"Retry-After": "0"})
+                return FakeLLMResponse(200, session.response)
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+        return _Context()
+
+@pytest.mark.asyncio
+async def test_annotate_many_bounded_concurrency(mock_llm_response):
+    """Teste l'annotation concurrente bornée d'un ensemble de résultats."""
+    session = FakeLLMSession(mock_llm_response)
+    annotator = LLMAnnotator(api_key="test_key")
+    records = [{"url": f"http://test.com/{i}", "status": 200} for i in range(20)]
+
+    annotations = [a async for a in annotator.annotate_many(records, concurrency=4, session=session)]
+
+    assert session.calls == 20
+    assert session.max_in_flight == 4
+    assert sorted(a["original_data"]["url"] for a in annotations) == sorted(r["url"] for r in records)
+
+@pytest.mark.asyncio
+async def test_annotate_many_retries_rate_limit(mock_llm_response):
+    """Teste le nouvel essai après une réponse 429 et l'isolement des échecs."""
+    from core.retry import RetryPolicy
+
+    session = FakeLLMSession(mock_llm_response, statuses=[429, 429, 200, 400])
+    annotator = LLMAnnotator(
+        api_key="test_key", retry_policy=RetryPolicy(max_attempts=3, base_delay=0, retry_statuses={429})
+    )
+    records = [{"url": "http://test.com/a"}, {"url": "http://test.com/b"}]
+
+    annotations = [a async for a in annotator.annotate_many(records, concurrency=1, session=session)]
+
+    assert session.calls == 4
+    assert "annotations" in annotations[0]
+    assert "LLM API error" in annotations[1]["error"]
+
+@pytest.mark.asyncio
+async def test_annotate_many_aborts_on_auth_error():
+    """Teste l'arrêt de l'annotation lorsque la clé est refusée."""
+    session = FakeLLMSession({}, statuses=[401])
+    annotator = LLMAnnotator(api_key="test_key")
+    with pytest.raises(LLMAPIError):
+        async for _ in annotator.annotate_many([{"url": "http://test.com"}] * 5, concurrency=1, session=session):
+            pass
+
+def test_run_uses_annotation_cache(mock_llm_response, tmp_path):
+    """Teste le cache d'annotations : un prompt déjà soumis n'est pas renvoyé à l'API."""
+    from core.config import config
+
+    input_file = tmp_path / "scan.jsonl"
+    input_file.write_text(
+        json.dumps({"url": "http://test.com/a", "status": 500, "body": "Error"}) + "\n"
+        + json.dumps({"url": "http://test.com/b", "status": 500, "body": "Error"}) + "\n"
+    )
+    llm_config = {"cache": True, "cache_path": str(tmp_path / "llm_cache.sqlite")}
+    with patch.dict(config.config, {"llm": llm_config}), \
+            patch.dict('os.environ', {'LLM_API_KEY': 'test_key'}), \
+            patch('core.llm.LLMAnnotator._call_llm_api_async', new_callable=AsyncMock) as mock_call:
+        mock_call.return_value = mock_llm_response
+        run(str(input_file), triage=False)
+        assert mock_call.call_count == 2
+        run(str(input_file), triage=False)
+        assert mock_call.call_count == 2
+
+    output_file = tmp_path / "scan_annotated.jsonl"
+    annotations = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert all(a["annotations"]["model"] == "gpt-4" for a in annotations)
+
+@pytest.mark.asyncio
+async def test_annotation_cache_eviction(tmp_path):
+    """Teste la clé normalisée, les statistiques et l'éviction par taille."""
+    from core.cache import AnnotationCache
+
+    key = AnnotationCache.key("  Analyze\n\n   URL: a ", "gpt-4", {"temperature": 0.7})
+    assert key == AnnotationCache.key("Analyze\nURL: a", "gpt-4", {"temperature": 0.7})
+    assert key != AnnotationCache.key("Analyze\nURL: a", "gpt-4", {"temperature": 0})
+    assert key != AnnotationCache.key("Analyze\nURL: a", "local", {"temperature": 0.7})
+
+    cache = AnnotationCache(str(tmp_path / "llm_cache.sqlite"), max_bytes=400)
+    for i in range(3):
+        await cache.set(f"k{i}", {"content": "x" * 100})
+    await cache.get("k0")
+    await cache.set("k3", {"content": "x" * 100})
+
+    assert await cache.get("k1") is None
+    assert await cache.get("k0") is not None
+    stats = await cache.stats()
+    assert stats["entries"] == 3 and stats["bytes"] <= 400
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2 and stats["misses"] == 1
+    cache.close()
+
+def test_run_triages_entries(mock_llm_response, tmp_path):
+    """Teste que seuls les résultats retenus par le tri sont soumis au LLM."""
+    input_file = tmp_path / "scan.jsonl"
+    lines = [{"url": "http://test.com/?q=a", "status": 200, "attack": "xss", "body": "Welcome"}]
+    lines += [
+        {"url": f"http://test.com/?q={i}", "status": 200, "attack": "xss", "body": "Welcome", "distance": 0.0}
+        for i in range(50)
+    ]
+    lines.append({"url": "http://test.com/?q=%27", "status": 500, "attack": "sqli", "body": "SQL syntax error"})
+    input_file.write_text("".join(json.dumps(line) + "\n" for line in lines))
+
+    with patch.dict('os.environ', {'LLM_API_KEY': 'test_key'}), \
+            patch('core.llm.LLMAnnotator._call_llm_api_async', new_callable=AsyncMock) as mock_call:
+        mock_call.return_value = mock_llm_response
+        count = run(str(input_file), use_cache=False)
+
+    annotations = [json.loads(line) for line in (tmp_path / "scan_annotated.jsonl").read_text().splitlines()]
+    reasons = {a["original_data"]["url"]: a["original_data"]["triage"] for a in annotations}
+    assert count == mock_call.call_count == len(annotations) < 10
+    assert reasons["http://test.com/?q=a"]["reason"] == "novel"
+    assert reasons["http://test.com/?q=%27"] == {"verdict": "VULNERABLE", "reason": "verdict"}
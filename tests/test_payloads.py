@@ -0,0 +1,71 @@
+import itertools
+from core.payloads import PayloadCorpus, encode_component
+
+def test_default_corpus_without_query_string():
+    """Test du corpus intégré sur une cible sans paramètres."""
+    plan = list(PayloadCorpus.default().plan("https://example.com/"))
+    assert plan == [
+        ("xss", "https://example.com/?input=%3Cscript%3Ealert%281%29%3C%2Fscript%3E"),
+        ("sqli", "https://example.com/?input=%27%20OR%20%271%27%3D%271"),
+        ("idor", "https://example.com/?user_id=1"),
+        ("idor", "https://example.com/?user_id=2"),
+    ]
+
+def test_injects_into_every_existing_parameter():
+    """Test de l'injection dans chaque paramètre, les autres étant conservés."""
+    corpus = PayloadCorpus()
+    corpus.add("xss", "<b>")
+    plan = list(corpus.plan("https://example.com/search?q=a b&page=2#top"))
+    assert plan == [
+        ("xss", "https://example.com/search?q=%3Cb%3E&page=2#top"),
+        ("xss", "https://example.com/search?q=a%20b&page=%3Cb%3E#top"),
+    ]
+
+def test_load_deduplicates_and_encodes_once(tmp_path):
+    """Test du chargement de fichiers : lignes vides ignorées, doublons supprimés."""
+    (tmp_path / "sqli.txt").write_bytes(b"' OR 1=1\n\n' OR 1=1\r\n\xff--\n")
+    (tmp_path / "xss.txt").write_text("<svg>\n<svg>\n", encoding="utf-8")
+
+    corpus = PayloadCorpus.from_files([tmp_path])
+
+    assert corpus.attacks == ["sqli", "xss"]
+    assert corpus.payloads("sqli") == [encode_component("' OR 1=1"), "%FF--"]
+    assert corpus.payloads("xss") == ["%3Csvg%3E"]
+    assert len(corpus) == 3
+
+def test_from_config_falls_back_to_default(tmp_path):
+    """Test du corpus configuré (`payloads.files`) et du corpus intégré."""
+    assert PayloadCorpus.from_config({}).attacks == ["xss", "sqli", "idor"]
+    (tmp_path / "custom.txt").write_text("x\n", encoding="utf-8")
+    corpus = PayloadCorpus.from_config({"payloads": {"files": [str(tmp_path / "custom.txt")]}})
+    assert corpus.attacks == ["custom"]
+
+def test_plan_is_lazy():
+    """Test de la génération paresseuse d'un grand plan."""
+    corpus = PayloadCorpus()
+    corpus.add_many("fuzz", (str(i) for i in range(100000)))
+    targets = (f"https://example.com/{i}?a=1&b=2" for i in itertools.count())
+
+    plan = corpus.iter_plan(targets)
+    first = list(itertools.islice(plan, 3))
+
+    assert first == [
+        ("fuzz", "https://example.com/0?a=0&b=2"),
+        ("fuzz", "https://example.com/0?a=1&b=0"),
+        ("fuzz", "https://example.com/0?a=1&b=2"),
+    ]
+
+def test_digest_covers_payload_content():
+    """Test de l'empreinte du corpus : payloads, ordre et paramètres par défaut."""
+    corpus = PayloadCorpus.default()
+    assert corpus.digest() == PayloadCorpus.default().digest()
+
+    edited = PayloadCorpus.default()
+    edited.add_many("idor", ["3"])
+    assert edited.digest() != corpus.digest()
+
+    first, second = PayloadCorpus(), PayloadCorpus()
+    first.add_many("idor", ["1", "2"])
+    second.add_many("idor", ["1", "3"])
+    assert first.digest() != second.digest()
+    assert PayloadCorpus(default_params={"idor": "id"}).digest() != PayloadCorpus().digest()
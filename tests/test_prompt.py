@@ -0,0 +1,55 @@
+from core.prompt import PromptBuilder, estimate_tokens, reflected_payloads
+from core.rules import RuleSet
+
+def _entry(body, url="http://test.com/?q=%3Cscript%3Ealert(7)%3C%2Fscript%3E"):
+    return {
+        "url": url,
+        "status": 200,
+        "attack": "xss",
+        "headers": {
+            "Date": "Mon, 01 Jan 2024 00:00:00 GMT",
+            "ETag": '"abc"',
+            "Content-Type": "text/html",
+            "Content-Security-Policy": "default-src 'self'",
+            "Set-Cookie": "session=" + "x" * 1000,
+        },
+        "body": body
+    }
+
+def test_reflected_payloads():
+    """Teste l'extraction des payloads depuis l'URL."""
+    entry = _entry("", url="http://test.com/?id=1&q=%27+OR+1%3D1--")
+    assert reflected_payloads(entry) == ["' OR 1=1--"]
+    assert reflected_payloads({"payload": "<svg>", "url": "http://test.com/?q=%3Csvg%3E"}) == ["<svg>"]
+
+def test_prompt_keeps_security_headers():
+    """Teste le filtrage des en-têtes sans intérêt et la troncature des valeurs."""
+    prompt = PromptBuilder(rules=RuleSet([])).build(_entry("<p>ok</p>"))
+    assert '"Content-Security-Policy"' in prompt
+    assert '"Content-Type": "text/html"' in prompt
+    assert "ETag" not in prompt and "Date" not in prompt
+    assert "x" * 300 not in prompt
+    assert "Attack: xss" in prompt
+    assert "Body: <p>ok</p>" in prompt
+
+def test_prompt_respects_token_budget():
+    """Teste la sélection des zones du corps autour des réflexions et des erreurs."""
+    filler = "<div>lorem ipsum</div>" * 5000
+    body = (
+        filler + "<b><script>alert(7)</script></b>" + filler
+        + "Warning: mysql_fetch_array() expects parameter 1" + filler
+    )
+    builder = PromptBuilder(max_tokens=400, context_chars=50, rules=RuleSet([]))
+    prompt = builder.build(_entry(body))
+
+    assert estimate_tokens(prompt) <= 400
+    assert "<script>alert(7)</script>" in prompt
+    assert "Warning: mysql_fetch_array()" in prompt
+    assert f"Body (excerpts, {len(body)} chars):" in prompt
+
+def test_prompt_falls_back_to_body_start():
+    """Teste l'extrait par défaut lorsque rien n'est trouvé dans le corps."""
+    body = "abcdefghij" * 10000
+    prompt = PromptBuilder(max_tokens=300, rules=RuleSet([])).build(_entry(body, url="http://test.com/"))
+    assert estimate_tokens(prompt) <= 300
+    assert "Body (excerpts, 100000 chars): abcdefghij" in prompt
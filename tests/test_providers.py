@@ -0,0 +1,58 @@
+import pytest
+from unittest.mock import patch
+from core import llm_stub
+from core.retry import RetryPolicy
+from core.config import config
+from core.llm import LLMAnnotator
+from core.providers import LocalProvider, OpenAIProvider, ProviderError, create_provider
+
+def test_openai_provider_request():
+    """Test de la requête construite pour l'API OpenAI."""
+    provider = OpenAIProvider()
+    url, headers, payload = provider.build_request("prompt", "secret")
+    assert url == "https://api.openai.com/v1/chat/completions"
+    assert headers["Authorization"] == "Bearer secret"
+    assert payload == {"model": "gpt-4", "messages": [{"role": "user", "content": "prompt"}], "temperature": 0.7}
+
+def test_create_provider_from_config():
+    """Test de la création d'un fournisseur depuis la configuration."""
+    with patch.dict(config.config, {"llm": {"provider": "local", "base_url": "http://10.0.0.2:9000/v1/", "timeout": 5}}):
+        provider = create_provider()
+        assert isinstance(provider, LocalProvider)
+        assert provider.endpoint == "http://10.0.0.2:9000/v1/chat/completions"
+        assert provider.timeout == 5
+        assert create_provider(model="qwen").model == "qwen"
+        with pytest.raises(ProviderError):
+            create_provider("inconnu")
+
+def test_local_provider_without_api_key():
+    """Test d'un fournisseur local sans clé API."""
+    with patch('os.getenv', return_value=None), patch('pathlib.Path.exists', return_value=False):
+        annotator = LLMAnnotator(provider=LocalProvider())
+    assert annotator.api_key is None
+    _, headers, _ = annotator._build_request("prompt")
+    assert "Authorization" not in headers
+
+@pytest.mark.asyncio
+async def test_annotate_against_local_stub():
+    """Test du pipeline d'annotation contre le serveur local de test."""
+    runner = await llm_stub.start("127.0.0.1", 0, latency=0.01, rate_limit_ratio=0.3)
+    try:
+        host, port = runner.addresses[0][:2]
+        annotator = LLMAnnotator(
+            provider=LocalProvider(base_url=f"http://{host}:{port}/v1", model="stub"),
+            retry_policy=RetryPolicy(max_attempts=20, base_delay=0, retry_statuses={429})
+        )
+        records = [{"url": f"http://test.com/{i}", "status": 200, "body": "ok"} for i in range(30)]
+        annotations = [a async for a in annotator.annotate_many(records, concurrency=8)]
+    finally:
+        await runner.cleanup()
+
+    stats = runner.app[llm_stub.STATS_KEY]
+    assert len(annotations) == 30
+    assert all("error" not in a for a in annotations)
+    assert stats["completions"] == 30
+    assert stats["requests"] == 30 + stats["rate_limited"]
+    annotation = next(a for a in annotations if a["original_data"]["url"] == "http://test.com/7")
+    assert "http://test.com/7" in annotation["annotations"]["analysis"]
+    assert annotation["annotations"]["model"] == "stub"
@@ -0,0 +1,100 @@
+import io
+import json
+import pytest
+from core.results import iter_json_values, read_results, write_jsonl
+
+RECORDS = [
+    {"url": "http://test.com/a", "status": 200, "body": "x" * 50},
+    {"url": "http://test.com/b", "status": 403, "body": "[\"}, {\"]"},
+    {"url": "http://test.com/c", "status": 500, "body": "é"},
+]
+
+@pytest.mark.parametrize("text", [
+    json.dumps(RECORDS),
+    json.dumps(RECORDS, indent=2),
+    "\n".join(json.dumps(r) for r in RECORDS) + "\n",
+    "".join(json.dumps(r) for r in RECORDS),
+])
+def test_iter_json_values_formats(text):
+    """Test de la lecture en flux : tableau, JSONL et valeurs concaténées, par petits blocs."""
+    assert list(iter_json_values(io.StringIO(text), chunk_size=7)) == RECORDS
+
+def test_iter_json_values_scalars_across_chunks():
+    """Test des nombres coupés entre deux blocs."""
+    assert list(iter_json_values(io.StringIO("[12345, 678, true]"), chunk_size=3)) == [12345, 678, True]
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3])
+@pytest.mark.parametrize("text, expected", [
+    ("[0.5]", [0.5]),
+    ("[-1.25e3]", [-1250.0]),
+    ("1.5e-2 2E+1\n-0.25", [0.015, 20.0, -0.25]),
+])
+def test_iter_json_values_numbers_split_at_boundary(text, expected, chunk_size):
+    """Test des nombres coupés après le point, l'exposant ou son signe."""
+    assert list(iter_json_values(io.StringIO(text), chunk_size=chunk_size)) == expected
+
+def test_iter_json_values_is_lazy():
+    """Test de la lecture paresseuse : seuls les blocs nécessaires sont lus."""
+    stream = io.StringIO("\n".join(json.dumps({"i": i}) for i in range(10000)))
+    values = iter_json_values(stream, chunk_size=64)
+    assert next(values) == {"i": 0}
+    assert stream.tell() <= 64
+
+def test_iter_json_values_invalid():
+    """Test d'un fichier tronqué."""
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_values(io.StringIO('[{"a": 1}, {"b"')))
+
+def test_write_and_read_jsonl(tmp_path):
+    """Test de l'aller-retour JSONL."""
+    path = tmp_path / "out.jsonl"
+    assert write_jsonl(iter(RECORDS), str(path)) == 3
+    assert list(read_results(str(path))) == RECORDS
+
+@pytest.mark.parametrize("name", ["scan.jsonl", "scan.jsonl.gz", "scan.jsonl.zst"])
+def test_result_writer_separate_bodies(tmp_path, name):
+    """Test de l'écriture compressée, corps séparés, et de la relecture."""
+    if name.endswith(".zst"):
+        pytest.importorskip("zstandard")
+    from core.results import ResultWriter, bodies_path
+
+    path = str(tmp_path / name)
+    records = RECORDS + [{"url": "http://test.com/d", "status": "ERROR"}]
+    with ResultWriter(path) as writer:
+        writer.write_many(records)
+    assert writer.count == 4
+
+    assert bodies_path(path).endswith("scan.bodies" + name[len("scan"):])
+    assert list(read_results(path)) == records
+    metadata = list(read_results(path, with_bodies=False))
+    assert all("body" not in record for record in metadata)
+    assert metadata[0] == {"url": "http://test.com/a", "status": 200}
+
+def test_result_writer_append(tmp_path):
+    """Test de l'ajout à un fichier compressé existant."""
+    from core.results import ResultWriter
+
+    path = str(tmp_path / "scan.jsonl.gz")
+    with ResultWriter(path) as writer:
+        writer.write(RECORDS[0])
+    with ResultWriter(path, append=True) as writer:
+        writer.write_many(RECORDS[1:])
+    assert list(read_results(path)) == RECORDS
+
+class CountingReader(io.StringIO):
+    """Flux qui compte les blocs lus."""
+
+    reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+@pytest.mark.parametrize("first_line", ['{"url": "http://test.com/a", "status": }', '{"url": "a\tb"}', "{url}"])
+def test_iter_json_values_corrupt_first_line(first_line):
+    """Test d'une ligne invalide : erreur immédiate, sans lire le reste du fichier."""
+    text = first_line + "\n" + "".join(json.dumps(r) + "\n" for r in RECORDS * 1000)
+    stream = CountingReader(text)
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_values(stream, chunk_size=4096))
+    assert stream.reads == 1
@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+from core.retry import RetryPolicy
+
+def test_retry_policy_delays():
+    """Test du calcul des délais : backoff borné, jitter et Retry-After."""
+    policy = RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=4.0, jitter=0.5)
+    for attempt, ceiling in [(0, 1.0), (1, 2.0), (2, 4.0), (5, 4.0)]:
+        delay = policy.compute_delay(attempt)
+        assert ceiling * 0.5 <= delay <= ceiling
+
+    assert policy.compute_delay(0, "7") == 7.0
+    assert policy.compute_delay(0, "999999") == policy.max_retry_after
+    assert policy.compute_delay(0, "not-a-date") <= 1.0
+    http_date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= policy.compute_delay(0, http_date) <= 30
+
+    assert policy.should_retry_status(503)
+    assert policy.should_retry_status(429)
+    assert not policy.should_retry_status(403)
+    assert not policy.should_retry_status(404)
+
+def test_retry_policy_from_config():
+    """Test de la lecture de la section `retry` de la configuration."""
+    with patch.dict('core.retry.config.config', {"retry": {"max_attempts": 7, "retry_statuses": [503]}}):
+        policy = RetryPolicy.from_config()
+    assert policy.max_attempts == 7
+    assert policy.should_retry_status(503)
+    assert not policy.should_retry_status(429)
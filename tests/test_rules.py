@@ -0,0 +1,120 @@
+import time
+import pytest
+from core.rules import RuleSet, RuleError, STRICT, VULNERABLE
+
+def test_default_rules():
+    """Test des règles par défaut (comportement historique du classifieur)."""
+    rules = RuleSet.default()
+    assert rules.verdict("<script>ALERT(1)</script>") == VULNERABLE
+    assert rules.verdict("You have an error in your SQL Syntax") == VULNERABLE
+    assert rules.verdict("Access Denied") == STRICT
+    assert rules.verdict("", status=403) == STRICT
+    assert rules.verdict("Welcome", status=200) is None
+
+def test_overlapping_literals_and_regex():
+    """Test des correspondances qui se chevauchent ou partagent un préfixe."""
+    rules = RuleSet([
+        {"id": "deny", "verdict": STRICT, "patterns": ["deny"]},
+        {"id": "denying", "verdict": STRICT, "patterns": ["Denying"]},
+        {"id": "ying", "verdict": STRICT, "patterns": ["ying"]},
+        {"id": "oracle", "verdict": VULNERABLE, "regex": [r"ORA-\d{5}"]},
+        {"id": "unused", "verdict": VULNERABLE, "patterns": ["never"]},
+    ])
+    matched = rules.match("DENYING access: ora-01756 quoted string")
+    assert [rule.id for rule in matched] == ["deny", "denying", "ying", "oracle"]
+    assert rules.verdict("DENYING access: ora-01756") == VULNERABLE
+
+def test_rules_from_file(tmp_path):
+    """Test du chargement d'un fichier de règles YAML."""
+    path = tmp_path / "rules.yaml"
+    path.write_text(
+        "rules:\n"
+        "  - id: waf\n"
+        "    verdict: STRICT\n"
+        "    patterns: [\"request blocked\"]\n"
+        "    status: [406]\n",
+        encoding="utf-8"
+    )
+    rules = RuleSet.from_file(path)
+    assert rules.verdict("Request BLOCKED by WAF") == STRICT
+    assert rules.verdict("", status=406) == STRICT
+
+def test_invalid_rules():
+    """Test des règles invalides."""
+    with pytest.raises(RuleError):
+        RuleSet([{"id": "x", "verdict": "MAYBE", "patterns": ["a"]}])
+    with pytest.raises(RuleError):
+        RuleSet([{"id": "x", "verdict": STRICT}])
+    with pytest.raises(RuleError):
+        RuleSet([{"id": "x", "verdict": STRICT, "regex": ["("]}])
+
+def test_many_signatures_single_pass():
+    """Test d'un grand nombre de signatures compilées en un seul motif."""
+    rules = RuleSet([
+        {"id": f"sig{i}", "verdict": VULNERABLE, "patterns": [f"signature-{i:05d}"]}
+        for i in range(5000)
+    ])
+    body = ("lorem ipsum dolor sit amet " * 2000) + "SIGNATURE-04242"
+    start = time.perf_counter()
+    matched = rules.match(body)
+    assert [rule.id for rule in matched] == ["sig4242"]
+    assert time.perf_counter() - start < 1.0
+
+def test_rule_spans():
+    """Test des positions des motifs trouvés dans le corps."""
+    rules = RuleSet([{"id": "sql", "verdict": "VULNERABLE", "patterns": ["syntax"], "regex": [r"ORA-\d+"]}])
+    body = "xx SYNTAX error ORA-00933 zz"
+    assert [body[start:end] for start, end in rules.spans(body)] == ["SYNTAX", "ORA-00933"]
+
+def test_rules_matching_at_same_offset():
+    """Test de plusieurs règles qui correspondent à la même position."""
+    rules = RuleSet([
+        {"id": "syntax", "verdict": STRICT, "patterns": ["syntax"]},
+        {"id": "syntax-near", "verdict": VULNERABLE, "regex": [r"syntax error near"]},
+        {"id": "syntax-word", "verdict": STRICT, "regex": [r"syntax\w*"]},
+    ])
+    body = "You have a syntax error near line 1"
+    assert [rule.id for rule in rules.match(body)] == ["syntax", "syntax-near", "syntax-word"]
+    assert rules.verdict(body) == VULNERABLE
+
+def test_regex_groups_and_backreferences():
+    """Test des expressions avec groupes nommés et références arrière."""
+    rules = RuleSet([
+        {"id": "echo", "verdict": VULNERABLE, "regex": [r"<(?P<tag>\w+)>x</(?P=tag)>"]},
+        {"id": "repeat", "verdict": STRICT, "regex": [r"(\w+)-\1"]},
+    ])
+    assert [rule.id for rule in rules.match("<b>x</b> abc-abc")] == ["echo", "repeat"]
+    assert rules.match("<b>x</i> abc-abd") == []
+
+def test_regex_rules_single_pass():
+    """Test du coût des expressions préfixées : il ne croît pas avec le nombre de règles."""
+    body = ("lorem ipsum dolor sit amet " * 500) + "ORA-00042 "
+
+    def timed(count):
+        rules = RuleSet([
+            {"id": f"ora{i}", "verdict": VULNERABLE, "regex": [rf"ORA-{i:05d}\b", rf"mysql error {i}: \w+"]}
+            for i in range(count)
+        ])
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            matched = rules.match(body)
+            best = min(best, time.perf_counter() - start)
+        return best, matched
+
+    single, _ = timed(1)
+    many, matched = timed(400)
+    assert [rule.id for rule in matched] == ["ora42"]
+    assert many < single * 5
+
+def test_regex_without_literal_prefix():
+    """Test des expressions sans préfixe littéral, recherchées dans tout le corps."""
+    rules = RuleSet([
+        {"id": "phone", "verdict": STRICT, "regex": [r"\d{3}-\d{4}"]},
+        {"id": "either", "verdict": VULNERABLE, "regex": [r"warning|fatal error"]},
+        {"id": "bounded", "verdict": STRICT, "regex": [r"\bstack trace"]},
+    ])
+    body = "call 555-1234: Fatal Error, see stack trace"
+    assert [rule.id for rule in rules.match(body)] == ["phone", "either", "bounded"]
+    assert [body[start:end] for start, end in rules.spans(body)] == ["555-1234", "Fatal Error", "stack trace"]
+    assert rules.match("mystack traces") == []
@@ -0,0 +1,64 @@
+import pytest
+from core.store import ResultStore, is_store_path
+from core.results import read_results, open_result_writer
+
+def _records(count, host="a.test"):
+    return [
+        {
+            "url": f"http://{host}/?q={i}",
+            "status": 500 if i % 10 == 0 else 200,
+            "attack": "sqli" if i % 2 == 0 else "xss",
+            "distance": 0.1,
+            "body": f"body {i}"
+        }
+        for i in range(count)
+    ]
+
+def test_store_batches_and_queries(tmp_path):
+    """Test des insertions par lots et des requêtes indexées."""
+    path = tmp_path / "results.sqlite"
+    with ResultStore(str(path)) as store:
+        first = store.start_scan("http://a.test/")
+        store.write_many(_records(1200))
+        second = store.start_scan("http://b.test/")
+        store.write_many(_records(10, host="b.test"))
+        assert store.count == 1210
+
+        hits = list(store.query(host="a.test", attack="sqli", status=500))
+        assert len(hits) == 120
+        assert hits[0] == {
+            "url": "http://a.test/?q=0", "status": 500, "attack": "sqli",
+            "distance": 0.1, "body": "body 0"
+        }
+        assert len(list(store.query(scan_id=second))) == 10
+        assert list(store.query(url="http://b.test/?q=3", with_bodies=False)) == [
+            {"url": "http://b.test/?q=3", "status": 200, "attack": "xss", "distance": 0.1}
+        ]
+        assert [scan["results"] for scan in store.scans()] == [10, 1200]
+        assert {scan["id"] for scan in store.scans()} == {first, second}
+
+def test_store_query_uses_index(tmp_path):
+    """Test de l'utilisation des index pour une recherche par hôte, attaque et statut."""
+    with ResultStore(str(tmp_path / "results.db")) as store:
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT data FROM results WHERE host = ? AND attack = ? AND status = ?",
+            ("a.test", "sqli", 500)
+        ).fetchall()
+    assert "idx_results_host" in " ".join(str(row) for row in plan)
+
+def test_store_wal_and_persistence(tmp_path):
+    """Test du mode WAL et de la relecture via read_results."""
+    path = str(tmp_path / "results.sqlite")
+    assert is_store_path(path)
+    with open_result_writer(path, target="http://a.test/") as store:
+        store.write_many(_records(5))
+        assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    results = list(read_results(path))
+    assert [r["body"] for r in results] == [f"body {i}" for i in range(5)]
+    assert all("body" not in r for r in read_results(path, with_bodies=False))
+
+def test_read_results_missing_store(tmp_path):
+    """Test de la lecture d'une base inexistante."""
+    with pytest.raises(FileNotFoundError):
+        list(read_results(str(tmp_path / "missing.sqlite")))
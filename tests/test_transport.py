@@ -0,0 +1,148 @@
+import asyncio
+import pytest
+
+try:
+    import httpx
+    import h2.config as h2_config
+    import h2.connection as h2_connection
+    import h2.events as h2_events
+    HAS_HTTP2 = True
+except ImportError:  # Dépendance optionnelle (pip install "httpx[http2]")
+    HAS_HTTP2 = False
+
+requires_http2 = pytest.mark.skipif(not HAS_HTTP2, reason="httpx[http2] non installé")
+
+from unittest.mock import patch
+from core.config import config
+from core.analyzer import ScanContext, _async_request, DNAReconError
+from core.transport import AiohttpTransport, Http2Transport, TransportError, create_transport
+import core.transport
+
+class H2Server:
+    """Serveur HTTP/2 en clair (h2c) minimal, qui compte connexions et flux simultanés."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.connections = 0
+        self.streams = 0
+        self.active_streams = 0
+        self.max_active_streams = 0
+        self.server = None
+        self.port = None
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer) -> None:
+        self.connections += 1
+        conn = h2_connection.H2Connection(config=h2_config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+        tasks = []
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2_events.RequestReceived):
+                        headers = dict(event.headers)
+                        tasks.append(asyncio.ensure_future(
+                            self._respond(conn, writer, event.stream_id, headers[b":path"])
+                        ))
+                writer.write(conn.data_to_send())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _respond(self, conn, writer, stream_id: int, path: bytes) -> None:
+        self.streams += 1
+        self.active_streams += 1
+        self.max_active_streams = max(self.max_active_streams, self.active_streams)
+        await asyncio.sleep(self.delay)
+        self.active_streams -= 1
+        conn.send_headers(stream_id, [
+            (":status", "200"),
+            ("content-type", "text/plain; charset=utf-8"),
+            ("content-length", str(len(path))),
+        ])
+        conn.send_data(stream_id, path, end_stream=True)
+        writer.write(conn.data_to_send())
+        await writer.drain()
+
+@requires_http2
+@pytest.mark.asyncio
+async def test_http2_multiplexes_requests_on_one_connection():
+    """Test du multiplexage des requêtes simultanées sur une seule connexion HTTP/2."""
+    server = H2Server()
+    await server.start()
+    try:
+        with patch.dict(config.config, {"transport": {"backend": "http2", "http1_fallback": False}}):
+            context = ScanContext()
+        assert isinstance(context.transport, Http2Transport)
+        async with context:
+            results = await asyncio.gather(*[
+                _async_request(f"http://127.0.0.1:{server.port}/p{i}", use_cache=False, context=context)
+                for i in range(20)
+            ])
+    finally:
+        await server.stop()
+
+    assert [r["body"] for r in results] == [f"/p{i}" for i in range(20)]
+    assert all(r["status_code"] == 200 for r in results)
+    assert server.connections == 1
+    assert server.streams == 20
+    assert server.max_active_streams > 1
+
+@requires_http2
+@pytest.mark.asyncio
+async def test_http2_truncated_body_keeps_connection():
+    """Test d'un corps tronqué : seul le flux est abandonné, la connexion est réutilisée."""
+    server = H2Server(delay=0)
+    await server.start()
+    try:
+        with patch.dict(config.config, {
+            "max_body_bytes": 3,
+            "transport": {"backend": "http2", "http1_fallback": False}
+        }):
+            async with ScanContext() as context:
+                first = await _async_request(f"http://127.0.0.1:{server.port}/long-path", use_cache=False, context=context)
+                second = await _async_request(f"http://127.0.0.1:{server.port}/other", use_cache=False, context=context)
+    finally:
+        await server.stop()
+
+    assert first["truncated"] is True
+    assert first["body"] == "/lo"
+    assert second["body"] == "/ot"
+    assert server.connections == 1
+
+@requires_http2
+def test_create_transport():
+    """Test de la sélection du transport par nom."""
+    assert isinstance(create_transport("aiohttp"), AiohttpTransport)
+    assert isinstance(create_transport("http2"), Http2Transport)
+    with pytest.raises(TransportError):
+        create_transport("quic")
+
+def test_http2_transport_requires_httpx():
+    """Test du message d'erreur lorsque httpx n'est pas installé."""
+    with patch.object(core.transport, "httpx", None):
+        with pytest.raises(TransportError):
+            Http2Transport()
+
+@requires_http2
+@pytest.mark.asyncio
+async def test_closed_context_rejects_requests():
+    """Test d'une requête via un contexte fermé."""
+    context = ScanContext(transport="http2")
+    with pytest.raises(DNAReconError):
+        await _async_request("http://127.0.0.1:1/", use_cache=False, context=context)
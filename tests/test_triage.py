@@ -0,0 +1,47 @@
+from core.fingerprint import Fingerprint
+from core.rules import RuleSet
+from core.triage import Triage
+
+def _entry(i, body="Welcome", status=200, distance=0.0, host="a.test"):
+    return {"url": f"http://{host}/?q={i}", "status": status, "attack": "xss", "body": body, "distance": distance}
+
+def test_triage_selects_verdicts_and_novelty():
+    """Test de la sélection par verdict et par nouveauté de l'empreinte."""
+    triage = Triage(sample_rate=0, rules=RuleSet.default())
+    entries = [_entry(i) for i in range(100)]
+    entries += [
+        _entry(100, distance=0.6),
+        _entry(101, body="alert(1)"),
+        _entry(102, body="Not found", status=404),
+        _entry(103, host="b.test"),
+    ]
+    selected = {e["url"]: e["triage"] for e in triage.select(entries)}
+
+    assert selected == {
+        "http://a.test/?q=0": {"verdict": "FLEXIBLE", "reason": "novel"},
+        "http://a.test/?q=100": {"verdict": "ANOMALOUS", "reason": "verdict"},
+        "http://a.test/?q=101": {"verdict": "VULNERABLE", "reason": "verdict"},
+        "http://a.test/?q=102": {"verdict": "FLEXIBLE", "reason": "novel"},
+        "http://b.test/?q=103": {"verdict": "FLEXIBLE", "reason": "novel"},
+    }
+    assert triage.stats == {"seen": 104, "verdict": 2, "novel": 3, "sample": 0, "skipped": 99}
+
+def test_triage_uses_stored_fingerprints():
+    """Test de la nouveauté calculée depuis les empreintes enregistrées, sans corps."""
+    fingerprint = Fingerprint.from_result({"status": 200, "body": "Welcome"}).as_dict()
+    entries = [{"url": f"http://a.test/?q={i}", "status": 200, "attack": "xss", "fingerprint": fingerprint} for i in range(5)]
+    triage = Triage(sample_rate=0, rules=RuleSet([]))
+    assert len(list(triage.select(entries))) == 1
+
+def test_triage_sampling_is_deterministic():
+    """Test de l'échantillonnage : proportion configurée, même échantillon à chaque exécution."""
+    entries = [_entry(i) for i in range(2000)]
+
+    def sample():
+        triage = Triage(verdicts=(), novelty_threshold=None, sample_rate=0.1, rules=RuleSet([]))
+        return [e["url"] for e in triage.select(entries)]
+
+    first = sample()
+    assert 120 <= len(first) <= 280
+    assert first == sample()
+    assert all(e["triage"]["reason"] == "sample" for e in Triage(verdicts=(), novelty_threshold=None, sample_rate=1.0, rules=RuleSet([])).select(entries[:3]))